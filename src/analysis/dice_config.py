@@ -0,0 +1,53 @@
+from typing import List, Sequence, Union
+import numpy as np
+
+# 骰子配置：每个元素是一颗骰子，整数 n 表示 1..n 的均匀骰子，
+# 序列表示自定义面值（重复的面值相当于加权），例如 (6, 6) 为两颗六面骰，
+# ((1, 1, 2, 3),) 为一颗点数 1 出现概率加倍的四面骰
+DiceSpec = Sequence[Union[int, Sequence[int]]]
+
+# 游戏中使用的默认骰子（一颗六面骰）
+DEFAULT_DICE = (6,)
+
+def normalize_dice(dice: DiceSpec) -> List[List[int]]:
+    """把骰子配置统一转换为每颗骰子的面值列表
+
+    Args:
+        dice: 骰子配置
+
+    Returns:
+        List[List[int]]: 每颗骰子的全部面值
+    """
+    if isinstance(dice, int):
+        dice = (dice,)
+    result = []
+    for die in dice:
+        if isinstance(die, int):
+            if die < 1:
+                raise ValueError(f"骰子面数必须大于0: {die}")
+            faces = list(range(1, die + 1))
+        else:
+            faces = [int(face) for face in die]
+            if not faces:
+                raise ValueError("自定义骰子至少需要一个面")
+            if min(faces) < 0:
+                raise ValueError(f"骰子面值不能为负数: {faces}")
+        result.append(faces)
+    if not result:
+        raise ValueError("至少需要一颗骰子")
+    return result
+
+def sum_distribution(dice: DiceSpec) -> np.ndarray:
+    """计算所有骰子点数之和的概率分布
+
+    Args:
+        dice: 骰子配置
+
+    Returns:
+        np.ndarray: 下标为点数和、值为概率的一维数组
+    """
+    distribution = np.ones(1)
+    for faces in normalize_dice(dice):
+        die = np.bincount(faces).astype(float) / len(faces)
+        distribution = np.convolve(distribution, die)
+    return distribution
@@ -0,0 +1,192 @@
+from math import gcd
+from typing import Optional, Tuple
+import numpy as np
+from analysis.dice_config import DiceSpec, DEFAULT_DICE, sum_distribution
+from utils.logger import get_logger
+
+log = get_logger("Markov")
+
+# 判断特征值是否等于1时使用的容差
+EIGEN_TOLERANCE = 1e-9
+
+class MarkovSolver:
+    """落点概率的精确解（马尔可夫链）
+
+    路径是一个闭环，从任意格子出发移动 k 步的概率都相同，转移矩阵是循环矩阵：
+    P[i, (i + k) % n] = p(k)。因此不需要构造 n x n 的稠密矩阵，
+    一次转移就是与骰子分布的循环卷积，多步转移、平稳分布和平均到达回合数
+    都可以在傅里叶域中以 O(n log n) 求出，数万格的棋盘也没有问题。
+    """
+    def __init__(self, path_length: int, dice: DiceSpec = DEFAULT_DICE):
+        """
+        Args:
+            path_length: 路径格子数（Board.path 的长度）
+            dice: 骰子配置，见 analysis.dice_config
+        """
+        if path_length < 1:
+            raise ValueError(f"路径长度必须大于0: {path_length}")
+        self.path_length = path_length
+
+        distribution = sum_distribution(dice)
+        rolls = np.nonzero(distribution)[0]
+        # 每种点数和以及对应的概率
+        self.rolls = rolls
+        self.probabilities = distribution[rolls]
+        # 按路径长度折叠后的转移核：kernel[k] 为一回合前进 k 格（取模后）的概率
+        self.kernel = np.bincount(rolls % path_length, weights=self.probabilities,
+                                  minlength=path_length)
+        # 转移矩阵的特征值（转移核的傅里叶变换）
+        self._eigenvalues = np.fft.fft(self.kernel)
+
+        # 从起点出发可以到达的格子间隔：所有步长与路径长度的最大公约数
+        step = path_length
+        for offset in np.nonzero(self.kernel)[0]:
+            step = gcd(step, int(offset))
+        self.reachable_step = step
+
+    @classmethod
+    def from_board(cls, board, **kwargs) -> "MarkovSolver":
+        """按棋盘（Board 或 BoardModel）的路径长度创建求解器（只支持没有岔路的闭环棋盘）"""
+        model = getattr(board, "model", board)
+        if not model.is_ring:
+            raise ValueError("只支持单一闭环的棋盘，带岔路或捷径的棋盘请使用逐回合的规则模型")
+        return cls(len(board.path), **kwargs)
+
+    def _start_vector(self, start) -> np.ndarray:
+        """把起始索引或分布转换为概率向量"""
+        if isinstance(start, (int, np.integer)):
+            vector = np.zeros(self.path_length)
+            vector[start % self.path_length] = 1.0
+            return vector
+        vector = np.asarray(start, dtype=float)
+        if vector.shape != (self.path_length,):
+            raise ValueError(f"起始分布的长度应为 {self.path_length}")
+        return vector
+
+    @staticmethod
+    def _clean(vector: np.ndarray) -> np.ndarray:
+        """去掉傅里叶变换带来的微小负值和虚部"""
+        vector = np.real(vector)
+        vector[vector < 0] = 0.0
+        return vector
+
+    def transition_entries(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """转移矩阵的稀疏表示（COO格式）
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: (行索引, 列索引, 概率)，
+            每行只有骰子可能结果数个非零项
+        """
+        offsets = np.nonzero(self.kernel)[0]
+        rows = np.repeat(np.arange(self.path_length), len(offsets))
+        cols = (rows + np.tile(offsets, self.path_length)) % self.path_length
+        probs = np.tile(self.kernel[offsets], self.path_length)
+        return rows, cols, probs
+
+    def dense_transition_matrix(self) -> np.ndarray:
+        """构造稠密转移矩阵（只用于小棋盘的检查）"""
+        matrix = np.zeros((self.path_length, self.path_length))
+        rows, cols, probs = self.transition_entries()
+        np.add.at(matrix, (rows, cols), probs)
+        return matrix
+
+    def step(self, distribution: np.ndarray) -> np.ndarray:
+        """一回合后的分布（稀疏循环卷积，O(n x 骰子结果数)）"""
+        result = np.zeros(self.path_length)
+        for offset in np.nonzero(self.kernel)[0]:
+            result += self.kernel[offset] * np.roll(distribution, offset)
+        return result
+
+    def k_step_distribution(self, k: int, start=0) -> np.ndarray:
+        """k 回合后所在格子的概率分布（FFT，O(n log n)，与 k 无关）
+
+        Args:
+            k: 回合数
+            start: 起始路径索引，或长度为 path_length 的起始分布
+
+        Returns:
+            np.ndarray: 每个格子的概率
+        """
+        vector = self._start_vector(start)
+        spectrum = np.fft.fft(vector) * self._eigenvalues ** k
+        return self._clean(np.fft.ifft(spectrum))
+
+    def expected_landings(self, turns: int, start=0) -> np.ndarray:
+        """前 turns 回合内每个格子的期望落点次数（不计起点）"""
+        vector = self._start_vector(start)
+        eigenvalues = self._eigenvalues
+        # 几何级数 λ + λ² + ... + λ^turns，λ=1 时为 turns
+        is_one = np.abs(eigenvalues - 1.0) < EIGEN_TOLERANCE
+        denominator = np.where(is_one, 1.0, 1.0 - eigenvalues)
+        series = np.where(is_one, float(turns),
+                          eigenvalues * (1.0 - eigenvalues ** turns) / denominator)
+        return self._clean(np.fft.ifft(np.fft.fft(vector) * series))
+
+    def stationary_distribution(self, start=0) -> np.ndarray:
+        """长期平均落点分布
+
+        只保留特征值为1的分量（其余分量的时间平均趋于0），
+        当骰子步长与路径长度不互质时，只有从起点可达的格子有概率。
+
+        Args:
+            start: 起始路径索引，或起始分布
+
+        Returns:
+            np.ndarray: 每个格子的长期落点概率
+        """
+        vector = self._start_vector(start)
+        keep = np.abs(self._eigenvalues - 1.0) < EIGEN_TOLERANCE
+        spectrum = np.where(keep, np.fft.fft(vector), 0.0)
+        return self._clean(np.fft.ifft(spectrum))
+
+    def expected_hitting_times(self, start: int = 0) -> np.ndarray:
+        """从起点出发，第一次落在每个格子上所需的平均回合数
+
+        使用基本矩阵 Z = (I - P + Π)^-1 求平均首达时间：
+        m(i, j) = (Z[j, j] - Z[i, j]) / π(j)。循环矩阵的 Z 仍是循环矩阵，
+        特征值为 1 / (1 - λ)，同样用 FFT 求出。起点自身的值为回到起点的平均回合数。
+
+        Args:
+            start: 起始路径索引
+
+        Returns:
+            np.ndarray: 每个格子的平均到达回合数，无法到达的格子为 inf
+        """
+        length = self.path_length
+        step = self.reachable_step
+        times = np.full(length, np.inf)
+
+        # 在可达的子环上求解（步长都除以 step）
+        reduced_length = length // step
+        reduced_kernel = np.bincount((self.rolls % length) // step, weights=self.probabilities,
+                                     minlength=reduced_length)
+        eigenvalues = np.fft.fft(reduced_kernel)
+        fundamental = np.ones(reduced_length, dtype=complex)
+        fundamental[1:] = 1.0 / (1.0 - eigenvalues[1:])
+        # Z 的第一行：Z[0, d]，d 为前进的格数
+        row = np.real(np.fft.ifft(fundamental))
+        distances = np.arange(reduced_length)
+        reduced_times = (row[0] - row[distances]) * reduced_length
+        # 回到起点的平均回合数为 1/π
+        reduced_times[0] = reduced_length
+
+        targets = (start + distances * step) % length
+        times[targets] = reduced_times
+        return times
+
+    def summary(self, start: int = 0, turns: Optional[int] = None) -> dict:
+        """汇总统计"""
+        stationary = self.stationary_distribution(start)
+        hitting = self.expected_hitting_times(start)
+        reachable = np.isfinite(hitting)
+        result = {
+            "path_length": self.path_length,
+            "reachable_cells": int(reachable.sum()),
+            "most_likely": int(stationary.argmax()),
+            "least_likely": int(np.where(reachable, stationary, np.inf).argmin()),
+            "max_hitting_time": float(hitting[reachable].max()),
+        }
+        if turns is not None:
+            result["expected_landings"] = self.expected_landings(turns, start)
+        log.debug("求解完成 - 路径长度: %d, 可达格子: %d", self.path_length, result["reachable_cells"])
+        return result
@@ -0,0 +1,135 @@
+import time
+from typing import Optional
+import numpy as np
+from analysis.dice_config import DiceSpec, DEFAULT_DICE, sum_distribution
+from utils.logger import get_logger
+
+log = get_logger("MonteCarlo")
+
+# 每个月进行一个回合，一年12个回合（与 GameTime 的推进方式一致）
+TURNS_PER_YEAR = 12
+
+class MonteCarloResult:
+    """批量模拟的统计结果"""
+    def __init__(self, path_length: int, games: int, turns: int, landing_counts: np.ndarray,
+                 laps: np.ndarray, elapsed: float):
+        self.path_length = path_length
+        self.games = games
+        self.turns = turns
+        self.landing_counts = landing_counts  # 每个格子被落点的总次数
+        self.laps = laps  # 每局完成的圈数
+        self.elapsed = elapsed
+
+    @property
+    def landing_frequencies(self) -> np.ndarray:
+        """每个格子的落点频率（总和为1）"""
+        total = self.landing_counts.sum()
+        if total == 0:
+            return np.zeros(self.path_length)
+        return self.landing_counts / total
+
+    @property
+    def years(self) -> float:
+        """每局经过的游戏年数"""
+        return self.turns / TURNS_PER_YEAR
+
+    @property
+    def laps_per_year(self) -> np.ndarray:
+        """每局平均每年完成的圈数"""
+        if self.turns == 0:
+            return np.zeros(self.games)
+        return self.laps / self.years
+
+    @property
+    def turns_per_second(self) -> float:
+        """模拟速度（所有对局合计的回合数/秒）"""
+        if self.elapsed <= 0:
+            return float("inf")
+        return self.games * self.turns / self.elapsed
+
+    def summary(self) -> dict:
+        """汇总统计"""
+        frequencies = self.landing_frequencies
+        laps_per_year = self.laps_per_year
+        return {
+            "games": self.games,
+            "turns": self.turns,
+            "elapsed": self.elapsed,
+            "turns_per_second": self.turns_per_second,
+            "laps_per_year_mean": float(laps_per_year.mean()) if self.games else 0.0,
+            "laps_per_year_std": float(laps_per_year.std()) if self.games else 0.0,
+            "most_landed": int(frequencies.argmax()),
+            "least_landed": int(frequencies.argmin()),
+        }
+
+class MonteCarloSimulator:
+    """基于 NumPy 的批量蒙特卡洛模拟
+
+    同时模拟大量相互独立的对局，一次生成一整块回合的骰子点数，
+    用累加和与取模得到每回合的落点，不经过逐回合的 Python 循环。
+    """
+    def __init__(self, path_length: int, dice: DiceSpec = DEFAULT_DICE, games: int = 1024,
+                 seed: Optional[int] = None, max_chunk_elements: int = 1 << 22):
+        """
+        Args:
+            path_length: 路径格子数（Board.path 的长度）
+            dice: 骰子配置，见 analysis.dice_config
+            games: 并行对局数
+            seed: 随机种子，指定后结果可复现
+            max_chunk_elements: 每块最多生成的骰子结果数，用于限制内存占用
+        """
+        if path_length < 1:
+            raise ValueError(f"路径长度必须大于0: {path_length}")
+        self.path_length = path_length
+        self.games = games
+        self.rng = np.random.default_rng(seed)
+        self.max_chunk_elements = max_chunk_elements
+
+        distribution = sum_distribution(dice)
+        self._roll_values = np.nonzero(distribution)[0]
+        self._roll_probabilities = distribution[self._roll_values]
+
+    @classmethod
+    def from_board(cls, board, **kwargs) -> "MonteCarloSimulator":
+        """按棋盘（Board 或 BoardModel）的路径长度创建模拟器（只支持没有岔路的闭环棋盘）"""
+        model = getattr(board, "model", board)
+        if not model.is_ring:
+            raise ValueError("只支持单一闭环的棋盘，带岔路或捷径的棋盘请使用逐回合的规则模型")
+        return cls(len(board.path), **kwargs)
+
+    def roll(self, shape) -> np.ndarray:
+        """批量投掷骰子，返回点数和"""
+        return self.rng.choice(self._roll_values, size=shape, p=self._roll_probabilities)
+
+    def run(self, turns: int, start_index: int = 0) -> MonteCarloResult:
+        """每局从 start_index 出发进行 turns 个回合
+
+        Args:
+            turns: 每局的回合数
+            start_index: 起始路径索引
+
+        Returns:
+            MonteCarloResult: 统计结果
+        """
+        start = time.perf_counter()
+        length = self.path_length
+        landing_counts = np.zeros(length, dtype=np.int64)
+        # 累计移动的总步数（不取模），用于计算圈数
+        travelled = np.zeros(self.games, dtype=np.int64)
+
+        chunk = max(1, self.max_chunk_elements // max(1, self.games))
+        done = 0
+        while done < turns:
+            steps = min(chunk, turns - done)
+            rolls = self.roll((steps, self.games))
+            positions = np.cumsum(rolls, axis=0, dtype=np.int64)
+            positions += travelled + start_index
+            travelled = positions[-1] - start_index
+            landing_counts += np.bincount((positions % length).ravel(), minlength=length)
+            done += steps
+
+        elapsed = time.perf_counter() - start
+        result = MonteCarloResult(length, self.games, turns, landing_counts,
+                                  (travelled + start_index) // length, elapsed)
+        log.debug("批量模拟完成 - %d局 x %d回合, 耗时 %.2fs", self.games, turns, elapsed)
+        return result
@@ -0,0 +1,138 @@
+from array import array
+from typing import List, Optional, Tuple
+import pygame
+
+class BoardGeometry:
+    """棋盘几何信息表
+
+    按路径索引预先计算每个格子的像素矩形和中心点，存放在紧凑的数组中；
+    同时建立网格坐标到路径索引的查找表，使鼠标命中检测只需常数次网格运算，
+    与格子总数无关。
+
+    相邻格子会重叠 border_width 像素，以实现边框的视觉统一。
+    """
+    def __init__(self, cells: List[Tuple[int, int]], board_x: int, board_y: int,
+                 cell_size: int, border_width: int):
+        """
+        Args:
+            cells: 按路径顺序排列的格子网格坐标
+            board_x: 棋盘左上角的像素x坐标
+            board_y: 棋盘左上角的像素y坐标
+            cell_size: 格子大小（像素）
+            border_width: 格子边框宽度（像素），也是相邻格子的重叠宽度
+        """
+        self.board_x = board_x
+        self.board_y = board_y
+        self.cell_size = cell_size
+        self.border_width = border_width
+        self.stride = cell_size - border_width  # 相邻格子左上角的间距
+        self.cell_count = len(cells)
+
+        # 网格尺寸
+        self.grid_width = max((x for x, _ in cells), default=-1) + 1
+        self.grid_height = max((y for _, y in cells), default=-1) + 1
+
+        # 每个格子的左上角和中心点（按路径索引）
+        self._left = array('i', bytes(4 * self.cell_count))
+        self._top = array('i', bytes(4 * self.cell_count))
+        self._center_x = array('d', bytes(8 * self.cell_count))
+        self._center_y = array('d', bytes(8 * self.cell_count))
+
+        # 网格坐标 -> 路径索引，-1 表示该网格位置不在路径上
+        self._grid = array('i', [-1]) * (self.grid_width * self.grid_height)
+
+        for index, (x, y) in enumerate(cells):
+            left = board_x + x * self.stride
+            top = board_y + y * self.stride
+            self._left[index] = left
+            self._top[index] = top
+            self._center_x[index] = left + cell_size / 2
+            self._center_y[index] = top + cell_size / 2
+
+            # 同一网格位置出现多次时，保留路径中最靠前的索引
+            grid_index = y * self.grid_width + x
+            if self._grid[grid_index] == -1:
+                self._grid[grid_index] = index
+
+    def get_index(self, cell_pos: Tuple[int, int]) -> int:
+        """获取网格坐标对应的路径索引
+
+        Returns:
+            int: 路径索引，不在路径上时返回-1
+        """
+        x, y = cell_pos
+        if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
+            return self._grid[y * self.grid_width + x]
+        return -1
+
+    def get_rect(self, index: int) -> pygame.Rect:
+        """获取指定路径索引格子的矩形区域"""
+        return pygame.Rect(self._left[index], self._top[index], self.cell_size, self.cell_size)
+
+    def get_center(self, index: int) -> Tuple[float, float]:
+        """获取指定路径索引格子的中心点像素坐标"""
+        return (self._center_x[index], self._center_y[index])
+
+    def get_center_of(self, cell_pos: Tuple[int, int]) -> Tuple[float, float]:
+        """获取指定网格坐标格子的中心点像素坐标，该格子不在路径上时抛出 ValueError"""
+        index = self.get_index(cell_pos)
+        if index == -1:
+            raise ValueError(f"网格坐标 {cell_pos} 不在路径上")
+        return self.get_center(index)
+
+    def get_cell_rect(self, cell_pos: Tuple[int, int]) -> pygame.Rect:
+        """获取指定网格坐标格子的矩形区域（不要求该格子在路径上）"""
+        x, y = cell_pos
+        return pygame.Rect(
+            self.board_x + x * self.stride,
+            self.board_y + y * self.stride,
+            self.cell_size,
+            self.cell_size
+        )
+
+    def index_at(self, pos: Tuple[int, int]) -> int:
+        """获取像素坐标所在格子的路径索引
+
+        由于相邻格子重叠，一个点最多落在2x2个候选格子中，
+        返回其中路径索引最小的一个，与按路径顺序逐个检测的结果一致。
+
+        Args:
+            pos: 像素坐标
+
+        Returns:
+            int: 路径索引，不在任何格子上时返回-1
+        """
+        dx = pos[0] - self.board_x
+        dy = pos[1] - self.board_y
+        if dx < 0 or dy < 0:
+            return -1
+
+        result = -1
+        for x in self._candidates(dx, self.grid_width):
+            for y in self._candidates(dy, self.grid_height):
+                index = self._grid[y * self.grid_width + x]
+                if index != -1 and (result == -1 or index < result):
+                    result = index
+        return result
+
+    def _candidates(self, offset: int, limit: int) -> Tuple[int, ...]:
+        """计算某一轴上包含该偏移量的网格坐标（最多两个）"""
+        if self.stride <= 0:
+            return ()
+        cell = int(offset // self.stride)
+        candidates = []
+        # 落在前一个格子的重叠边框内
+        if cell >= 1 and offset - (cell - 1) * self.stride < self.cell_size and cell - 1 < limit:
+            candidates.append(cell - 1)
+        if cell < limit:
+            candidates.append(cell)
+        return tuple(candidates)
+
+    def cell_at(self, pos: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """获取像素坐标所在格子的网格坐标，不在任何格子上时返回None"""
+        index = self.index_at(pos)
+        if index == -1:
+            return None
+        x = (self._left[index] - self.board_x) // self.stride
+        y = (self._top[index] - self.board_y) // self.stride
+        return (x, y)
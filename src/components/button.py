@@ -1,5 +1,5 @@
 import pygame
-import os
+from utils.font_manager import FontManager
 
 class Button:
     def __init__(self, x: int, y: int, width: int, height: int, text: str, action: str, enabled: bool = True, button_type: str = "primary"):
@@ -10,12 +10,8 @@ class Button:
         self.is_hovered = False
         self.button_type = button_type
         
-        # 加载字体
-        font_path = os.path.join('assets', 'fonts', 'SourceHanSans-Bold.ttc')
-        try:
-            self.font = pygame.font.Font(font_path, 32)
-        except:
-            self.font = pygame.font.Font(None, 32)
+        # 字体大小（文字表面由 FontManager 渲染并缓存）
+        self.font_size = 32
         
         # 颜色方案
         self.colors = {
@@ -68,7 +64,7 @@ class Button:
         pygame.draw.rect(screen, color, self.rect, border_radius=8)
         
         # 绘制文本
-        text_surface = self.font.render(self.text, True, text_color)
+        text_surface = FontManager.get_instance().render_text(self.text, self.font_size, text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         if self.is_hovered and self.enabled:
             text_rect.y -= 1  # 悬停时文字略微上移
@@ -1,14 +1,36 @@
 import pygame
 import random
+from collections import OrderedDict
 from typing import Optional, Callable, Tuple
-import time
+from utils.logger import get_logger
+from utils.random_streams import RandomStreams, GAMEPLAY, COSMETIC
+from utils.tween import TweenSystem, TweenHandle, ease_out_quad
+
+log = get_logger("Dice")
 
 class Dice:
     """骰子系统类
     
-    实现1-6点数的骰子功能，包含投掷动画
+    实现1-6点数的骰子功能，包含投掷动画。
+    动画帧（点数 x 量化旋转角度 x 点击缩放档位）会被预烘焙并缓存，
+    绘制时只需选取缓存帧进行 blit。
     """
-    def __init__(self, x: int, y: int):
+    def __init__(self, x: int, y: int, angle_step: float = 6.0, scale_step: float = 0.01,
+                 max_cached_frames: int = 256, prebake: bool = False,
+                 rng: Optional[random.Random] = None, cosmetic_rng: Optional[random.Random] = None,
+                 tweens: Optional[TweenSystem] = None):
+        """
+        Args:
+            x: 点击区域左上角x坐标
+            y: 点击区域左上角y坐标
+            angle_step: 旋转角度的量化精度（度）
+            scale_step: 点击缩放的量化精度
+            max_cached_frames: 动画帧缓存的最大帧数，超出后淘汰最久未使用的帧
+            prebake: 是否在构造时预烘焙所有动画帧（缓存上限会扩大到能容纳全部帧）
+            rng: 决定最终点数的随机数流，默认使用 gameplay 流
+            cosmetic_rng: 滚动过程中显示点数的随机数流，默认使用 cosmetic 流
+            tweens: 场景共享的补间系统（由场景统一推进），为None时使用自己的补间系统
+        """
         # 基础属性
         self.x = x
         self.y = y
@@ -17,12 +39,25 @@ class Dice:
         
         # 动画状态
         self.is_rolling = False
-        self.roll_frames = 0
-        self.max_roll_frames = 60  # 1.5秒 * 60帧 = 90帧
+        self.roll_duration = 1.0  # 投掷动画时长（秒）
+        self.roll_rotation = 360.0  # 投掷时转过的角度（360的倍数：补间结束后角度回到0，停下时不会跳变）
+        self.face_elapsed = 0.0
+        self.face_interval = 0.05  # 滚动时每隔多久换一次显示的点数（秒）
         self.value = 1
-        self.rotation_angle = 0.0
-        self.rotation_speed = 0.0
-        self.last_update_time = 0
+        
+        # 旋转和点击缩放动画由补间系统推进
+        self._owns_tweens = tweens is None
+        self.tweens = tweens if tweens is not None else TweenSystem()
+        self._rotation_tween: Optional[TweenHandle] = None
+        self._scale_tween: Optional[TweenHandle] = None
+        
+        # 绘制用的状态（上一次更新与本次更新之间的插值）
+        self.render_angle = 0.0
+        
+        # 随机数：最终点数影响游戏结果，滚动中的点数只是表现，两者使用不同的流
+        streams = RandomStreams.get_instance()
+        self.rng = rng or streams.get(GAMEPLAY)
+        self.cosmetic_rng = cosmetic_rng or streams.get(COSMETIC)
         
         # 回调函数
         self.roll_callback: Optional[Callable[[int], None]] = None
@@ -33,9 +68,20 @@ class Dice:
         
         # 交互状态
         self.is_hovered = False
-        self.click_scale = 1.0
+        self.min_click_scale = 0.95  # 点击时的最小缩放
+        self.click_scale_speed = 0.6  # 点击缩放每秒恢复的比例
+        self.render_scale = 1.0
         
-        print("骰子初始化完成")
+        # 动画帧缓存：(点数, 角度档位, 缩放档位) -> Surface
+        self.angle_step = angle_step
+        self.scale_step = scale_step
+        self.max_cached_frames = max_cached_frames
+        self._frame_cache = OrderedDict()
+        self._frame_cache_bytes = 0
+        if prebake:
+            self.prebake_frames()
+        
+        log.debug("骰子初始化完成")
     
     def _create_dice_images(self):
         """预渲染所有骰子状态的图像"""
@@ -82,67 +128,145 @@ class Dice:
             # 绘制点
             pygame.draw.circle(surface, dot_color, (x, y), dot_radius)
     
+    def _quantize(self, angle: float, scale: float) -> Tuple[int, int]:
+        """把旋转角度和缩放量化为缓存档位"""
+        angle_count = max(1, round(360 / self.angle_step))
+        angle_index = round(angle / self.angle_step) % angle_count
+        scale_index = max(0, round((1.0 - scale) / self.scale_step))
+        return angle_index, scale_index
+    
+    def _get_frame(self, value: int, angle: float, scale: float) -> pygame.Surface:
+        """获取指定点数、角度和缩放的动画帧，未缓存时烘焙并加入缓存"""
+        angle_index, scale_index = self._quantize(angle, scale)
+        if angle_index == 0 and scale_index == 0:
+            # 静止状态直接使用原始图像
+            return self.dice_images[value - 1]
+        
+        key = (value, angle_index, scale_index)
+        frame = self._frame_cache.get(key)
+        if frame is not None:
+            self._frame_cache.move_to_end(key)
+            return frame
+        
+        frame = self._bake_frame(value, angle_index, scale_index)
+        self._frame_cache[key] = frame
+        self._frame_cache_bytes += frame.get_width() * frame.get_height() * frame.get_bytesize()
+        while len(self._frame_cache) > self.max_cached_frames:
+            _, old_frame = self._frame_cache.popitem(last=False)
+            self._frame_cache_bytes -= old_frame.get_width() * old_frame.get_height() * old_frame.get_bytesize()
+        return frame
+    
+    def _bake_frame(self, value: int, angle_index: int, scale_index: int) -> pygame.Surface:
+        """烘焙一帧：先缩放再旋转"""
+        scale = 1.0 - scale_index * self.scale_step
+        actual_size = int(self.size * scale)
+        frame = self.dice_images[value - 1]
+        if actual_size != self.size:
+            frame = pygame.transform.scale(frame, (actual_size, actual_size))
+        angle = angle_index * self.angle_step
+        if angle:
+            frame = pygame.transform.rotate(frame, angle)
+        return frame
+    
+    def get_frame_count(self) -> int:
+        """全部动画帧的数量（点数 x 角度档位 x 缩放档位，不含6张静止图像）"""
+        angle_count = max(1, round(360 / self.angle_step))
+        _, max_scale_index = self._quantize(0, self.min_click_scale)
+        return 6 * angle_count * (max_scale_index + 1) - 6
+    
+    def prebake_frames(self):
+        """预烘焙所有点数、角度和缩放档位的动画帧
+        
+        全部帧数超过 max_cached_frames 时先把缓存上限扩大到全部帧数，
+        否则烘焙的帧会被立即淘汰，预烘焙就失去了意义。
+        """
+        frame_count = self.get_frame_count()
+        if frame_count > self.max_cached_frames:
+            log.info("预烘焙需要 %d帧，缓存上限从 %d 扩大到 %d",
+                     frame_count, self.max_cached_frames, frame_count)
+            self.max_cached_frames = frame_count
+        angle_count = max(1, round(360 / self.angle_step))
+        _, max_scale_index = self._quantize(0, self.min_click_scale)
+        for scale_index in range(max_scale_index + 1):
+            scale = 1.0 - scale_index * self.scale_step
+            for angle_index in range(angle_count):
+                for value in range(1, 7):
+                    self._get_frame(value, angle_index * self.angle_step, scale)
+    
+    def get_cache_memory(self) -> int:
+        """获取动画帧缓存占用的像素内存（字节），不含6张原始点数图像"""
+        return self._frame_cache_bytes
+    
+    def get_cache_size(self) -> int:
+        """获取动画帧缓存中的帧数"""
+        return len(self._frame_cache)
+    
     def roll(self, callback: Optional[Callable[[int], None]] = None):
         """开始骰子投掷动画"""
         if not self.is_rolling:
-            print("[Dice] 开始投掷动画")
+            log.debug("开始投掷动画")
             self.is_rolling = True
-            self.roll_frames = 0
-            self.rotation_angle = 0.0
-            self.rotation_speed = 720.0  # 初始旋转速度（每秒720度，即每秒2圈）
-            self.last_update_time = time.time()
+            self.face_elapsed = 0.0
             self.roll_callback = callback
-            self.click_scale = 0.95
+            # 旋转整圈并平滑减速（起始角速度为每秒720度），停下时正好摆正
+            self.tweens.cancel(self._rotation_tween)
+            self._rotation_tween = self.tweens.play(0.0, self.roll_rotation, self.roll_duration,
+                                                    ease_out_quad, self._finish_roll)
+            # 点击时缩小，然后匀速恢复
+            self.tweens.cancel(self._scale_tween)
+            self._scale_tween = self.tweens.play(self.min_click_scale, 1.0,
+                                                 (1.0 - self.min_click_scale) / self.click_scale_speed)
     
-    def update(self):
-        """更新骰子状态"""
-        current_time = time.time()
-        dt = current_time - self.last_update_time
-        self.last_update_time = current_time
+    def _finish_roll(self):
+        """旋转动画结束，确定最终点数"""
+        final_value = self.rng.randint(1, 6)
+        log.info("动画结束 - 最终点数: %d", final_value)
+        self.value = final_value
+        self.is_rolling = False
+        if self.roll_callback:
+            self.roll_callback(final_value)  # 使用final_value而不是self.value
+    
+    def update(self, dt: float):
+        """更新骰子状态
+        
+        旋转和缩放由补间系统推进；使用场景共享的补间系统时由场景统一推进。
         
-        # 更新点击缩放效果
-        if self.click_scale < 1.0:
-            self.click_scale += 0.01
-            if self.click_scale > 1.0:
-                self.click_scale = 1.0
+        Args:
+            dt: 本次更新经过的时间（秒）
+        """
+        if self._owns_tweens:
+            self.tweens.update(dt)
         
-        # 更新投掷动画
+        # 骰子滚动时随机显示点数
         if self.is_rolling:
-            self.roll_frames += 1
-            
-            # 计算动画进度（0到1之间）
-            progress = min(self.roll_frames / self.max_roll_frames, 1.0)
-            
-            # 更新旋转速度（使用缓动函数使其平滑减速）
-            self.rotation_speed = 720.0 * (1.0 - progress * progress)  # 使用平方函数实现更自然的减速
-            
-            # 更新旋转角度，确保最终角度是90的倍数
-            rotation_delta = self.rotation_speed * dt
-            self.rotation_angle = (self.rotation_angle + rotation_delta)
-            
-            # 如果接近结束，确保最终角度是90的倍数
-            if progress > 0.9:
-                target_angle = round(self.rotation_angle / 90) * 90
-                self.rotation_angle = self.rotation_angle * 0.8 + target_angle * 0.2
-            
-            # 保持角度在0-360度之间
-            self.rotation_angle = self.rotation_angle % 360
-            
-            if self.roll_frames < self.max_roll_frames:
-                # 骰子滚动时随机显示点数
-                if self.roll_frames % 3 == 0:  # 每3帧改变一次点数
-                    self.value = random.randint(1, 6)
-            else:
-                # 停止滚动，确定最终点数
-                final_value = random.randint(1, 6)
-                print(f"[Dice] 动画结束 - 最终点数: {final_value}")
-                self.value = final_value
-                self.is_rolling = False
-                self.rotation_speed = 0
-                # 确保最终角度是90的倍数
-                self.rotation_angle = round(self.rotation_angle / 90) * 90
-                if self.roll_callback:
-                    self.roll_callback(final_value)  # 使用final_value而不是self.value
+            self.face_elapsed += dt
+            if self.face_elapsed >= self.face_interval:
+                self.face_elapsed -= self.face_interval
+                self.value = self.cosmetic_rng.randint(1, 6)
+    
+    @property
+    def rotation_angle(self) -> float:
+        """当前旋转角度（0-360度）"""
+        return self.tweens.sample(self._rotation_tween, default=0.0) % 360.0
+    
+    @property
+    def click_scale(self) -> float:
+        """当前点击缩放比例"""
+        return self.tweens.sample(self._scale_tween, default=1.0)
+    
+    @property
+    def is_animating(self) -> bool:
+        """是否有正在进行的动画（包括插值尚未到达的最终状态）"""
+        return self.tweens.is_alive(self._rotation_tween) or self.tweens.is_alive(self._scale_tween)
+    
+    def interpolate(self, alpha: float):
+        """计算绘制用的角度和缩放（在上一次和本次更新的状态之间插值）
+        
+        Args:
+            alpha: 0表示上一次更新的状态，1表示本次更新的状态
+        """
+        self.render_angle = self.tweens.sample(self._rotation_tween, alpha, 0.0) % 360.0
+        self.render_scale = self.tweens.sample(self._scale_tween, alpha, 1.0)
     
     def draw(self, screen: pygame.Surface):
         """绘制骰子"""
@@ -161,34 +285,30 @@ class Dice:
         pygame.draw.rect(screen, area_color, click_area_rect, border_radius=10)
         pygame.draw.rect(screen, (66, 66, 66), click_area_rect, width=2, border_radius=10)
         
-        # 计算骰子的实际位置和大小
-        actual_size = int(self.size * self.click_scale)
+        # 计算骰子的中心位置
         center_x = self.x + self.click_area // 2
         center_y = self.y + self.click_area // 2
         
         try:
-            # 获取当前点数的骰子图像并缩放
-            dice_surface = pygame.transform.scale(
-                self.dice_images[self.value - 1],
-                (actual_size, actual_size)
-            )
-            
-            # 如果正在滚动，添加旋转效果
-            if self.is_rolling or self.rotation_angle != 0:
-                dice_surface = pygame.transform.rotate(dice_surface, self.rotation_angle)
+            # 从缓存中取出当前点数、角度和缩放对应的动画帧
+            dice_surface = self._get_frame(self.value, self.render_angle, self.render_scale)
             
             # 绘制骰子
             dice_rect = dice_surface.get_rect(center=(center_x, center_y))
             screen.blit(dice_surface, dice_rect)
             
         except Exception as e:
-            print(f"绘制骰子时出错: {str(e)}")
+            log.error("绘制骰子时出错: %s", e)
+    
+    def get_rect(self) -> pygame.Rect:
+        """获取骰子绘制区域（即点击响应区域）"""
+        return pygame.Rect(self.x, self.y, self.click_area, self.click_area)
     
     def handle_click(self, pos: Tuple[int, int]) -> bool:
         """处理点击事件"""
         click_rect = pygame.Rect(self.x, self.y, self.click_area, self.click_area)
         if click_rect.collidepoint(pos) and not self.is_rolling:
-            print("[Dice] 开始投掷")
+            log.debug("开始投掷")
             return True
         return False
     
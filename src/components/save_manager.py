@@ -1,92 +1,424 @@
 import json
 import os
+import struct
+import time
+import zlib
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from components.turn_journal import TurnJournal
+from utils.logger import get_logger
+from utils.save_writer import SaveWriter, write_atomic
+
+log = get_logger("SaveManager")
+
+# 存档格式版本：1 为旧的单文件JSON（game_save.json），2 为定长文件头 + zlib压缩正文
+SAVE_FORMAT_VERSION = 2
+SAVE_MAGIC = b'DFWS'
+
+# 定长文件头：魔数、格式版本、月、年、保存时间戳、玩家名称（UTF-8，补零）、正文长度、正文CRC32
+SAVE_HEADER = struct.Struct('<4sHHId48sII')
+NAME_FIELD_SIZE = 48
+
+# 默认存档槽（主菜单的“继续游戏”使用）
+DEFAULT_SLOT = 0
+
+INDEX_VERSION = 2
+LEGACY_SAVE_NAME = 'game_save.json'
+# 早期版本在 src 目录下运行时把旧存档写在 src/saves 中，迁移项目根目录的 saves 时一并检查
+LEGACY_SAVE_DIR = Path(__file__).resolve().parent.parent / 'saves'
+PROJECT_SAVE_DIR = LEGACY_SAVE_DIR.parent.parent / 'saves'
+
+class SlotInfo:
+    """存档槽的摘要信息（来自文件头，不需要解析正文）"""
+    __slots__ = ("slot", "version", "player_name", "year", "month", "timestamp")
+
+    def __init__(self, slot: int, version: int, player_name: str, year: int, month: int,
+                 timestamp: float):
+        self.slot = slot
+        self.version = version
+        self.player_name = player_name
+        self.year = year
+        self.month = month
+        self.timestamp = timestamp
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SlotInfo":
+        return cls(**{name: data[name] for name in cls.__slots__})
+
+def _encode_name(name: str) -> bytes:
+    """把名称编码为定长字段，超长时在字符边界截断"""
+    encoded = name.encode('utf-8')
+    while len(encoded) > NAME_FIELD_SIZE:
+        name = name[:-1]
+        encoded = name.encode('utf-8')
+    return encoded
+
+def encode_save(snapshot: dict) -> bytes:
+    """把存档快照编码为 文件头 + 压缩正文"""
+    data = snapshot["data"]
+    body = zlib.compress(json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    header = SAVE_HEADER.pack(SAVE_MAGIC, SAVE_FORMAT_VERSION, data.get("month", 1),
+                              data.get("year", 1), snapshot["timestamp"],
+                              _encode_name(data.get("player_name", "")),
+                              len(body), zlib.crc32(body))
+    return header + body
+
+def read_header(path: Path, slot: int) -> Optional[SlotInfo]:
+    """只读取文件头，返回存档摘要；文件无效时返回None"""
+    with open(path, 'rb') as f:
+        raw = f.read(SAVE_HEADER.size)
+    if len(raw) < SAVE_HEADER.size:
+        return None
+    magic, version, month, year, timestamp, name, _, _ = SAVE_HEADER.unpack(raw)
+    if magic != SAVE_MAGIC:
+        return None
+    return SlotInfo(slot, version, name.rstrip(b'\0').decode('utf-8', 'replace'),
+                    year, month, timestamp)
+
+def decode_save(content: bytes) -> dict:
+    """解析完整存档，返回游戏数据"""
+    magic, version, _, _, _, _, body_length, body_crc = SAVE_HEADER.unpack_from(content)
+    if magic != SAVE_MAGIC:
+        raise ValueError("不是有效的存档文件")
+    if version > SAVE_FORMAT_VERSION:
+        raise ValueError(f"存档版本 {version} 比游戏版本新")
+    body = content[SAVE_HEADER.size:SAVE_HEADER.size + body_length]
+    if len(body) != body_length or zlib.crc32(body) != body_crc:
+        raise ValueError("存档数据损坏")
+    return json.loads(zlib.decompress(body).decode('utf-8'))
+
+def migrate_legacy_json(save_data: dict) -> dict:
+    """把格式1（JSON，version "1.0"）的存档内容转换为当前的游戏数据"""
+    data = dict(save_data.get("data", {}))
+    data.setdefault("player_position", 0)
+    data.setdefault("year", 1)
+    data.setdefault("month", 1)
+    return data
+
+class _SlotIndex:
+    """存档槽索引
+
+    保存在 saves/index.json 中，记录每个槽的文件头摘要，
+    主菜单列出存档时只读这一个小文件，不随存档数量增多而变慢。
+
+    索引同时记录每个存档文件的修改时间和大小。读取索引时列出一次存档目录
+    （不打开文件）进行核对：文件被删除的槽从索引移除，新增或有变化的存档
+    （包括在其他地方被替换的文件）只重新读取它们的文件头。
+    索引缺失或损坏时扫描全部存档的文件头重建。
+    """
+    def __init__(self, save_dir: Path):
+        self.save_dir = save_dir
+        self.path = save_dir / 'index.json'
+        self.slots: Dict[int, SlotInfo] = {}
+        # 槽 -> 索引记录时存档文件的 (修改时间ns, 大小)，刚提交还没写完的存档没有记录
+        self.stats: Dict[int, Tuple[int, int]] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                raise ValueError("索引版本不匹配")
+            self.slots = {int(slot): SlotInfo.from_dict(info) for slot, info in data["slots"].items()}
+            self.stats = {int(slot): tuple(stat) for slot, stat in data.get("files", {}).items()}
+            log.debug("读取存档索引 - %d个存档", len(self.slots))
+        except FileNotFoundError:
+            self.rebuild()
+            return
+        except Exception as e:
+            log.warning("存档索引无效，重新扫描: %s", e)
+            self.rebuild()
+            return
+        if self.reconcile():
+            self.save()
+
+    def _scan(self) -> Dict[int, Tuple[Path, Tuple[int, int]]]:
+        """列出一次存档目录，返回 槽 -> (存档路径, (修改时间ns, 大小))"""
+        files = {}
+        with os.scandir(self.save_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith('slot_') and name.endswith('.sav')):
+                    continue
+                try:
+                    slot = int(name[len('slot_'):-len('.sav')])
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except (ValueError, OSError):
+                    continue
+                files[slot] = (Path(entry.path), (stat.st_mtime_ns, stat.st_size))
+        return files
+
+    def reconcile(self) -> bool:
+        """按存档文件的修改时间和大小核对索引
+
+        Returns:
+            bool: 索引是否有变化
+        """
+        files = self._scan()
+        changed = False
+        for slot in [slot for slot in self.slots if slot not in files]:
+            log.warning("存档文件不存在，已从索引移除 - 槽 %d", slot)
+            self.remove(slot)
+            changed = True
+        for slot, (path, stat) in files.items():
+            if slot in self.slots and self.stats.get(slot) == stat:
+                continue
+            try:
+                info = read_header(path, slot)
+            except OSError as e:
+                log.warning("跳过无效存档 %s: %s", path, e)
+                info = None
+            if info is None:
+                if slot in self.slots:
+                    self.remove(slot)
+                    changed = True
+                continue
+            self.slots[slot] = info
+            self.stats[slot] = stat
+            changed = True
+        return changed
+
+    def rebuild(self):
+        """扫描存档文件头重建索引"""
+        self.slots = {}
+        self.stats = {}
+        self.reconcile()
+        log.info("重建存档索引 - %d个存档", len(self.slots))
+        self.save()
+
+    def set(self, slot: int, info: SlotInfo):
+        """更新一个槽的摘要（存档文件在后台写入，文件状态下次读取索引时再记录）"""
+        self.slots[slot] = info
+        self.stats.pop(slot, None)
+
+    def remove(self, slot: int):
+        self.slots.pop(slot, None)
+        self.stats.pop(slot, None)
+
+    def save(self):
+        """提交索引写入（与存档一样在后台线程写入）"""
+        snapshot = {
+            "version": INDEX_VERSION,
+            "slots": {str(slot): info.to_dict() for slot, info in self.slots.items()},
+            "files": {str(slot): list(stat) for slot, stat in self.stats.items()}
+        }
+        SaveWriter.get_instance().submit(self.path, snapshot, self._encode)
+
+    @staticmethod
+    def _encode(snapshot: dict) -> bytes:
+        return json.dumps(snapshot, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
 
 class SaveManager:
-    def __init__(self):
-        """初始化存档管理器"""
+    # 存档目录 -> 槽索引，所有 SaveManager 实例共用，只在第一次使用时读取
+    _indexes: Dict[str, _SlotIndex] = {}
+    # (存档目录, 槽) -> 回合日志，每个槽只有一个日志实例（持有正在写入的段文件）
+    _journals: Dict[Tuple[str, int], TurnJournal] = {}
+
+    # 未指定存档目录时使用的目录（回放录像时改为临时目录，不影响真实存档）
+    default_save_dir = 'saves'
+
+    def __init__(self, save_dir=None):
+        """初始化存档管理器
+
+        Args:
+            save_dir: 存档目录，为None时使用 SaveManager.default_save_dir
+        """
         # 确保存档目录存在
-        save_dir = Path('saves')
-        save_dir.mkdir(exist_ok=True)
-        
-        # 设置存档文件路径
-        self.save_path = save_dir / 'game_save.json'
-        print(f"[SaveManager] 初始化 - 存档路径: {self.save_path}")
-    
-    def has_save(self) -> bool:
-        """检查是否存在存档"""
-        exists = self.save_path.exists()
-        print(f"[SaveManager] 检查存档状态: {'存在' if exists else '不存在'}")
+        self.save_dir = Path(save_dir or SaveManager.default_save_dir)
+        self.save_dir.mkdir(exist_ok=True)
+
+        # 所有存档管理器共用一个后台写入线程
+        self.writer = SaveWriter.get_instance()
+        log.debug("初始化 - 存档目录: %s", self.save_dir)
+
+    @property
+    def index(self) -> _SlotIndex:
+        """存档槽索引（首次访问时读取，并迁移旧格式存档）"""
+        key = str(self.save_dir.resolve())
+        index = SaveManager._indexes.get(key)
+        if index is None:
+            index = SaveManager._indexes[key] = _SlotIndex(self.save_dir)
+            self._migrate_legacy(index)
+        return index
+
+    def get_journal(self, slot: int = DEFAULT_SLOT) -> TurnJournal:
+        """存档槽的回合日志（所有 SaveManager 实例共用同一个）"""
+        key = (str(self.save_dir.resolve()), slot)
+        journal = SaveManager._journals.get(key)
+        if journal is None:
+            journal = SaveManager._journals[key] = TurnJournal(self.save_dir, slot)
+        return journal
+
+    def get_slot_path(self, slot: int) -> Path:
+        """存档槽对应的文件路径"""
+        return self.save_dir / f'slot_{slot}.sav'
+
+    def _legacy_paths(self) -> List[Path]:
+        """存在的旧存档文件，修改时间最新的在前"""
+        candidates = [self.save_dir / LEGACY_SAVE_NAME]
+        if self.save_dir.resolve() == PROJECT_SAVE_DIR:
+            candidates.append(LEGACY_SAVE_DIR / LEGACY_SAVE_NAME)
+        paths = [path for path in candidates if path.is_file()]
+        paths.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+        return paths
+
+    def _migrate_legacy(self, index: _SlotIndex):
+        """把旧的 game_save.json 迁移到默认存档槽
+
+        有多个旧存档时迁移最新的一个。迁移成功后旧文件改名为 .bak 保留，不会删除。
+        """
+        legacy_paths = self._legacy_paths()
+        if not legacy_paths:
+            return
+        if DEFAULT_SLOT in index.slots:
+            log.warning("默认存档槽已有存档，保留旧存档文件: %s", legacy_paths[0])
+            return
+        legacy_path = legacy_paths[0]
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                save_data = json.load(f)
+            data = migrate_legacy_json(save_data)
+            snapshot = {"data": data, "timestamp": os.path.getmtime(legacy_path)}
+            # 同步写入，确认新存档落盘后才把旧文件改名
+            write_atomic(self.get_slot_path(DEFAULT_SLOT), encode_save(snapshot))
+            index.set(DEFAULT_SLOT, self._slot_info(DEFAULT_SLOT, snapshot))
+            index.save()
+            log.info("已迁移旧存档 (版本 %s) 到槽 %d: %s", save_data.get("version"),
+                     DEFAULT_SLOT, legacy_path)
+        except Exception as e:
+            log.error("迁移旧存档失败: %s", e)
+            return
+        for path in legacy_paths:
+            backup = path.with_name(path.name + '.bak')
+            try:
+                os.replace(path, backup)
+                log.info("旧存档已改名为 %s", backup)
+            except OSError as e:
+                log.warning("无法改名旧存档 %s: %s", path, e)
+
+    @staticmethod
+    def _slot_info(slot: int, snapshot: dict) -> SlotInfo:
+        data = snapshot["data"]
+        return SlotInfo(slot, SAVE_FORMAT_VERSION, data.get("player_name", ""),
+                        data.get("year", 1), data.get("month", 1), snapshot["timestamp"])
+
+    def list_slots(self) -> List[SlotInfo]:
+        """列出所有存档槽（按槽号排序），只读取缓存的索引"""
+        return [self.index.slots[slot] for slot in sorted(self.index.slots)]
+
+    def get_slot_info(self, slot: int = DEFAULT_SLOT) -> Optional[SlotInfo]:
+        """获取存档槽摘要，没有存档时返回None"""
+        return self.index.slots.get(slot)
+
+    def has_save(self, slot: int = DEFAULT_SLOT) -> bool:
+        """检查是否存在存档（查询缓存的索引，不访问文件系统）"""
+        exists = slot in self.index.slots
+        log.debug("检查存档状态: %s", '存在' if exists else '不存在')
         return exists
-    
-    def save_game(self, data: dict) -> bool:
+
+    def save_game(self, data: dict, slot: int = DEFAULT_SLOT) -> bool:
         """保存游戏数据
-        
+
+        数据快照交给后台线程写入（临时文件 + fsync + 原子替换），本方法立即返回，
+        短时间内的多次保存只会写入最后一次。
+
         Args:
             data: 包含游戏状态的字典
-            
+            slot: 存档槽
+
         Returns:
-            bool: 保存是否成功
+            bool: 是否已提交保存
         """
         try:
-            # 添加版本信息
-            save_data = {
-                "version": "1.0",
-                "data": data
+            # 复制一份，避免调用方之后修改影响后台写入
+            snapshot = {
+                "data": dict(data),
+                "timestamp": time.time()
             }
-            
-            # 确保存档目录存在
-            self.save_path.parent.mkdir(exist_ok=True)
-            
-            # 保存数据
-            with open(self.save_path, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, ensure_ascii=False, indent=2)
-            
-            print("[SaveManager] 保存游戏成功")
+            # 先取得索引（第一次访问时会核对存档目录），再提交写入
+            index = self.index
+            self.writer.submit(self.get_slot_path(slot), snapshot, encode_save)
+
+            # 同步更新索引
+            index.set(slot, self._slot_info(slot, snapshot))
+            index.save()
+            log.info("保存游戏成功 - 槽 %d", slot)
             return True
-            
+
         except Exception as e:
-            print(f"[SaveManager] 保存游戏失败: {str(e)}")
+            log.error("保存游戏失败: %s", e)
             return False
-    
-    def load_game(self) -> dict:
+
+    def flush(self, timeout: float = None) -> bool:
+        """等待所有尚未写完的存档写入磁盘（退出前调用）"""
+        return self.writer.flush(timeout)
+
+    def load_game(self, slot: int = DEFAULT_SLOT) -> dict:
         """加载游戏数据
-        
+
+        Args:
+            slot: 存档槽
+
         Returns:
             dict: 游戏数据，如果加载失败返回None
         """
         try:
-            if not self.has_save():
-                print("[SaveManager] 没有找到存档文件")
+            if not self.has_save(slot):
+                log.info("没有找到存档文件")
                 return None
-            
-            with open(self.save_path, 'r', encoding='utf-8') as f:
-                save_data = json.load(f)
-            
-            # 检查版本
-            if save_data.get("version") != "1.0":
-                print("[SaveManager] 存档版本不兼容")
-                return None
-            
-            print("[SaveManager] 加载游戏成功")
-            return save_data["data"]
-            
+
+            # 优先使用还没写完的最新快照
+            path = self.get_slot_path(slot)
+            snapshot = self.writer.get_pending(path)
+            if snapshot is not None:
+                return dict(snapshot["data"])
+
+            with open(path, 'rb') as f:
+                data = decode_save(f.read())
+
+            log.info("加载游戏成功 - 槽 %d", slot)
+            return data
+
+        except FileNotFoundError:
+            # 索引与文件不一致（例如文件被手动删除），修正索引
+            log.warning("存档文件不存在，已从索引移除 - 槽 %d", slot)
+            self.index.remove(slot)
+            self.index.save()
+            return None
         except Exception as e:
-            print(f"[SaveManager] 加载游戏失败: {str(e)}")
+            log.error("加载游戏失败: %s", e)
             return None
-    
-    def delete_save(self) -> bool:
+
+    def delete_save(self, slot: int = DEFAULT_SLOT) -> bool:
         """删除存档
-        
+
+        Args:
+            slot: 存档槽
+
         Returns:
             bool: 删除是否成功
         """
         try:
-            if self.has_save():
-                os.remove(self.save_path)
-                print("[SaveManager] 删除存档成功")
-                return True
-            return False
+            if not self.has_save(slot):
+                return False
+            # 先丢弃尚未写入的快照，避免删除后又被写回
+            path = self.get_slot_path(slot)
+            self.writer.discard(path)
+            if path.exists():
+                os.remove(path)
+            # 使用游戏场景正在写入的同一个日志，先关闭段文件再删除（Windows 不能删除打开的文件）
+            self.get_journal(slot).clear()
+            # 文件全部删除成功后才更新索引
+            self.index.remove(slot)
+            self.index.save()
+            log.info("删除存档成功 - 槽 %d", slot)
+            return True
         except Exception as e:
-            print(f"[SaveManager] 删除存档失败: {str(e)}")
-            return False 
\ No newline at end of file
+            log.error("删除存档失败: %s", e)
+            return False
@@ -0,0 +1,135 @@
+import pygame
+from typing import Callable, List, Optional, Tuple
+from utils.asset_manager import AssetManager, CHARACTER_IMAGES
+from utils.tween import TweenSystem, TweenHandle, ease_out_quad
+from utils.logger import get_logger
+
+log = get_logger("Token")
+
+class Token(pygame.sprite.DirtySprite):
+    """棋盘上的棋子
+
+    作为 DirtySprite 放入 TokenLayer 的 LayeredDirty 分组中绘制，
+    只有位置或图像发生变化时才标记为脏（dirty = 1）。
+    沿路径的移动是补间系统中的一条时间线，由场景统一推进。
+    """
+    def __init__(self, x: int, y: int, cell_size: int, character: str = "character",
+                 tweens: Optional[TweenSystem] = None):
+        """
+        Args:
+            x: 初始中心点x坐标
+            y: 初始中心点y坐标
+            cell_size: 格子大小（角色图片按此缩放）
+            character: 角色图片名称
+            tweens: 场景共享的补间系统（由场景统一推进），为None时使用自己的补间系统
+        """
+        super().__init__()
+        # 加载角色图片（由 AssetManager 统一加载、转换格式并缓存缩放结果）
+        self.character = character
+        self.image_path = CHARACTER_IMAGES.get(character, CHARACTER_IMAGES["character"])
+        self.cell_size = cell_size
+        self.image = AssetManager.get_instance().get_image(self.image_path, (cell_size, cell_size))
+        self.rect = self.image.get_rect(center=(x, y))
+
+        # 位置信息
+        self.x = x  # 逻辑位置（所在格子的中心，移动开始时即为终点）
+        self.y = y
+        self.cell_index = 0  # 当前所在格子索引
+
+        # 同一格子中有多个棋子时的排布：相对格子中心的偏移和缩小后的尺寸
+        self.slot_offset: Tuple[int, int] = (0, 0)
+        self.slot_size = cell_size
+
+        # 上一次标记为脏时的矩形，用于擦除旧位置
+        self.drawn_rect = self.rect.copy()
+
+        # 移动动画参数
+        self.move_duration = 0.3  # 每一格0.3秒
+        self._owns_tweens = tweens is None
+        self.tweens = tweens if tweens is not None else TweenSystem()
+        self._move_tween: Optional[TweenHandle] = None
+
+        self.dirty = 1
+
+    def update(self, dt: float):
+        """更新移动动画
+
+        移动由补间系统推进；使用场景共享的补间系统时由场景统一推进，这里不需要做任何事。
+
+        Args:
+            dt: 本次更新经过的时间（秒）
+        """
+        if self._owns_tweens:
+            self.tweens.update(dt)
+
+    @property
+    def is_moving(self) -> bool:
+        """是否正在沿路径移动"""
+        return self.tweens.is_running(self._move_tween)
+
+    @property
+    def is_animating(self) -> bool:
+        """是否在移动中（包括插值尚未到达的最终位置）"""
+        return self.tweens.is_alive(self._move_tween)
+
+    def interpolate(self, alpha: float):
+        """在上一次和本次更新的位置之间插值，更新绘制位置
+
+        Args:
+            alpha: 0表示上一次更新的位置，1表示本次更新的位置
+        """
+        x, y = self.tweens.sample(self._move_tween, alpha, (self.x, self.y))
+        if not self.is_animating:
+            x += self.slot_offset[0]
+            y += self.slot_offset[1]
+        self._place(x, y)
+
+    def set_slot(self, offset: Tuple[int, int], size: int):
+        """设置在格子中的排布位置和尺寸（由 TokenLayer 在同格棋子数变化时调用）"""
+        if size != self.slot_size:
+            self.slot_size = size
+            self.image = AssetManager.get_instance().get_image(self.image_path, (size, size))
+            self.rect = self.image.get_rect(center=self.rect.center)
+            self.dirty = 1
+        self.slot_offset = offset
+        if not self.is_animating:
+            self._place(self.x + offset[0], self.y + offset[1])
+
+    def set_position(self, x: float, y: float):
+        """直接放到指定位置（加载存档时使用），取消正在进行的移动"""
+        self.tweens.cancel(self._move_tween)
+        self._move_tween = None
+        self.x = x
+        self.y = y
+        self._place(x + self.slot_offset[0], y + self.slot_offset[1])
+
+    def move_to(self, path: List[Tuple[int, int]], on_complete: Optional[Callable[[], None]] = None):
+        """开始沿着路径移动
+
+        整条路径在开始时建成一条时间线（每格 move_duration 秒，每段渐出缓动），
+        之后由补间系统按时间直接求出所在的段。
+
+        Args:
+            path: 像素坐标路径，第一个点是当前位置
+            on_complete: 到达终点时调用
+        """
+        if not path:
+            log.error("收到空路径")
+            return
+
+        log.debug("开始移动 - %d步", len(path) - 1)
+        self.tweens.cancel(self._move_tween)
+        # 逻辑位置直接设为终点，绘制位置由时间线给出
+        self._move_tween = self.tweens.play_path(path, self.move_duration, ease_out_quad, on_complete)
+        self.x, self.y = path[-1]
+
+    def _place(self, x: float, y: float):
+        """把绘制位置移动到以 (x, y) 为中心，位置变化时标记为脏"""
+        old_center = self.rect.center
+        self.rect.center = (x, y)
+        if self.rect.center != old_center:
+            self.dirty = 1
+
+    def draw(self, screen: pygame.Surface):
+        """单独绘制棋子（不在 TokenLayer 中时使用）"""
+        screen.blit(self.image, self.rect)
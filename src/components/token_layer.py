@@ -0,0 +1,168 @@
+import math
+import pygame
+from typing import Callable, Dict, List, Optional, Sequence
+from components.board_geometry import BoardGeometry
+from components.token import Token
+from utils.dirty_rects import DirtyRectTracker
+from utils.logger import get_logger
+
+log = get_logger("TokenLayer")
+
+# 绘制层级（数值大的画在上面）
+RESTING_LAYER = 0   # 停在格子里的棋子
+PLAYER_LAYER = 1    # 玩家自己的棋子总是在其他停着的棋子之上
+MOVING_LAYER = 2    # 移动中的棋子画在所有停着的棋子之上
+
+class TokenLayer:
+    """棋子渲染层
+
+    所有棋子放在一个 LayeredDirty 分组中，按层级排序绘制；
+    每个棋子只在位置或图像变化时标记为脏，场景只重绘这些棋子新旧位置的区域。
+    同一格子中的多个棋子缩小后按网格排布，格子内棋子数变化时才重新排布该格。
+    """
+    def __init__(self, geometry: BoardGeometry, cell_size: int):
+        """
+        Args:
+            geometry: 格子几何信息（格子中心点）
+            cell_size: 格子大小
+        """
+        self.geometry = geometry
+        self.cell_size = cell_size
+        self.group = pygame.sprite.LayeredDirty()
+        # 格子索引 -> 停在该格子中的棋子（按加入顺序）
+        self._cells: Dict[int, List[Token]] = {}
+        # 正在移动或刚到达、还需要插值的棋子
+        self._animating: List[Token] = []
+        self._moving_count = 0
+        # 棋子停下后恢复的层级
+        self._rest_layer: Dict[Token, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.group)
+
+    @property
+    def is_moving(self) -> bool:
+        """是否有棋子正在移动"""
+        return self._moving_count > 0
+
+    @property
+    def is_animating(self) -> bool:
+        """是否有棋子需要逐帧更新（移动中或插值尚未到达终点）"""
+        return bool(self._animating)
+
+    def add(self, token: Token, cell_index: int = 0, layer: int = RESTING_LAYER):
+        """把棋子放到指定格子"""
+        self._rest_layer[token] = layer
+        self.group.add(token, layer=layer)
+        token.cell_index = cell_index
+        token.set_position(*self.geometry.get_center(cell_index))
+        self._cells.setdefault(cell_index, []).append(token)
+        self._layout(cell_index)
+
+    def remove(self, token: Token):
+        """移除棋子"""
+        self._leave_cell(token)
+        self._rest_layer.pop(token, None)
+        if token in self._animating:
+            self._animating.remove(token)
+        self.group.remove(token)
+
+    def place(self, token: Token, cell_index: int):
+        """把棋子直接放到指定格子（加载存档时使用），取消正在进行的移动"""
+        if token.is_moving:
+            self._moving_count -= 1
+        self._leave_cell(token)
+        token.cell_index = cell_index
+        token.set_position(*self.geometry.get_center(cell_index))
+        self.group.change_layer(token, self._rest_layer[token])
+        self._cells.setdefault(cell_index, []).append(token)
+        self._layout(cell_index)
+
+    def move(self, token: Token, path: Sequence[int], on_arrive: Optional[Callable[[Token], None]] = None):
+        """让棋子沿路径索引移动
+
+        Args:
+            token: 棋子
+            path: 路径索引，第一个是当前所在格子
+            on_arrive: 到达终点并重新排布后调用
+        """
+        if not path:
+            return
+        if token.is_moving:
+            self._moving_count -= 1
+        self._leave_cell(token)
+        self.group.change_layer(token, MOVING_LAYER)
+        destination = path[-1]
+        token.cell_index = destination
+        pixel_path = [self.geometry.get_center(index) for index in path]
+        token.move_to(pixel_path, lambda: self._arrive(token, destination, on_arrive))
+        self._moving_count += 1
+        if token not in self._animating:
+            self._animating.append(token)
+
+    def _arrive(self, token: Token, cell_index: int, on_arrive: Optional[Callable[[Token], None]]):
+        self._moving_count -= 1
+        self.group.change_layer(token, self._rest_layer[token])
+        self._cells.setdefault(cell_index, []).append(token)
+        self._layout(cell_index)
+        if on_arrive is not None:
+            on_arrive(token)
+
+    def _leave_cell(self, token: Token):
+        tokens = self._cells.get(token.cell_index)
+        if tokens and token in tokens:
+            tokens.remove(token)
+            if tokens:
+                self._layout(token.cell_index)
+            else:
+                del self._cells[token.cell_index]
+
+    def _layout(self, cell_index: int):
+        """按格子中的棋子数把它们缩小并排成网格"""
+        tokens = self._cells.get(cell_index)
+        if not tokens:
+            return
+        columns = math.ceil(math.sqrt(len(tokens)))
+        if columns == 1:
+            tokens[0].set_slot((0, 0), self.cell_size)
+            return
+        rows = math.ceil(len(tokens) / columns)
+        pitch = self.cell_size // columns
+        size = max(pitch - 2, 1)
+        origin_x = -pitch * (columns - 1) // 2
+        origin_y = -pitch * (rows - 1) // 2
+        for i, token in enumerate(tokens):
+            row, column = divmod(i, columns)
+            token.set_slot((origin_x + column * pitch, origin_y + row * pitch), size)
+
+    def tokens_at(self, cell_index: int) -> List[Token]:
+        """停在指定格子中的棋子"""
+        return list(self._cells.get(cell_index, ()))
+
+    def interpolate(self, alpha: float):
+        """更新移动中棋子的绘制位置（停着的棋子不需要处理）"""
+        if not self._animating:
+            return
+        still_animating = []
+        for token in self._animating:
+            token.interpolate(alpha)
+            if token.is_animating:
+                still_animating.append(token)
+        self._animating = still_animating
+
+    def mark_dirty(self, tracker: DirtyRectTracker):
+        """把本帧变化过的棋子的新旧区域标记为脏"""
+        for token in self.group:
+            if token.dirty:
+                tracker.mark(token.drawn_rect)
+                tracker.mark(token.rect)
+                token.drawn_rect = token.rect.copy()
+
+    def draw(self, screen: pygame.Surface):
+        """绘制棋子
+
+        调用前场景已经在当前裁剪区域内重绘了背景，因此先把裁剪区域交给分组重绘，
+        区域内没有变化的棋子也会被补画，区域外的棋子不会被绘制。
+        """
+        self.group.repaint_rect(screen.get_clip())
+        self.group.draw(screen)
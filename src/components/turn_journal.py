@@ -0,0 +1,239 @@
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Tuple
+from game_objects.game_model import TurnResult
+from utils.logger import get_logger
+from utils.save_writer import SaveWriter
+
+log = get_logger("TurnJournal")
+
+JOURNAL_MAGIC = b'DFWJ'
+JOURNAL_VERSION = 1
+
+# 段文件头：魔数、版本、段开始前已进行的回合数
+SEGMENT_HEADER = struct.Struct('<4sHI')
+# 回合记录：点数、起点索引、终点索引、年、月（每回合固定14字节）
+TURN_RECORD = struct.Struct('<BIIIB')
+# 历史文件中的压缩块头：块内第一条记录之前的回合数、记录数、压缩后长度、CRC32
+HISTORY_BLOCK = struct.Struct('<IIII')
+
+class TurnJournal:
+    """只追加的回合日志
+
+    每回合向当前段文件追加一条定长记录（O(1) 字节），完整存档（快照）只需定期保存。
+    加载时先读取最新快照，再重放快照之后的记录。被快照覆盖的旧段会被压缩追加到
+    历史文件中，完整的对局历史仍然可以读取用于分析，但不会拖慢加载。
+
+    帧内只做追加和换段（各一次小的文件操作），压缩和删除旧段都作为后台任务交给
+    SaveWriter，排在刚提交的快照之后执行。同一个槽的日志应只有一个实例
+    （由 SaveManager.get_journal 提供），删除存档时才能先关闭正在写入的段。
+
+    文件布局（以槽 0 为例）:
+        slot_0_<回合数>.jrn  活动段，文件名中的数字为段开始前的回合数
+        slot_0.history       已压缩的历史记录块
+    """
+    def __init__(self, save_dir='saves', slot: int = 0):
+        """
+        Args:
+            save_dir: 存档目录
+            slot: 存档槽
+        """
+        self.save_dir = Path(save_dir)
+        self.save_dir.mkdir(exist_ok=True)
+        self.slot = slot
+        self._file = None
+        self.writer = SaveWriter.get_instance()
+
+    @property
+    def history_path(self) -> Path:
+        return self.save_dir / f'slot_{self.slot}.history'
+
+    def _segment_path(self, first_turn: int) -> Path:
+        return self.save_dir / f'slot_{self.slot}_{first_turn}.jrn'
+
+    def _segments(self) -> List[Tuple[int, Path]]:
+        """列出活动段 (段开始前的回合数, 路径)，按回合排序"""
+        segments = []
+        for path in self.save_dir.glob(f'slot_{self.slot}_*.jrn'):
+            try:
+                segments.append((int(path.stem.rsplit('_', 1)[1]), path))
+            except ValueError:
+                continue
+        segments.sort()
+        return segments
+
+    @staticmethod
+    def encode(turn: TurnResult) -> bytes:
+        return TURN_RECORD.pack(turn.roll, turn.from_index, turn.to_index, turn.year, turn.month)
+
+    @staticmethod
+    def decode_records(data: bytes) -> List[TurnResult]:
+        """解码连续的回合记录，忽略末尾不完整的记录（写入时崩溃）"""
+        usable = len(data) - len(data) % TURN_RECORD.size
+        return [TurnResult(roll, from_index, to_index, None, year, month)
+                for roll, from_index, to_index, year, month in TURN_RECORD.iter_unpack(data[:usable])]
+
+    def start_segment(self, turn_count: int):
+        """从指定回合开始一个新的活动段
+
+        当前状态就是第 turn_count 回合，之后的旧记录都已失效（例如开始了新游戏），
+        会被一并删除；turn_count 为0时同时清空历史文件。
+        """
+        self.close()
+        # 还没执行的压缩任务不再需要，正在执行的等它完成后再删除文件
+        self.writer.discard(self.history_path)
+        for first_turn, path in self._segments():
+            if first_turn >= turn_count:
+                os.remove(path)
+        if turn_count == 0 and self.history_path.exists():
+            os.remove(self.history_path)
+
+        self._open_segment(turn_count)
+
+    def _open_segment(self, turn_count: int):
+        self._file = open(self._segment_path(turn_count), 'wb')
+        self._file.write(SEGMENT_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, turn_count))
+        self._file.flush()
+
+    def checkpoint(self, snapshot_turn: int):
+        """快照已提交：从快照的回合开始新段，旧段交给后台线程压缩
+
+        帧内只关闭当前段并打开新段；扫描、压缩和删除旧段都在 SaveWriter 线程中
+        执行，并排在刚提交的快照之后。
+
+        Args:
+            snapshot_turn: 快照包含的回合数
+        """
+        self.close()
+        self._open_segment(snapshot_turn)
+        self.writer.run(self.history_path, lambda: self.compact(snapshot_turn))
+
+    def append(self, turn: TurnResult, turn_count: int):
+        """追加一条回合记录
+
+        Args:
+            turn: 回合结果
+            turn_count: 包含本回合在内的总回合数
+        """
+        if self._file is None:
+            self.start_segment(turn_count - 1)
+        self._file.write(self.encode(turn))
+        self._file.flush()
+
+    def close(self):
+        """关闭当前段文件"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read_segment(self, path: Path) -> Tuple[int, List[TurnResult]]:
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, first_turn = SEGMENT_HEADER.unpack_from(data)
+        if magic != JOURNAL_MAGIC or version > JOURNAL_VERSION:
+            raise ValueError(f"无效的日志段: {path}")
+        return first_turn, self.decode_records(data[SEGMENT_HEADER.size:])
+
+    def _read_history(self) -> Iterator[Tuple[int, List[TurnResult]]]:
+        """逐块读取历史文件，返回 (块开始前的回合数, 记录列表)"""
+        if not self.history_path.exists():
+            return
+        with open(self.history_path, 'rb') as f:
+            data = f.read()
+        offset = 0
+        while offset + HISTORY_BLOCK.size <= len(data):
+            first_turn, count, length, crc = HISTORY_BLOCK.unpack_from(data, offset)
+            offset += HISTORY_BLOCK.size
+            block = data[offset:offset + length]
+            offset += length
+            if len(block) != length or zlib.crc32(block) != crc:
+                log.warning("历史记录块损坏，停止读取 - 回合 %d", first_turn)
+                return
+            yield first_turn, self.decode_records(zlib.decompress(block))[:count]
+
+    def iter_records(self, after_turn: int = 0, include_history: bool = True) -> Iterator[Tuple[int, TurnResult]]:
+        """按顺序遍历回合记录
+
+        Args:
+            after_turn: 只返回该回合之后的记录
+            include_history: 是否包含已压缩的历史记录
+
+        Returns:
+            Iterator[Tuple[int, TurnResult]]: (回合序号（从1开始）, 回合记录)
+        """
+        # 等待后台压缩完成，避免读到写了一半的历史块
+        self.writer.flush()
+        blocks = list(self._read_history()) if include_history else []
+        for first_turn, path in self._segments():
+            try:
+                blocks.append(self._read_segment(path))
+            except (ValueError, struct.error) as e:
+                log.warning("跳过无效日志段 %s: %s", path, e)
+
+        next_turn = after_turn + 1
+        for first_turn, records in blocks:
+            for i, record in enumerate(records):
+                turn_number = first_turn + i + 1
+                if turn_number == next_turn:
+                    yield turn_number, record
+                    next_turn += 1
+
+    def replay(self, model, snapshot_turn: int) -> int:
+        """在快照之后重放日志，恢复到最新状态
+
+        Args:
+            model: GameModel，已从快照恢复
+            snapshot_turn: 快照包含的回合数
+
+        Returns:
+            int: 重放的回合数
+        """
+        # 通常快照之后的记录都在活动段中；快照丢失时才需要读取历史文件
+        segments = self._segments()
+        need_history = not segments or segments[0][0] > snapshot_turn
+        replayed = 0
+        for turn_number, record in self.iter_records(snapshot_turn, include_history=need_history):
+            model.apply_turn(record)
+            replayed += 1
+        if replayed:
+            log.info("重放日志 - %d回合（快照之后）", replayed)
+        return replayed
+
+    def compact(self, snapshot_turn: int):
+        """把已被快照完全覆盖的段压缩追加到历史文件，然后删除这些段
+
+        会读取和压缩整段记录，游戏中通过 checkpoint 在后台线程调用。
+
+        Args:
+            snapshot_turn: 已保存的快照包含的回合数
+        """
+        segments = self._segments()
+        for i, (first_turn, path) in enumerate(segments):
+            # 段的结束回合为下一段的开始回合；当前正在写入的段不压缩
+            if i + 1 >= len(segments) or segments[i + 1][0] > snapshot_turn:
+                break
+            try:
+                first_turn, records = self._read_segment(path)
+            except (ValueError, struct.error) as e:
+                log.warning("跳过无效日志段 %s: %s", path, e)
+                continue
+            if records:
+                body = zlib.compress(b''.join(self.encode(record) for record in records))
+                with open(self.history_path, 'ab') as f:
+                    f.write(HISTORY_BLOCK.pack(first_turn, len(records), len(body), zlib.crc32(body)))
+                    f.write(body)
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.remove(path)
+            log.debug("压缩日志段 - 回合 %d 起 %d条记录", first_turn, len(records))
+
+    def clear(self):
+        """删除该槽的全部日志（新游戏或删除存档时），会先关闭正在写入的段"""
+        self.close()
+        self.writer.discard(self.history_path)
+        for _, path in self._segments():
+            os.remove(path)
+        if self.history_path.exists():
+            os.remove(self.history_path)
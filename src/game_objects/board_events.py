@@ -0,0 +1,180 @@
+import importlib
+import json
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from utils.logger import get_logger
+
+log = get_logger("BoardEvents")
+
+# 默认的格子事件定义文件（相对于项目根目录，与图片资源的路径约定一致）
+BOARD_EVENTS_PATH = "assets/data/board_events.json"
+
+# 触发方式
+LAND = "land"   # 停在该格子上
+PASS = "pass"   # 移动途中经过该格子（不含起点和终点）
+TRIGGERS = (LAND, PASS)
+
+# 内置事件类型 -> 处理函数的 "模块:函数" 引用，第一次触发时才导入
+EVENT_HANDLERS: Dict[str, str] = {
+    "shop": "game_objects.event_handlers:shop",
+    "battle": "game_objects.event_handlers:battle",
+    "relic": "game_objects.event_handlers:relic",
+    "companion": "game_objects.event_handlers:companion",
+}
+
+# 处理函数：(规则模型, 事件) -> 事件结果（没有结果时返回None）
+EventHandler = Callable[["object", "BoardEvent"], Optional[dict]]
+
+class BoardEvent:
+    """一个格子事件的定义"""
+    __slots__ = ("cell", "trigger", "type", "params")
+
+    def __init__(self, cell: int, trigger: str, event_type: str, params: Optional[dict] = None):
+        self.cell = cell
+        self.trigger = trigger
+        self.type = event_type
+        self.params = params or {}
+
+    def __repr__(self) -> str:
+        return f"BoardEvent({self.cell}, {self.trigger!r}, {self.type!r})"
+
+class EventRegistry:
+    """按格子索引（Board.path 的索引）组织的格子事件表
+
+    落点事件和经过事件各用一个按格子索引的 array 存放事件编号（-1 表示没有事件），
+    查找只是一次下标访问，与事件格子的数量无关；
+    没有任何经过事件时整段经过检查直接跳过。
+
+    处理函数只按名称记录，某类事件第一次触发时才导入对应模块，
+    无界面模拟中没有触发过的事件类型不会产生任何导入开销。
+
+    用法:
+        registry = EventRegistry.from_definition(board.cell_count, data)
+        fired = registry.resolve_move(model, path, destination)
+    """
+    def __init__(self, cell_count: int, handlers: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            cell_count: 棋盘格子数
+            handlers: 事件类型 -> 处理函数引用（"模块:函数"），会覆盖同名的内置类型
+        """
+        self.cell_count = cell_count
+        self.events: List[BoardEvent] = []
+        self._land = array('i', [-1]) * cell_count
+        self._pass = array('i', [-1]) * cell_count
+        self._pass_count = 0
+        self._handler_refs = dict(EVENT_HANDLERS)
+        if handlers:
+            self._handler_refs.update(handlers)
+        self._handlers: Dict[str, EventHandler] = {}
+
+    @classmethod
+    def from_definition(cls, cell_count: int, data: Dict) -> "EventRegistry":
+        """按数据定义创建事件表
+
+        格式:
+            {
+                "handlers": {"trap": "mymod.events:trap"},    # 可选，自定义事件类型
+                "events": [
+                    {"cell": 5, "type": "shop"},              # trigger 默认为 "land"
+                    {"cell": 0, "type": "relic", "trigger": "pass", "params": {...}}
+                ]
+            }
+        """
+        registry = cls(cell_count, data.get("handlers"))
+        for entry in data.get("events", ()):
+            registry.add(entry["cell"], entry["type"], entry.get("trigger", LAND), entry.get("params"))
+        return registry
+
+    @classmethod
+    def load(cls, cell_count: int, path: str = BOARD_EVENTS_PATH) -> "EventRegistry":
+        """从 JSON 文件加载事件表，文件不存在或格式错误时返回空表"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            log.info("没有格子事件定义: %s", path)
+            return cls(cell_count)
+        except (OSError, json.JSONDecodeError) as e:
+            log.error("读取格子事件定义失败: %s", e)
+            return cls(cell_count)
+        registry = cls.from_definition(cell_count, data)
+        log.info("加载格子事件 %d个 - %s", len(registry.events), path)
+        return registry
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @property
+    def has_passing(self) -> bool:
+        """是否有经过事件（没有时不需要检查移动途中的格子）"""
+        return self._pass_count > 0
+
+    def add(self, cell: int, event_type: str, trigger: str = LAND, params: Optional[dict] = None) -> BoardEvent:
+        """在格子上登记一个事件（每个格子每种触发方式只能有一个事件）"""
+        if not 0 <= cell < self.cell_count:
+            raise ValueError(f"格子索引 {cell} 超出范围")
+        if trigger not in TRIGGERS:
+            raise ValueError(f"未知的触发方式: {trigger}")
+        if event_type not in self._handler_refs:
+            raise ValueError(f"未知的事件类型: {event_type}")
+        table = self._land if trigger == LAND else self._pass
+        if table[cell] != -1:
+            raise ValueError(f"格子 {cell} 已有{trigger}事件")
+
+        event = BoardEvent(cell, trigger, event_type, params)
+        table[cell] = len(self.events)
+        self.events.append(event)
+        if trigger == PASS:
+            self._pass_count += 1
+        return event
+
+    def landing_event(self, cell: int) -> Optional[BoardEvent]:
+        """停在格子上时触发的事件"""
+        event_id = self._land[cell]
+        return self.events[event_id] if event_id >= 0 else None
+
+    def passing_event(self, cell: int) -> Optional[BoardEvent]:
+        """经过格子时触发的事件"""
+        event_id = self._pass[cell]
+        return self.events[event_id] if event_id >= 0 else None
+
+    def passed_events(self, path: Sequence[int]) -> List[BoardEvent]:
+        """一次移动中经过的所有格子（不含起点和终点）上的经过事件，按经过顺序"""
+        if not self._pass_count or len(path) < 3:
+            return []
+        table = self._pass
+        events = self.events
+        return [events[table[cell]] for cell in path[1:-1] if table[cell] >= 0]
+
+    def _handler(self, event_type: str) -> EventHandler:
+        """取得事件类型的处理函数，第一次使用时才导入"""
+        handler = self._handlers.get(event_type)
+        if handler is None:
+            module_name, _, attr = self._handler_refs[event_type].partition(':')
+            handler = getattr(importlib.import_module(module_name), attr)
+            self._handlers[event_type] = handler
+            log.debug("加载事件处理 - %s: %s", event_type, self._handler_refs[event_type])
+        return handler
+
+    def resolve_move(self, model, path: Optional[Sequence[int]],
+                     destination: int) -> List[Tuple[BoardEvent, Optional[dict]]]:
+        """结算一次移动触发的事件：先按顺序结算经过的格子，再结算落点
+
+        Args:
+            model: 规则模型（传给处理函数）
+            path: 经过的路径索引（含起点和终点），没有经过事件时可以为None
+            destination: 落点索引
+
+        Returns:
+            List[Tuple[BoardEvent, Optional[dict]]]: 触发的事件及其结果
+        """
+        fired = []
+        if path is not None and self._pass_count:
+            for event in self.passed_events(path):
+                fired.append((event, self._handler(event.type)(model, event)))
+        event_id = self._land[destination]
+        if event_id >= 0:
+            event = self.events[event_id]
+            fired.append((event, self._handler(event.type)(model, event)))
+        return fired
@@ -0,0 +1,240 @@
+from array import array
+from collections.abc import Sequence as SequenceABC
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 预先计算移动表的最大步数（两颗六面骰的最大点数）
+DEFAULT_MAX_STEPS = 12
+
+def generate_ring_path(width: int, height: int) -> List[Tuple[int, int]]:
+    """生成闭环路径的坐标列表
+    按照顺时针方向生成外圈路径：上→右→下→左
+
+    Args:
+        width: 横向格子数
+        height: 纵向格子数
+
+    Returns:
+        List[Tuple[int, int]]: 路径坐标列表，每个元素为(x, y)格子坐标
+    """
+    path = []
+
+    # 上边：从左到右
+    for x in range(width):
+        path.append((x, 0))
+
+    # 右边：从上到下
+    for y in range(1, height):
+        path.append((width-1, y))
+
+    # 下边：从右到左
+    for x in range(width-2, -1, -1):
+        path.append((x, height-1))
+
+    # 左边：从下到上
+    for y in range(height-2, 0, -1):
+        path.append((0, y))
+
+    return path
+
+def ring_successors(cell_count: int) -> List[List[int]]:
+    """闭环路径的后继表：每个格子只通向下一个格子，最后一个格子回到起点"""
+    return [[(index + 1) % cell_count] for index in range(cell_count)]
+
+class CellPathView(SequenceABC):
+    """移动路径的轻量视图
+
+    只保存格子坐标表和路径索引视图的引用，按下标取值时才查出格子坐标，
+    不复制整条路径。
+    """
+    __slots__ = ("cells", "indices")
+
+    def __init__(self, cells: List[Tuple[int, int]], indices: Sequence[int]):
+        """
+        Args:
+            cells: 按格子索引排列的网格坐标
+            indices: 路径经过的格子索引
+        """
+        self.cells = cells
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return CellPathView(self.cells, self.indices[item])
+        return self.cells[self.indices[item]]
+
+    def __iter__(self):
+        cells = self.cells
+        for index in self.indices:
+            yield cells[index]
+
+    def __repr__(self) -> str:
+        return f"CellPathView({list(self)!r})"
+
+class BoardModel:
+    """棋盘规则模型（不依赖 pygame）
+
+    棋盘是一张有向格子图：每个格子有一个或多个后继格子，
+    第一个后继是默认前进方向（规范路径），其余后继是岔路或捷径，
+    因此可以表示外圈、岔路、捷径和内圈。默认是 width x height 的外圈闭环。
+
+    创建时对每个格子、每个步数（0..max_steps）预先计算：
+    - 规范路径：沿默认方向走 k 步经过的格子，存放在一个扁平的 array 中，
+      move_indices 只返回该数组的切片视图，destination 只是一次下标访问；
+    - 可到达的终点：走岔路时 k 步可能到达的所有格子（压缩行格式存放）。
+
+    供界面层的 Board 和无界面模拟共用。
+    """
+    def __init__(self, width: int = 16, height: int = 9,
+                 cells: Optional[List[Tuple[int, int]]] = None,
+                 successors: Optional[Sequence[Sequence[int]]] = None,
+                 max_steps: int = DEFAULT_MAX_STEPS):
+        """
+        Args:
+            width: 横向格子数
+            height: 纵向格子数
+            cells: 按格子索引排列的网格坐标，为None时生成 width x height 的外圈
+            successors: 每个格子的后继格子索引（第一个为默认方向），为None时按闭环依次相连
+            max_steps: 预先计算移动表的最大步数，超过时按表分段查找
+        """
+        if cells is None:
+            cells = generate_ring_path(width, height)
+        if successors is None:
+            successors = ring_successors(len(cells))
+        if len(successors) != len(cells):
+            raise ValueError(f"后继表长度 {len(successors)} 与格子数 {len(cells)} 不一致")
+
+        self.width = width
+        self.height = height
+        self.path = cells  # 按格子索引排列的网格坐标
+        self.max_steps = max(1, max_steps)
+        self._build_successors(successors)
+        self._build_walks()
+        self._build_reachable()
+
+    @classmethod
+    def from_graph(cls, cells: List[Tuple[int, int]], successors: Sequence[Sequence[int]],
+                   max_steps: int = DEFAULT_MAX_STEPS) -> "BoardModel":
+        """按格子坐标和后继表创建棋盘，棋盘尺寸取格子坐标的范围"""
+        width = max((x for x, _ in cells), default=-1) + 1
+        height = max((y for _, y in cells), default=-1) + 1
+        return cls(width, height, cells=cells, successors=successors, max_steps=max_steps)
+
+    @classmethod
+    def from_definition(cls, data: Dict, max_steps: int = DEFAULT_MAX_STEPS) -> "BoardModel":
+        """按数据定义创建棋盘
+
+        格式:
+            {
+                "cells": [[0, 0], [1, 0], ...],   # 每个格子的网格坐标
+                "next": [[1], [2, 7], ...]         # 每个格子的后继索引，省略时按闭环依次相连
+            }
+        """
+        cells = [tuple(cell) for cell in data["cells"]]
+        successors = data.get("next") or ring_successors(len(cells))
+        return cls.from_graph(cells, successors, max_steps)
+
+    def _build_successors(self, successors: Sequence[Sequence[int]]):
+        """把后继表压缩成两个数组：_next_start[i]..._next_start[i+1] 是格子 i 的后继"""
+        total = len(self.path)
+        self._next_start = array('i', [0])
+        self._next_cells = array('i')
+        for index, targets in enumerate(successors):
+            if not targets:
+                raise ValueError(f"格子 {index} 没有后继格子")
+            for target in targets:
+                if not 0 <= target < total:
+                    raise ValueError(f"格子 {index} 的后继 {target} 超出范围")
+                self._next_cells.append(target)
+            self._next_start.append(len(self._next_cells))
+
+    def _build_walks(self):
+        """规范路径表：_walks[i * stride + k] 为从格子 i 沿默认方向走 k 步到达的格子"""
+        total = len(self.path)
+        stride = self.max_steps + 1
+        first_next = [self._next_cells[self._next_start[index]] for index in range(total)]
+        walks = array('i', bytes(4 * total * stride))
+        for index in range(total):
+            base = index * stride
+            cell = index
+            walks[base] = cell
+            for step in range(1, stride):
+                cell = first_next[cell]
+                walks[base + step] = cell
+        self._stride = stride
+        self._walks = walks
+        self._walk_view = memoryview(walks)
+
+    def _build_reachable(self):
+        """可到达终点表：第 i * stride + k 行为从格子 i 走 k 步可能到达的所有格子（升序）"""
+        total = len(self.path)
+        next_start = self._next_start
+        next_cells = self._next_cells
+        offsets = array('i', [0])
+        reachable = array('i')
+        for index in range(total):
+            frontier = {index}
+            for step in range(self._stride):
+                if step:
+                    frontier = {next_cells[k] for cell in frontier
+                                for k in range(next_start[cell], next_start[cell + 1])}
+                reachable.extend(sorted(frontier))
+                offsets.append(len(reachable))
+        self._reach_offsets = offsets
+        self._reach_view = memoryview(reachable)
+
+    @property
+    def cell_count(self) -> int:
+        """棋盘上的格子数"""
+        return len(self.path)
+
+    @property
+    def is_ring(self) -> bool:
+        """是否是没有岔路的单一闭环（格子 i 只通向 i+1）"""
+        total = len(self.path)
+        if len(self._next_cells) != total:
+            return False
+        return all(self._next_cells[index] == (index + 1) % total for index in range(total))
+
+    def successors(self, index: int) -> Sequence[int]:
+        """格子的后继索引（第一个为默认方向）"""
+        return memoryview(self._next_cells)[self._next_start[index]:self._next_start[index + 1]]
+
+    def destination(self, index: int, steps: int) -> int:
+        """从指定索引沿默认方向移动若干步后的索引"""
+        limit = self.max_steps
+        while steps > limit:
+            index = self._walks[index * self._stride + limit]
+            steps -= limit
+        return self._walks[index * self._stride + steps]
+
+    def move_indices(self, index: int, steps: int) -> Sequence[int]:
+        """沿默认方向移动经过的路径索引，包含起点和终点
+
+        步数不超过 max_steps 时返回规范路径表的切片视图（不复制），
+        超过时才分段拼出一个列表。
+        """
+        base = index * self._stride
+        if steps <= self.max_steps:
+            return self._walk_view[base:base + steps + 1]
+
+        indices = [index]
+        while steps > 0:
+            chunk = min(steps, self.max_steps)
+            base = indices[-1] * self._stride
+            indices.extend(self._walks[base + 1:base + chunk + 1])
+            steps -= chunk
+        return indices
+
+    def reachable(self, index: int, steps: int) -> Sequence[int]:
+        """走岔路时从指定索引移动若干步可能到达的所有格子（不超过 max_steps）"""
+        if steps > self.max_steps:
+            raise ValueError(f"步数 {steps} 超过预先计算的最大步数 {self.max_steps}")
+        row = index * self._stride + steps
+        return self._reach_view[self._reach_offsets[row]:self._reach_offsets[row + 1]]
+
+    def move_path(self, index: int, steps: int) -> CellPathView:
+        """移动经过的格子网格坐标（视图）"""
+        return CellPathView(self.path, self.move_indices(index, steps))
@@ -0,0 +1,21 @@
+from typing import Optional
+
+# 内置格子事件的处理函数，由 EventRegistry 在对应类型的事件第一次触发时导入。
+# 每个处理函数接收规则模型和事件定义，返回事件结果（界面层据此展示）；
+# 目前只整理出事件的基本信息，具体玩法（商店货品、战斗结算等）在后续实现。
+
+def shop(model, event) -> Optional[dict]:
+    """商店：列出可购买的货品"""
+    return {"event": "shop", "cell": event.cell, "items": list(event.params.get("items", ()))}
+
+def battle(model, event) -> Optional[dict]:
+    """战斗：记录遭遇的敌人"""
+    return {"event": "battle", "cell": event.cell, "enemy": event.params.get("enemy", "bandit")}
+
+def relic(model, event) -> Optional[dict]:
+    """遗物：记录获得的遗物"""
+    return {"event": "relic", "cell": event.cell, "relic": event.params.get("relic")}
+
+def companion(model, event) -> Optional[dict]:
+    """同伴：记录遇到的同伴"""
+    return {"event": "companion", "cell": event.cell, "companion": event.params.get("companion")}
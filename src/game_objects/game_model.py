@@ -0,0 +1,108 @@
+import random
+from typing import Optional, Sequence
+from game_objects.board_events import EventRegistry
+from game_objects.board_model import BoardModel
+from game_objects.game_time import GameTime
+
+class TurnResult:
+    """一个回合的结算结果"""
+    __slots__ = ("roll", "from_index", "to_index", "path", "year", "month", "events")
+
+    def __init__(self, roll: int, from_index: int, to_index: int, path: Optional[Sequence[int]],
+                 year: int, month: int, events: Sequence = ()):
+        self.roll = roll
+        self.from_index = from_index
+        self.to_index = to_index
+        self.path = path  # 经过的路径索引（含起点和终点，通常是移动表的视图），不需要时为None
+        self.year = year
+        self.month = month
+        self.events = events  # 触发的格子事件及结果 [(BoardEvent, dict)]，没有时为空
+
+class GameModel:
+    """游戏规则核心（不依赖 pygame）
+
+    包含棋盘、回合结算、时间推进和存档数据，界面层和无界面模拟共用同一套规则。
+    """
+    def __init__(self, board: Optional[BoardModel] = None, game_time: Optional[GameTime] = None,
+                 seed: Optional[int] = None, dice_faces: int = 6,
+                 rng: Optional[random.Random] = None, events: Optional[EventRegistry] = None):
+        """
+        Args:
+            board: 棋盘模型，默认16x9外圈
+            game_time: 时间对象，默认使用纯数据的 GameTime；界面层可以传入带颜色的子类
+            seed: 随机种子，用于 roll_dice
+            dice_faces: 骰子面数
+            rng: 使用外部的随机数流（指定时忽略 seed）
+            events: 格子事件表，为None时落点和经过都不触发事件
+        """
+        self.board = board or BoardModel()
+        self.game_time = game_time or GameTime()
+        self.rng = rng or random.Random(seed)
+        self.dice_faces = dice_faces
+        self.events = events
+        self.position = 0
+        self.player_name = "冒险者"
+        self.turn_count = 0
+
+    def reset(self):
+        """重置为新游戏状态"""
+        self.position = 0
+        self.turn_count = 0
+        self.game_time.year = 1
+        self.game_time.month = 1
+
+    def roll_dice(self) -> int:
+        """投掷骰子"""
+        return self.rng.randint(1, self.dice_faces)
+
+    def resolve_turn(self, roll: int, record_path: bool = True) -> TurnResult:
+        """结算一个回合：移动棋子、推进一个月，并结算经过和落点的格子事件
+
+        Args:
+            roll: 骰子点数
+            record_path: 是否记录经过的路径索引（批量模拟时可关闭以提速）
+
+        Returns:
+            TurnResult: 本回合结果
+        """
+        from_index = self.position
+        events = self.events
+        # 有经过事件时即使不记录路径也需要经过的格子（移动表的视图，不复制）
+        need_path = record_path or (events is not None and events.has_passing)
+        path = self.board.move_indices(from_index, roll) if need_path else None
+        self.position = self.board.destination(from_index, roll)
+        self.game_time.advance_month()
+        self.turn_count += 1
+        fired = events.resolve_move(self, path, self.position) if events is not None else ()
+        return TurnResult(roll, from_index, self.position, path if record_path else None,
+                          self.game_time.year, self.game_time.month, fired)
+
+    def apply_turn(self, turn: TurnResult):
+        """应用一条已记录的回合结果（重放日志时使用，不投掷骰子）"""
+        self.position = turn.to_index
+        self.game_time.year = turn.year
+        self.game_time.month = turn.month
+        self.turn_count += 1
+
+    def play_turn(self, record_path: bool = True) -> TurnResult:
+        """投掷骰子并结算一个回合"""
+        return self.resolve_turn(self.roll_dice(), record_path)
+
+    def to_save_data(self) -> dict:
+        """导出存档数据"""
+        return {
+            "player_position": self.position,
+            "year": self.game_time.year,
+            "month": self.game_time.month,
+            "player_name": self.player_name,
+            "turn_count": self.turn_count
+        }
+
+    def load_save_data(self, data: dict):
+        """从存档数据恢复状态"""
+        self.position = data["player_position"]
+        self.game_time.year = data["year"]
+        self.game_time.month = data["month"]
+        if "player_name" in data:
+            self.player_name = data["player_name"]
+        self.turn_count = data.get("turn_count", 0)
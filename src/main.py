@@ -1,28 +1,167 @@
 import pygame
 import sys
 import os
+import argparse
+import shutil
+import tempfile
+import time
 from pathlib import Path
+from components.save_manager import SaveManager
 from scenes.main_menu import MainMenu
 from scenes.game_board import GameBoard
+from scenes.scene_registry import SceneRegistry
+from scenes.token_stress import TokenStressScene
+from utils.asset_manager import AssetManager, CHARACTER_IMAGES
+from utils.display import Display, SCALE_MODES, SCALE_SCALED
+from utils.font_manager import FontManager
+from utils.startup_timer import StartupTimer
+from utils.frame_profiler import FrameProfiler
+from utils.game_clock import GameClock
+from utils.random_streams import RandomStreams
+from utils.session_recorder import SessionRecorder, SessionPlayer, restore_saves, snapshot_saves
+from utils.save_writer import SaveWriter
+from utils.logger import get_logger, configure_logging, parse_levels_arg, dump_ring_buffer
+
+log = get_logger("Game")
+
+# 游戏逻辑的固定更新频率（次/秒），与绘制帧率无关
+UPDATE_RATE = 60
+# 单帧最多补算的时间（秒），避免卡顿或调试暂停后一次补算过多更新
+MAX_FRAME_TIME = 0.25
+# 空闲时等待事件的最长时间（毫秒）
+IDLE_TIMEOUT_MS = 1000
+# 窗口被重新显示（遮挡后露出、最小化后恢复等）时需要整屏重绘的事件
+REDRAW_EVENTS = frozenset(
+    getattr(pygame, name) for name in ('VIDEOEXPOSE', 'WINDOWEXPOSED', 'WINDOWSHOWN',
+                                       'WINDOWRESTORED', 'WINDOWMAXIMIZED',
+                                       'WINDOWFOCUSGAINED', 'ACTIVEEVENT')
+    if hasattr(pygame, name))
 
 class Game:
-    def __init__(self):
+    def __init__(self, dirty_rect_mode: bool = False, unload_inactive_scenes: bool = False,
+                 profile: bool = False, profile_csv: str = None, seed: int = None,
+                 record_path: str = None, replay_path: str = None, max_fps: int = 60,
+                 vsync: bool = False, idle_mode: bool = True, ai_players: int = 0,
+                 stress_test: bool = False, scale_mode: str = SCALE_SCALED,
+                 window_size=None, fullscreen: bool = False):
+        """
+        Args:
+            dirty_rect_mode: 是否开启脏矩形模式。开启后场景只重绘发生变化的区域，
+                并且只把这些区域缩放、推送到窗口
+            unload_inactive_scenes: 切换场景时是否卸载不活跃的场景以释放内存
+            profile: 是否从启动开始记录逐帧分阶段耗时（F3 显示叠加统计，F4 导出CSV）
+            profile_csv: 退出时把逐帧耗时导出到该CSV文件
+            seed: 随机种子，指定后可以复现同样的骰子结果
+            record_path: 把本局的随机种子、每帧时间和事件录制到该文件
+            replay_path: 回放录制的文件（使用录制时的种子、帧时间和事件，不限帧率运行），
+                用于可重复的性能测试。回放从录制开始时的存档状态出发，
+                存档读写都在临时目录中进行，不会改动真实存档
+            max_fps: 绘制帧率上限，0表示不限帧率；游戏逻辑始终按固定步长更新
+            vsync: 是否开启垂直同步（显示驱动不支持时自动关闭）
+            idle_mode: 是否开启空闲模式。场景没有动画时阻塞等待事件，
+                并且只在画面有变化时重绘，降低空闲时的CPU占用
+            ai_players: 游戏中的电脑玩家数量
+            stress_test: 启动后直接进入棋子数量压力测试场景
+            scale_mode: 逻辑画面（1920x1080）缩放到窗口的方式，见 utils.display
+            window_size: software 缩放方式的初始窗口大小，默认按桌面大小适配
+            fullscreen: 是否以全屏启动（F11 切换）
+        """
+        self.dirty_rect_mode = dirty_rect_mode
+        self.unload_inactive_scenes = unload_inactive_scenes
+        self.profile_csv = profile_csv
+        self.profiler = FrameProfiler.get_instance()
+        self.profiler.enabled = profile or bool(profile_csv)
+        self.startup_timer = StartupTimer()
+        
+        # 录像回放时使用录制时的种子和电脑玩家数量，保证随机结果一致
+        self.replay = SessionPlayer(replay_path) if replay_path else None
+        if self.replay:
+            seed = self.replay.seed
+            ai_players = self.replay.ai_players
+        self.seed = RandomStreams.get_instance().seed(seed)
+        self.game_clock = GameClock.get_instance()
+        self.record_path = record_path
+        self.recorder = None
+        
+        # 固定步长更新：累积真实经过的时间，每满一个步长更新一次，
+        # 绘制时按剩余时间在上一次和本次更新的状态之间插值
+        self.fixed_dt = 1.0 / UPDATE_RATE
+        # 压力测试需要测出实际能达到的帧率，不限帧率
+        self.max_fps = 0 if stress_test else max_fps
+        self.vsync = vsync
+        self._accumulator = 0.0
+        self._last_frame_time = None
+        
+        # 上一帧结束时场景处于空闲状态，本帧开始时等待事件
+        self.idle_mode = idle_mode
+        self._idle = False
+        
         # 确保在正确的工作目录
         self._setup_working_directory()
         
-        pygame.init()
-        self.screen = pygame.display.set_mode((1920, 1080))
-        pygame.display.set_caption("冒险棋")
+        with self.startup_timer.phase("pygame.init"):
+            pygame.init()
+        with self.startup_timer.phase("set_mode"):
+            # 场景始终在逻辑分辨率的画面上绘制，由 Display 缩放到实际窗口
+            self.display = Display(scale_mode, window_size, fullscreen, vsync)
+            self.vsync = self.display.vsync
+            self.screen = self.display.surface
+            pygame.display.set_caption("冒险棋")
         self.clock = pygame.time.Clock()
         
-        # 初始化场景
-        self.scenes = {
-            'main_menu': MainMenu(self.screen),
-            'game_board': GameBoard(self.screen)
-        }
-        self.current_scene = 'main_menu'  # 使用字符串键
+        # 在后台加载字体，同时显示启动画面
+        with self.startup_timer.phase("字体加载"):
+            FontManager.get_instance().load_async()
+            self._show_splash_until_fonts_loaded()
+        
+        # 预加载角色图片（需在设置显示模式之后，以便转换为显示格式）
+        with self.startup_timer.phase("图片预加载"):
+            AssetManager.get_instance().preload(CHARACTER_IMAGES.values())
+        
+        # 录制时记下开始时的存档状态；回放时把它恢复到临时目录，之后的存档都写在那里
+        self._replay_save_dir = None
+        if self.replay:
+            self._replay_save_dir = tempfile.mkdtemp(prefix="replay_saves_")
+            restore_saves(self.replay.saves, self._replay_save_dir)
+            SaveManager.default_save_dir = self._replay_save_dir
+            log.info("回放使用临时存档目录: %s", self._replay_save_dir)
+        if self.record_path:
+            self.recorder = SessionRecorder(self.record_path, self.seed, self.screen.get_size(),
+                                            ai_players, snapshot_saves(SaveManager.default_save_dir))
+        
+        # 注册场景，第一次使用时才创建
+        self.scenes = SceneRegistry()
+        self.scenes.register('main_menu', lambda: MainMenu(self.screen))
+        self.scenes.register('game_board', lambda: GameBoard(self.screen, ai_players))
+        self.scenes.register('token_stress', lambda: TokenStressScene(self.screen))
+        self.current_scene = 'token_stress' if stress_test else 'main_menu'  # 使用字符串键
+        with self.startup_timer.phase(f"场景 {self.current_scene}"):
+            self.scenes.get(self.current_scene)
         self.running = True
     
+    def _show_splash_until_fonts_loaded(self):
+        """字体加载期间显示简单的启动画面
+        
+        启动画面只使用 pygame 自带的默认字体，不依赖正在加载的中文字体。
+        """
+        font_manager = FontManager.get_instance()
+        if font_manager.is_loaded():
+            return
+        
+        splash_font = pygame.font.Font(None, 48)
+        text_surface = splash_font.render("Loading...", True, (117, 117, 117))
+        text_rect = text_surface.get_rect(center=self.screen.get_rect().center)
+        
+        while not font_manager.is_loaded():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+            self.screen.fill((245, 245, 245))
+            self.screen.blit(text_surface, text_rect)
+            self.display.present()
+            self.clock.tick(30)
+    
     def _setup_working_directory(self):
         """确保工作目录是项目根目录"""
         current_dir = Path(os.getcwd())
@@ -35,58 +174,300 @@ class Game:
             # 如果不在项目根目录，尝试移动到正确位置
             os.chdir(src_dir.parent)
         
-        print(f"工作目录设置为: {os.getcwd()}")
+        log.info("工作目录设置为: %s", os.getcwd())
     
     def handle_scene_action(self, action):
         """处理场景返回的动作"""
         if action == "quit":
             self.running = False
         elif action == "new_game":
-            print("[Game] 切换到游戏场景（新游戏）")
+            log.info("切换到游戏场景（新游戏）")
             self.current_scene = "game_board"
-            # 重置游戏状态
-            self.scenes["game_board"].reset()
+            # 重置游戏状态（新创建的场景本身就是初始状态）
+            if self.scenes.is_loaded("game_board"):
+                self.scenes["game_board"].reset()
         elif action == "continue_game":
-            print("[Game] 切换到游戏场景（继续游戏）")
+            log.info("切换到游戏场景（继续游戏）")
             self.current_scene = "game_board"
+            # 场景是新创建的（首次进入或已被卸载）时从存档恢复状态
+            if not self.scenes.is_loaded("game_board"):
+                self.scenes["game_board"]._load_game_state()
         elif action == "main_menu":
-            print("[Game] 返回主菜单")
+            log.info("返回主菜单")
             self.current_scene = "main_menu"
-            # 刷新主菜单状态
-            self.scenes["main_menu"].refresh()
+            # 刷新主菜单状态（新创建的场景本身就是最新状态）
+            if self.scenes.is_loaded("main_menu"):
+                self.scenes["main_menu"].refresh()
+        
+        # 切换后的场景需要整屏重绘
+        if self.running:
+            self.scenes[self.current_scene].invalidate()
+            if self.unload_inactive_scenes:
+                self.scenes.unload_inactive(self.current_scene)
             
     def run(self):
         """运行游戏主循环"""
+        profiler = self.profiler
+        replay_start = time.perf_counter()
         while self.running:
+            profiler.begin_frame()
+            events = self._begin_frame()
+            if events is None:
+                # 录像回放结束
+                break
+            scene = self.scenes[self.current_scene]
+            resumed = self._idle
+            
             # 处理事件
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE and self.current_scene == "game_board":
-                        # 保存游戏状态
-                        self.scenes["game_board"]._save_game_state()
-                        # 返回主菜单
-                        self.handle_scene_action("main_menu")
+            with profiler.span("events"):
+                for event in events:
+                    if event.type == pygame.QUIT:
+                        self.running = False
+                    elif self.display.handle_event(event):
+                        # 窗口大小变化在本帧事件处理完之后统一重建一次
                         continue
-                
-                # 处理当前场景的事件
-                action = self.scenes[self.current_scene].handle_event(event)
-                if action:
-                    self.handle_scene_action(action)
+                    elif event.type in REDRAW_EVENTS:
+                        # 窗口内容可能已经失效，空闲时也必须整屏重绘
+                        self.scenes[self.current_scene].invalidate()
+                    elif event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_ESCAPE and self.current_scene == "game_board":
+                            # 保存游戏状态
+                            self.scenes["game_board"]._save_game_state()
+                            # 返回主菜单
+                            self.handle_scene_action("main_menu")
+                            continue
+                        if event.key == pygame.K_F3:
+                            # 切换帧耗时叠加显示
+                            self._toggle_profiler_overlay()
+                            continue
+                        if event.key == pygame.K_F4:
+                            # 导出帧耗时记录
+                            self.export_frame_times()
+                            continue
+                        if event.key == pygame.K_F11:
+                            # 切换全屏
+                            self.display.toggle_fullscreen()
+                            continue
+                    
+                    # 处理当前场景的事件
+                    action = self.scenes[self.current_scene].handle_event(event)
+                    if action:
+                        self.handle_scene_action(action)
+                if self.display.apply_pending():
+                    self.scenes[self.current_scene].invalidate()
+            scene = self.scenes[self.current_scene]
             
-            # 更新当前场景
-            self.scenes[self.current_scene].update()
+            # 按固定步长更新当前场景（本帧可能更新0次或多次）
+            with profiler.span("update"):
+                for _ in range(self._consume_update_steps(resumed)):
+                    self.scenes[self.current_scene].update(self.fixed_dt)
+                scene = self.scenes[self.current_scene]
+                scene.prepare_draw(self._accumulator / self.fixed_dt)
             
-            # 绘制当前场景
-            self.scenes[self.current_scene].draw()
+            # 绘制当前场景并更新显示（空闲时画面没有变化则跳过）
+            if resumed and not scene.dirty.has_dirty:
+                pass
+            elif self.dirty_rect_mode:
+                with profiler.span("draw"):
+                    # 半透明的叠加显示每帧都需要先重绘其下方（新旧两个区域）的场景
+                    old_overlay_rect = profiler.get_overlay_rect()
+                    overlay_rect = profiler.refresh_overlay()
+                    if overlay_rect:
+                        scene.dirty.mark(old_overlay_rect)
+                        scene.dirty.mark(overlay_rect)
+                    dirty_rects = scene.draw_dirty()
+                    if profiler.blit_overlay(self.screen):
+                        dirty_rects.append(overlay_rect)
+                with profiler.span("flip"):
+                    self.display.present(dirty_rects)
+            else:
+                with profiler.span("draw"):
+                    scene.draw()
+                    scene.dirty.consume()
+                    profiler.draw_overlay(self.screen)
+                with profiler.span("flip"):
+                    self.display.present()
+            self.startup_timer.mark_first_frame()
             
-            # 更新显示
-            pygame.display.flip()
+            # 没有动画时下一帧进入空闲等待（叠加显示需要持续刷新统计，不进入空闲）
+            self._idle = (self.idle_mode and not scene.is_animating
+                          and not profiler.overlay_visible)
             
-            # 控制帧率
-            self.clock.tick(60)
+            # 控制帧率（回放录像和不限帧率时只统计，不等待）
+            with profiler.span("wait"):
+                if self.replay or not self.max_fps:
+                    self.clock.tick()
+                else:
+                    self.clock.tick(self.max_fps)
+            profiler.end_frame()
+        
+        if self.recorder:
+            self.recorder.close()
+        if self.replay:
+            elapsed = time.perf_counter() - replay_start
+            frames = self.replay.frame_index
+            log.info("录像回放完成 - %d帧, 耗时 %.2fs, 平均 %.1f FPS", frames, elapsed,
+                     frames / elapsed if elapsed > 0 else 0.0)
+        if self.profile_csv:
+            self.export_frame_times(self.profile_csv)
+        
+        # 等待后台存档写完再退出
+        SaveWriter.get_instance().shutdown()
+        if self._replay_save_dir:
+            shutil.rmtree(self._replay_save_dir, ignore_errors=True)
+    
+    def _consume_update_steps(self, resumed: bool = False) -> int:
+        """把本帧经过的时间计入累积器，返回本帧需要执行的固定步长更新次数
+        
+        Args:
+            resumed: 本帧是否从空闲等待中恢复（等待的时间不需要补算更新）
+        """
+        now = self.game_clock.now()
+        if self._last_frame_time is None or resumed:
+            # 第一帧和空闲恢复后按一个步长计算，保证至少更新一次
+            frame_time = self.fixed_dt
+        else:
+            frame_time = min(now - self._last_frame_time, MAX_FRAME_TIME)
+        self._last_frame_time = now
+        
+        self._accumulator += max(frame_time, 0.0)
+        steps = int(self._accumulator / self.fixed_dt)
+        self._accumulator -= steps * self.fixed_dt
+        return steps
+    
+    def _begin_frame(self):
+        """开始新的一帧：推进游戏时钟并取得本帧的事件
+
+        正常运行时读取真实时间和事件（录制时同时写入录像），
+        回放时使用录像中的帧时间和事件。
+
+        Returns:
+            List[pygame.event.Event]: 本帧的事件，录像回放结束时返回None
+        """
+        if self.replay:
+            # 仍然取出真实事件，避免窗口失去响应；关闭窗口可以中止回放
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+            frame = self.replay.next_frame()
+            if frame is None or not self.running:
+                return None
+            frame_time, events = frame
+            self.game_clock.begin_frame(frame_time)
+            return events
+        
+        events = self._wait_for_events() if self._idle else []
+        self.game_clock.begin_frame()
+        events += pygame.event.get()
+        # 录像中保存的是逻辑坐标，回放与窗口大小无关
+        self.display.translate_events(events)
+        if self.recorder:
+            self.recorder.record_frame(self.game_clock.now(), events)
+        return events
+    
+    def _wait_for_events(self) -> list:
+        """空闲时阻塞等待事件，直到有事件或者场景需要重绘（如光标闪烁）"""
+        timeout = self.scenes[self.current_scene].get_idle_timeout()
+        if timeout is None:
+            timeout = IDLE_TIMEOUT_MS
+        event = pygame.event.wait(max(int(timeout), 1))
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event]
+    
+    def _toggle_profiler_overlay(self):
+        """切换帧耗时叠加显示"""
+        overlay_rect = self.profiler.get_overlay_rect()
+        self.profiler.toggle_overlay()
+        # 关闭时需要重绘叠加显示原先占用的区域
+        if overlay_rect:
+            self.scenes[self.current_scene].dirty.mark(overlay_rect)
+    
+    def export_frame_times(self, path: str = None):
+        """导出逐帧耗时记录为CSV
+        
+        Args:
+            path: 导出路径，默认保存到 logs/frame_times_<时间>.csv
+        """
+        if path is None:
+            Path('logs').mkdir(exist_ok=True)
+            path = os.path.join('logs', time.strftime("frame_times_%Y%m%d_%H%M%S.csv"))
+        self.profiler.export_csv(path)
+
+def parse_size(text: str):
+    """解析 "宽x高" 格式的尺寸"""
+    width, _, height = text.lower().partition('x')
+    try:
+        return (int(width), int(height))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"尺寸格式应为 宽x高: {text}")
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="冒险棋")
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help="开启脏矩形模式，只重绘和推送发生变化的屏幕区域")
+    parser.add_argument('--unload-inactive-scenes', action='store_true',
+                        help="切换场景时卸载不活跃的场景以释放内存")
+    parser.add_argument('--log-level', default='INFO',
+                        help="默认日志级别（DEBUG/INFO/WARNING/ERROR）")
+    parser.add_argument('--log', type=parse_levels_arg, default='',
+                        help="各子系统的日志级别，如 Board=DEBUG,Dice=WARNING")
+    parser.add_argument('--quiet', action='store_true',
+                        help="不向控制台输出日志（仍保存在内存环形缓冲中）")
+    parser.add_argument('--profile', action='store_true',
+                        help="记录逐帧分阶段耗时（F3 切换叠加显示，F4 导出CSV）")
+    parser.add_argument('--profile-csv', default=None,
+                        help="退出时把逐帧耗时导出到指定CSV文件")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="随机种子，指定后骰子结果可复现")
+    parser.add_argument('--record', default=None,
+                        help="把本局的种子、帧时间和事件录制到指定文件（.jsonl.gz）")
+    parser.add_argument('--replay', default=None,
+                        help="回放录制的文件，不限帧率运行，可作为可重复的性能测试")
+    parser.add_argument('--max-fps', type=int, default=60,
+                        help="绘制帧率上限，0表示不限帧率（游戏逻辑始终每秒更新60次）")
+    parser.add_argument('--vsync', action='store_true',
+                        help="开启垂直同步")
+    parser.add_argument('--ai-players', type=int, default=0,
+                        help="电脑玩家数量")
+    parser.add_argument('--stress', action='store_true',
+                        help="进入棋子数量压力测试场景，逐级增加棋子并报告帧率")
+    parser.add_argument('--scale-mode', choices=SCALE_MODES, default=SCALE_SCALED,
+                        help="scaled: 使用 pygame.SCALED 由 SDL 缩放; software: 每帧缩放一次逻辑画面")
+    parser.add_argument('--window', type=parse_size, default=None,
+                        help="software 缩放方式的初始窗口大小，如 1366x768")
+    parser.add_argument('--fullscreen', action='store_true',
+                        help="以全屏启动（F11 切换）")
+    parser.add_argument('--no-idle', action='store_true',
+                        help="关闭空闲模式，没有动画时也按帧率持续重绘")
+    return parser.parse_args(argv)
 
 if __name__ == '__main__':
-    game = Game()
-    game.run() 
\ No newline at end of file
+    args = parse_args()
+    configure_logging(args.log_level, args.log, console=not args.quiet)
+    try:
+        game = Game(dirty_rect_mode=args.dirty_rects,
+                    unload_inactive_scenes=args.unload_inactive_scenes,
+                    profile=args.profile,
+                    profile_csv=args.profile_csv,
+                    seed=args.seed,
+                    record_path=args.record,
+                    replay_path=args.replay,
+                    max_fps=args.max_fps,
+                    vsync=args.vsync,
+                    idle_mode=not args.no_idle,
+                    ai_players=args.ai_players,
+                    stress_test=args.stress,
+                    scale_mode=args.scale_mode,
+                    window_size=args.window,
+                    fullscreen=args.fullscreen)
+        game.run()
+    except Exception:
+        # 崩溃时导出最近的日志，便于事后分析
+        log.exception("游戏异常退出")
+        # 尽量把已提交的存档写完
+        SaveWriter.get_instance().shutdown(timeout=5.0)
+        Path('logs').mkdir(exist_ok=True)
+        dump_ring_buffer(os.path.join('logs', 'crash.log'))
+        raise
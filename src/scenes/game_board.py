@@ -3,21 +3,59 @@ import os
 from pathlib import Path
 from components.dice import Dice
 from components.player import Player
+from components.token import Token
+from components.token_layer import TokenLayer, PLAYER_LAYER
 from components.board import Board
+from components.board_geometry import BoardGeometry
 from components.game_time import GameTime
 from components.save_manager import SaveManager
+from game_objects.board_events import EventRegistry
+from game_objects.game_model import GameModel
 from utils.font_manager import FontManager
+from utils.dirty_rects import DirtyRectTracker, draw_border
+from utils.frame_profiler import FrameProfiler
+from utils.game_clock import GameClock
+from utils.tween import TweenSystem
+from utils.ui_compositor import ModalLayer, UICompositor
+from utils.asset_manager import CHARACTER_IMAGES
+from utils.random_streams import RandomStreams, GAMEPLAY, AI
+from utils.logger import get_logger
+
+log = get_logger("GameBoard")
 
 class GameBoard:
-    def __init__(self, screen):
+    def __init__(self, screen, ai_players: int = 0):
+        """
+        Args:
+            screen: 绘制目标表面
+            ai_players: 电脑玩家数量（电脑玩家不写入存档，每局从起点开始）
+        """
         self.screen = screen
+        self.ai_player_count = ai_players
         self.screen_width = screen.get_width()
         self.screen_height = screen.get_height()
         
+        # 脏矩形跟踪（仅在主循环开启脏矩形模式时使用）
+        self.dirty = DirtyRectTracker(screen.get_rect())
+        self._dirty_state = None
+        
+        # 名称编辑弹窗的模态层（缓存变暗后的下方画面，弹窗外观由合成器缓存）
+        self.modal = ModalLayer(screen, self.dirty)
+        self.compositor = UICompositor.get_instance()
+        
+        # 静态棋盘层缓存（背景 + 所有格子），布局或颜色变化时才重建
+        self._board_layer = None
+        self._board_layer_key = None
+        
+        # 帧耗时统计（绘制子阶段、自动保存）
+        self.profiler = FrameProfiler.get_instance()
+        self.clock = GameClock.get_instance()
+        
         self._initialize_game_state()
         
-        # 修改时间显示文本的渲染方式
-        self.time_font = FontManager.get_instance().get_font(24)
+        # 修改时间显示文本的渲染方式（文字表面由 FontManager 缓存）
+        self.font_manager = FontManager.get_instance()
+        self.time_font = self.font_manager.get_font(24)
         
         # 名称编辑弹窗相关
         self.editing_name = False
@@ -28,63 +66,9 @@ class GameBoard:
         self.edit_border_color = pygame.Color('#AAAAAA')
         self.edit_text_color = pygame.Color('#212121')
         
-        # 棋盘配置
-        self.cell_size = 115
-        self.board_width = 16
-        self.board_height = 9
-        self.border_width = 5
-        
-        # 计算棋盘位置
-        self.board_pixel_width = self.cell_size * self.board_width
-        self.board_pixel_height = self.cell_size * self.board_height
-        
-        # 添加右下方偏移量
-        right_offset = 50
-        down_offset = 20
-        
-        self.board_x = (self.screen_width - self.board_pixel_width) // 2 + right_offset
-        self.board_y = (self.screen_height - self.board_pixel_height) // 2 + down_offset
-        
-        # 颜色定义
-        self.colors = {
-            'background': pygame.Color('#F5F5F5'),
-            'cell': pygame.Color('#FFFFFF'),
-            'border': pygame.Color('#AAAAAA'),
-            'highlight': pygame.Color('#E3F2FD')
-        }
-        
-        # 创建棋盘管理器
-        self.board = Board()
-        self.cells = self.board.path
-        self.highlighted_cell = None
-        
-        # 创建骰子
-        dice_x = self.board_x + self.board_pixel_width - 375
-        dice_y = self.board_y + self.board_pixel_height - 340
-        self.dice = Dice(dice_x, dice_y)
-        
-        # 创建玩家
-        start_cell = self.cells[0]
-        start_x = self.board_x + start_cell[0] * (self.cell_size - self.border_width)
-        start_y = self.board_y + start_cell[1] * (self.cell_size - self.border_width)
-        start_x += self.cell_size / 2
-        start_y += self.cell_size / 2
-        self.player = Player(start_x, start_y, self.cell_size)
-        self.player_cell_index = 0
-        
-        # 游戏状态
-        self.dice_result = None
-        self.can_roll = True
-        
-        # 创建时间系统
-        self.game_time = GameTime()
-        
-        # 创建存档管理器
-        self.save_manager = SaveManager()
-        
     def _initialize_game_state(self):
         """初始化或重置游戏状态"""
-        print("[GameBoard] 初始化游戏状态")
+        log.info("初始化游戏状态")
         
         # 棋盘配置
         self.cell_size = 115
@@ -116,63 +100,87 @@ class GameBoard:
         self.cells = self.board.path
         self.highlighted_cell = None
         
+        # 预计算格子几何信息（矩形、中心点、命中检测）
+        self.geometry = BoardGeometry(self.cells, self.board_x, self.board_y,
+                                      self.cell_size, self.border_width)
+        
+        # 场景内所有动画（骰子、角色移动）共用一个补间系统，每次更新统一推进一遍
+        self.tweens = TweenSystem()
+        
         # 创建骰子
         dice_x = self.board_x + self.board_pixel_width - 375
         dice_y = self.board_y + self.board_pixel_height - 340
-        self.dice = Dice(dice_x, dice_y)
+        gameplay_rng = RandomStreams.get_instance().get(GAMEPLAY)
+        self.dice = Dice(dice_x, dice_y, rng=gameplay_rng, tweens=self.tweens)
+        
+        # 所有棋子通过 LayeredDirty 分组绘制，同一格子中的棋子自动排布
+        self.token_layer = TokenLayer(self.geometry, self.cell_size)
         
         # 创建玩家
-        start_cell = self.cells[0]
-        start_x = self.board_x + start_cell[0] * (self.cell_size - self.border_width)
-        start_y = self.board_y + start_cell[1] * (self.cell_size - self.border_width)
-        start_x += self.cell_size / 2
-        start_y += self.cell_size / 2
-        self.player = Player(start_x, start_y, self.cell_size)
-        self.player_cell_index = 0
+        start_x, start_y = self.geometry.get_center(0)
+        self.player = Player(start_x, start_y, self.cell_size, tweens=self.tweens)
+        self.token_layer.add(self.player, 0, layer=PLAYER_LAYER)
+        
+        # 创建电脑玩家：玩家每走完一回合，所有电脑玩家同时掷骰移动
+        self.ai_rng = RandomStreams.get_instance().get(AI)
+        ai_characters = [name for name in CHARACTER_IMAGES if name != "character"]
+        self.ai_tokens = []
+        for i in range(self.ai_player_count):
+            token = Token(start_x, start_y, self.cell_size,
+                          ai_characters[i % len(ai_characters)], tweens=self.tweens)
+            self.token_layer.add(token, 0)
+            self.ai_tokens.append(token)
         
         # 游戏状态
         self.dice_result = None
         self.can_roll = True
+        self.ai_turn_active = False
         
         # 创建时间系统
         self.game_time = GameTime()
         
+        # 规则模型：回合结算、时间推进和存档数据都由它负责，界面层只做表现
+        # 格子事件（商店、战斗、遗物、同伴）按格子索引登记，处理函数在第一次触发时才加载
+        self.events = EventRegistry.load(self.board.model.cell_count)
+        self.model = GameModel(self.board.model, self.game_time,
+                               rng=gameplay_rng, events=self.events)
+        
         # 创建存档管理器
         self.save_manager = SaveManager()
         
+        # 回合日志：每回合只追加一条记录，每隔 snapshot_interval 回合保存一次完整存档
+        self.journal = self.save_manager.get_journal()
+        self.snapshot_interval = 20
+        
+        # 状态整体重建，需要整屏重绘
+        self.invalidate()
+        
+    @property
+    def player_cell_index(self) -> int:
+        """玩家当前所在的路径索引"""
+        return self.model.position
+    
     def reset(self):
         """重置游戏状态"""
-        print("[GameBoard] 重置游戏状态")
+        log.info("重置游戏状态")
+        self.journal.close()
         self._initialize_game_state()
     
     def _on_dice_roll_complete(self, value):
         """骰子投掷完成的回调函数"""
         self.dice_result = value
-        print(f"[GameBoard] 骰子点数: {value}")
-        
-        # 获取移动路径
-        path = self.board.get_move_path(self.player_cell_index, value)
+        log.info("骰子点数: %d", value)
         
-        # 转换路径坐标为实际像素坐标
-        pixel_path = []
-        for x, y in path:
-            # 计算格子的实际像素位置，考虑边框重叠
-            pixel_x = self.board_x + x * (self.cell_size - self.border_width)
-            pixel_y = self.board_y + y * (self.cell_size - self.border_width)
-            # 加上半个格子大小得到中心点
-            pixel_x += self.cell_size / 2
-            pixel_y += self.cell_size / 2
-            pixel_path.append((pixel_x, pixel_y))
+        # 结算回合：移动玩家并推进时间
+        turn = self.model.resolve_turn(value)
+        self.journal.append(turn, self.model.turn_count)
         
-        # 更新玩家位置
-        self.player.move_to(pixel_path, pygame.time.get_ticks())
+        # 更新玩家位置（棋子层把路径索引转换为像素坐标）
+        self.token_layer.move(self.player, turn.path)
         
-        # 更新玩家当前格子索引
-        self.player_cell_index = (self.player_cell_index + value) % len(self.cells)
-        
-        # 推进时间
-        self.game_time.advance_month()
-        print(f"[GameBoard] 时间推进 - {self.game_time.year}年{self.game_time.month}月 {self.game_time.current_season}")
+        log.info("时间推进 - %d年%d月 %s", self.game_time.year, self.game_time.month, self.game_time.current_season)
+        for event, outcome in turn.events:
+            log.info("触发格子事件 - 格子%d %s(%s): %s", event.cell, event.type, event.trigger, outcome)
         
         # 禁用骰子直到移动完成
         self.can_roll = False
@@ -207,97 +215,251 @@ class GameBoard:
             pygame.Rect: 格子的矩形区域，包括位置和大小。
                        格子之间会重叠border_width像素，以实现边框的视觉统一。
         """
-        x, y = cell_pos
-        # 计算格子位置时减去border_width，使相邻格子重叠
-        return pygame.Rect(
-            self.board_x + x * (self.cell_size - self.border_width),
-            self.board_y + y * (self.cell_size - self.border_width),
-            self.cell_size,
-            self.cell_size
+        return self.geometry.get_cell_rect(cell_pos)
+    
+    def _get_board_layer(self):
+        """获取静态棋盘层
+        
+        静态层包含背景和所有格子，只在屏幕尺寸、棋盘布局、格子数量或颜色变化时重建，
+        平时绘制棋盘只需要一次 blit。
+        
+        Returns:
+            pygame.Surface: 与屏幕同尺寸的棋盘表面
+        """
+        key = (
+            self.screen.get_size(),
+            self.board_x, self.board_y,
+            self.cell_size, self.border_width,
+            self.board_width, self.board_height,
+            id(self.geometry), len(self.cells),
+            tuple(self.colors['background']),
+            tuple(self.colors['cell']),
+            tuple(self.colors['border']),
         )
+        if self._board_layer is None or key != self._board_layer_key:
+            self._board_layer = self._render_board_layer()
+            self._board_layer_key = key
+        return self._board_layer
+    
+    def _render_board_layer(self):
+        """渲染静态棋盘层"""
+        layer = pygame.Surface(self.screen.get_size(), 0, self.screen)
+        layer.fill(self.colors['background'])
+        
+        for index in range(len(self.cells)):
+            rect = self.geometry.get_rect(index)
+            pygame.draw.rect(layer, self.colors['cell'], rect)
+            # 绘制边框（使用填充绘制，保证局部重绘时结果一致）
+            draw_border(layer, self.colors['border'], rect, self.border_width)
+        
+        return layer
+    
+    def invalidate_board_layer(self):
+        """强制下次绘制时重建静态棋盘层"""
+        self._board_layer = None
+        self.invalidate()
     
     def _save_game_state(self):
         """保存游戏状态"""
-        game_data = {
-            "player_position": self.player_cell_index,
-            "year": self.game_time.year,
-            "month": self.game_time.month,
-            "player_name": self.player.name  # 添加玩家名称
-        }
-        
-        if self.save_manager.save_game(game_data):
-            print("[GameBoard] 游戏状态已保存")
+        self.model.player_name = self.player.name
+        game_data = self.model.to_save_data()
+        
+        with self.profiler.span("save"):
+            saved = self.save_manager.save_game(game_data)
+            if saved:
+                # 快照之前的日志段不再需要重放：开始新段，旧段在后台压缩
+                self.journal.checkpoint(self.model.turn_count)
+        if saved:
+            log.debug("游戏状态已保存")
     
     def _load_game_state(self):
         """加载游戏状态"""
         save_data = self.save_manager.load_game()
         if save_data:
+            # 恢复规则状态（位置、时间、名称）
+            self.model.load_save_data(save_data)
+            
+            # 重放快照之后的回合日志
+            self.journal.replay(self.model, self.model.turn_count)
+            self.journal.start_segment(self.model.turn_count)
+            
             # 恢复玩家位置
-            self.player_cell_index = save_data["player_position"]
-            cell_pos = self.cells[self.player_cell_index]
-            # 计算格子的实际像素位置，考虑边框重叠
-            player_x = self.board_x + cell_pos[0] * (self.cell_size - self.border_width)
-            player_y = self.board_y + cell_pos[1] * (self.cell_size - self.border_width)
-            # 加上半个格子大小得到中心点
-            player_x += self.cell_size / 2
-            player_y += self.cell_size / 2
-            self.player.x = player_x
-            self.player.y = player_y
-            self.player._update_rect_position()
+            self.token_layer.place(self.player, self.player_cell_index)
             
             # 恢复玩家名称
             if "player_name" in save_data:
-                self.player.set_name(save_data["player_name"])
-            
-            # 恢复时间状态
-            self.game_time.year = save_data["year"]
-            self.game_time.month = save_data["month"]
+                self.player.set_name(self.model.player_name)
             
-            print(f"[GameBoard] 已加载存档 - 位置: {self.player_cell_index}, "
-                  f"时间: {self.game_time.year}年{self.game_time.month}月 {self.game_time.current_season}")
+            log.info("已加载存档 - 位置: %d, 时间: %d年%d月 %s", self.player_cell_index,
+                     self.game_time.year, self.game_time.month, self.game_time.current_season)
     
-    def update(self):
-        """更新游戏状态"""
-        current_time = pygame.time.get_ticks()
-        self.dice.update()
+    def update(self, dt: float):
+        """按固定时间步长更新游戏状态
         
-        # 更新玩家
-        self.player.update(current_time)
+        Args:
+            dt: 本次更新经过的时间（秒）
+        """
+        # 一次推进所有补间动画（骰子旋转、点击缩放、角色移动）
+        self.tweens.update(dt)
+        self.dice.update(dt)
+        
+        # 所有棋子都停下后才允许投骰子；每回合已写入日志，只定期保存完整存档
+        if not self.can_roll and not self.token_layer.is_moving:
+            if self.ai_turn_active:  # 电脑玩家的移动刚结束
+                self.ai_turn_active = False
+                self.can_roll = True
+            else:  # 玩家的移动刚结束
+                turn_count = self.model.turn_count
+                # 新游戏的第一回合也保存一次，让主菜单可以继续游戏
+                if turn_count == 1 or turn_count % self.snapshot_interval == 0:
+                    self._save_game_state()
+                if self.ai_tokens:
+                    self._play_ai_turns()
+                else:
+                    self.can_roll = True
+    
+    def _play_ai_turns(self):
+        """所有电脑玩家同时掷骰并移动"""
+        self.ai_turn_active = True
+        board = self.model.board
+        for token in self.ai_tokens:
+            roll = self.ai_rng.randint(1, 6)
+            self.token_layer.move(token, board.move_indices(token.cell_index, roll))
+        log.debug("电脑玩家移动 - %d个", len(self.ai_tokens))
+    
+    @property
+    def is_animating(self) -> bool:
+        """是否有动画需要逐帧更新（骰子滚动、角色移动）"""
+        return self.dice.is_animating or self.token_layer.is_animating
+    
+    def get_idle_timeout(self):
+        """空闲时最多等待多久需要重绘（毫秒），None表示只在有事件时重绘
         
-        # 如果玩家不在移动中，允许投骰子并保存游戏
-        if not self.player.is_moving:
-            if not self.can_roll:  # 移动刚结束
-                self._save_game_state()
-            self.can_roll = True
+        编辑名称时光标每500毫秒闪烁一次，等到下一次闪烁即可。
+        """
+        if self.editing_name:
+            return 500 - self.clock.ticks() % 500
+        return None
+    
+    def prepare_draw(self, alpha: float):
+        """绘制前调用：在上一次和本次更新的状态之间插值，并记录本帧发生变化的区域
+        
+        Args:
+            alpha: 插值系数（0到1），距上一次更新经过的时间占更新步长的比例
+        """
+        self.dice.interpolate(alpha)
+        self.token_layer.interpolate(alpha)
+        self._track_dirty_regions()
+    
+    def invalidate(self):
+        """标记整个场景需要重绘（场景切换、重置时调用）"""
+        self.dirty.mark_all()
+        self._dirty_state = None
+        if self.modal.is_open:
+            self.modal.invalidate()
+    
+    def _track_dirty_regions(self):
+        """比较本帧与上一帧的可见状态，标记发生变化的区域"""
+        # 打开或关闭编辑弹窗会改变整个屏幕的遮罩（由模态层标记整屏）
+        if self.editing_name != self.modal.is_open:
+            if self.editing_name:
+                self.modal.open()
+            else:
+                self.modal.close()
+        # 弹窗打开时，下方画面的变化同时记录到模态层，只重建背景层的这些区域
+        below = self.modal if self.modal.is_open else self.dirty
+        
+        # 棋子自己记录是否变化（DirtySprite.dirty）
+        self.token_layer.mark_dirty(below)
+        
+        time_text = self.game_time.get_time_string()
+        state = {
+            'dice': (self.dice.value, self.dice.render_angle, self.dice.render_scale,
+                     self.dice.is_rolling, self.dice.is_hovered),
+            'highlight': self.highlighted_cell,
+            'time': (time_text, self._get_time_rect(time_text)),
+            'name': (self.player.name, self._get_name_rect()),
+            'input': (self.edit_text or self.player.name, self._cursor_visible()) if self.editing_name else None,
+        }
+        previous = self._dirty_state
+        self._dirty_state = state
+        if previous is None:
+            return
+        
+        if state['dice'] != previous['dice']:
+            below.mark(self.dice.get_rect())
+        
+        if state['highlight'] != previous['highlight']:
+            for cell in (previous['highlight'], state['highlight']):
+                if cell is not None:
+                    below.mark(self._get_cell_rect(cell))
+        
+        if state['time'] != previous['time']:
+            below.mark(previous['time'][1])
+            below.mark(state['time'][1])
+        
+        if state['name'] != previous['name']:
+            below.mark(previous['name'][1])
+            below.mark(state['name'][1])
+        
+        # 编辑中输入内容和光标闪烁只影响输入框
+        if state['input'] != previous['input'] and self.editing_name:
+            self.dirty.mark(self._get_input_rect())
+    
+    def draw_dirty(self):
+        """只重绘发生变化的区域
+        
+        Returns:
+            List[pygame.Rect]: 本帧重绘过的区域
+        """
+        return self.dirty.redraw(self.screen, self.draw)
     
     def draw(self):
-        # 绘制背景
-        self.screen.fill(self.colors['background'])
+        if self.modal.is_open:
+            # 下方画面和遮罩来自模态层缓存的背景层，只需要再画弹窗
+            with self.profiler.span("draw.modal"):
+                self.modal.draw(self._draw_scene)
+                self._draw_name_edit_popup()
+            return
+        self._draw_scene()
+    
+    def _draw_scene(self):
+        """绘制弹窗下方的整个游戏画面"""
+        profiler = self.profiler
         
-        # 绘制所有格子
-        for cell in self.cells:
-            rect = self._get_cell_rect(cell)
+        with profiler.span("draw.board"):
+            # 绘制背景和所有格子（缓存的静态层）
+            self.screen.blit(self._get_board_layer(), (0, 0))
             
-            # 判断是否是高亮格子
-            if cell == self.highlighted_cell:
+            # 在静态层上叠加悬停高亮的格子
+            if self.highlighted_cell is not None:
+                rect = self._get_cell_rect(self.highlighted_cell)
                 pygame.draw.rect(self.screen, self.colors['highlight'], rect)
-            else:
-                pygame.draw.rect(self.screen, self.colors['cell'], rect)
-            
-            # 绘制边框
-            pygame.draw.rect(self.screen, self.colors['border'], rect, self.border_width)
+                draw_border(self.screen, self.colors['border'], rect, self.border_width)
         
         # 绘制骰子
-        self.dice.draw(self.screen)
+        with profiler.span("draw.dice"):
+            self.dice.draw(self.screen)
         
         # 绘制时间（在骰子上方）
-        self._draw_time_system()
+        with profiler.span("draw.hud"):
+            self._draw_time_system()
         
-        # 绘制玩家
-        self.player.draw(self.screen)
+        # 绘制所有棋子
+        with profiler.span("draw.player"):
+            self.token_layer.draw(self.screen)
         
         # 绘制玩家名称（在轨道中间的左上角）
-        self._draw_player_name()
+        with profiler.span("draw.hud"):
+            self._draw_player_name()
+    
+    def _get_name_rect(self):
+        """获取玩家名称（含下划线）的显示区域"""
+        if not self.player.name_surface:
+            return pygame.Rect(self.dice.x - 400, self.dice.y, 0, 0)
+        width = self.player.name_surface.get_width()
+        height = self.player.name_surface.get_height() + 2 + 2  # 间距 + 下划线
+        return pygame.Rect(self.dice.x - 400, self.dice.y, width, height)
     
     def _draw_player_name(self):
         """绘制玩家名称"""
@@ -313,56 +475,69 @@ class GameBoard:
             if self.player.name_underline:
                 underline_y = name_y + self.player.name_surface.get_height() + 2
                 self.screen.blit(self.player.name_underline, (name_x, underline_y))
-            
-            # 如果正在编辑名称，绘制编辑弹窗
-            if self.editing_name:
-                self._draw_name_edit_popup()
 
-    def _draw_name_edit_popup(self):
-        """绘制名称编辑弹窗"""
-        # 创建弹窗背景
+    def _get_popup_rect(self):
+        """获取名称编辑弹窗的区域"""
         popup_width = 300
         popup_height = 120
         popup_x = (self.screen_width - popup_width) // 2
         popup_y = (self.screen_height - popup_height) // 2
-        
-        # 绘制半透明背景
-        overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))  # 半透明黑色
-        self.screen.blit(overlay, (0, 0))
-        
-        # 绘制弹窗主体
-        popup_rect = pygame.Rect(popup_x, popup_y, popup_width, popup_height)
-        pygame.draw.rect(self.screen, self.edit_bg_color, popup_rect, border_radius=10)
-        pygame.draw.rect(self.screen, self.edit_border_color, popup_rect, 2, border_radius=10)
+        return pygame.Rect(popup_x, popup_y, popup_width, popup_height)
+    
+    def _get_input_rect(self):
+        """获取名称编辑弹窗中输入框的区域"""
+        popup_rect = self._get_popup_rect()
+        input_width = 260
+        input_height = 36
+        input_x = popup_rect.x + (popup_rect.width - input_width) // 2
+        input_y = popup_rect.y + 50
+        return pygame.Rect(input_x, input_y, input_width, input_height)
+    
+    def _cursor_visible(self) -> bool:
+        """输入光标当前是否显示（每500毫秒切换一次）"""
+        return self.clock.ticks() // 500 % 2 == 1
+    
+    def _render_popup_chrome(self, surface):
+        """在透明表面上绘制弹窗中不变的部分：底板、边框、标题和输入框"""
+        panel_rect = surface.get_rect()
+        pygame.draw.rect(surface, self.edit_bg_color, panel_rect, border_radius=10)
+        pygame.draw.rect(surface, self.edit_border_color, panel_rect, 2, border_radius=10)
         
         # 绘制标题
-        title_text = self.time_font.render("编辑名称", True, self.edit_text_color)
-        title_x = popup_x + (popup_width - title_text.get_width()) // 2
-        self.screen.blit(title_text, (title_x, popup_y + 15))
+        title_text = self.font_manager.render_text("编辑名称", 24, self.edit_text_color)
+        title_x = (panel_rect.width - title_text.get_width()) // 2
+        surface.blit(title_text, (title_x, 15))
+        
+        # 绘制输入框背景（坐标相对于弹窗）
+        popup_rect = self._get_popup_rect()
+        input_rect = self._get_input_rect().move(-popup_rect.x, -popup_rect.y)
+        pygame.draw.rect(surface, pygame.Color('#F5F5F5'), input_rect, border_radius=5)
+        pygame.draw.rect(surface, self.edit_border_color, input_rect, 1, border_radius=5)
+    
+    def _draw_name_edit_popup(self):
+        """绘制名称编辑弹窗
         
-        # 绘制输入框
-        input_width = 260
-        input_height = 36
-        input_x = popup_x + (popup_width - input_width) // 2
-        input_y = popup_y + 50
+        弹窗外观由合成器缓存，每帧只绘制输入的文字和光标。
+        """
+        popup_rect = self._get_popup_rect()
+        chrome = self.compositor.chrome(
+            ("name_edit", popup_rect.size, tuple(self.edit_bg_color), tuple(self.edit_border_color),
+             tuple(self.edit_text_color)),
+            popup_rect.size, self._render_popup_chrome)
+        self.screen.blit(chrome, popup_rect)
         
         # 保存输入框位置供点击检测使用
-        self.edit_rect = pygame.Rect(input_x, input_y, input_width, input_height)
-        
-        # 绘制输入框背景
-        pygame.draw.rect(self.screen, pygame.Color('#F5F5F5'), self.edit_rect, border_radius=5)
-        pygame.draw.rect(self.screen, self.edit_border_color, self.edit_rect, 1, border_radius=5)
-        
-        # 绘制输入的文本
-        if self.edit_text:
-            text = self.edit_text
-        else:
-            text = self.player.name
-        text_surface = self.time_font.render(text + ("_" if pygame.time.get_ticks() // 500 % 2 else ""), True, self.edit_text_color)
-        text_x = input_x + 10
-        text_y = input_y + (input_height - text_surface.get_height()) // 2
+        self.edit_rect = self._get_input_rect()
+        
+        # 绘制输入的文本和光标（文字表面由 FontManager 缓存）
+        text = self.edit_text if self.edit_text else self.player.name
+        text_surface = self.font_manager.render_text(text, 24, self.edit_text_color)
+        text_x = self.edit_rect.x + 10
+        text_y = self.edit_rect.y + (self.edit_rect.height - text_surface.get_height()) // 2
         self.screen.blit(text_surface, (text_x, text_y))
+        if self._cursor_visible():
+            cursor_surface = self.font_manager.render_text("_", 24, self.edit_text_color)
+            self.screen.blit(cursor_surface, (text_x + text_surface.get_width(), text_y))
 
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -411,34 +586,35 @@ class GameBoard:
             # 处理骰子悬停
             self.dice.handle_motion(event.pos)
             
-            # 检测格子悬停
-            mouse_pos = pygame.mouse.get_pos()
-            self.highlighted_cell = None
-            
-            for cell in self.cells:
-                rect = self._get_cell_rect(cell)
-                if rect.collidepoint(mouse_pos):
-                    self.highlighted_cell = cell
-                    break
+            # 检测格子悬停（网格运算，与格子数量无关）
+            self.highlighted_cell = self.geometry.cell_at(event.pos)
         
         return None
     
-    def _draw_time_system(self):
-        """绘制时间系统"""
-        time_text = self.game_time.get_time_string()
-        text_surface = self.time_font.render(time_text, True, self.game_time.current_season_color)
+    def _get_time_rect(self, time_text):
+        """获取时间显示背景框的区域
         
-        # 创建背景框
-        bg_rect = pygame.Rect(0, 0, text_surface.get_width()+20, text_surface.get_height()+10)
+        Args:
+            time_text: 要显示的时间文本
+            
+        Returns:
+            pygame.Rect: 背景框区域，位于骰子区域上方
+        """
+        text_width, text_height = self.time_font.size(time_text)
         
-        # 调整位置到骰子区域上方
-        # 使用骰子的x, y位置
-        dice_x = self.dice.x  # 骰子的x坐标
-        dice_y = self.dice.y  # 骰子的y坐标
+        # 创建背景框
+        bg_rect = pygame.Rect(0, 0, text_width+20, text_height+10)
         
         # 将时间显示放在骰子上方
-        bg_rect.centerx = dice_x + 90
-        bg_rect.bottom = dice_y -1
+        bg_rect.centerx = self.dice.x + 90
+        bg_rect.bottom = self.dice.y - 1
+        return bg_rect
+    
+    def _draw_time_system(self):
+        """绘制时间系统"""
+        time_text = self.game_time.get_time_string()
+        text_surface = self.font_manager.render_text(time_text, 24, self.game_time.current_season_color)
+        bg_rect = self._get_time_rect(time_text)
         
         # 绘制背景和文字
         pygame.draw.rect(self.screen, (255, 255, 255), bg_rect, border_radius=5)
@@ -1,7 +1,12 @@
 import pygame
-import os
 from components.button import Button
 from components.save_manager import SaveManager
+from utils.dirty_rects import DirtyRectTracker
+from utils.font_manager import FontManager
+from utils.ui_compositor import ModalLayer, UICompositor
+from utils.logger import get_logger
+
+log = get_logger("MainMenu")
 
 class MainMenu:
     def __init__(self, screen):
@@ -9,20 +14,22 @@ class MainMenu:
         self.screen_width = screen.get_width()
         self.screen_height = screen.get_height()
         
+        # 脏矩形跟踪（仅在主循环开启脏矩形模式时使用）
+        self.dirty = DirtyRectTracker(screen.get_rect())
+        self._dirty_state = None
+        
+        # 删除存档确认框的模态层（缓存变暗后的菜单画面，对话框外观由合成器缓存）
+        self.modal = ModalLayer(screen, self.dirty)
+        self.compositor = UICompositor.get_instance()
+        
         # 初始化存档管理器
         self.save_manager = SaveManager()
         
-        # 加载字体
-        font_path = os.path.join('assets', 'fonts', 'SourceHanSans-Bold.ttc')
-        print(f"正在加载字体文件: {os.path.abspath(font_path)}")
-        try:
-            self.font = pygame.font.Font(font_path, 96)
-            self.warning_font = pygame.font.Font(font_path, 36)
-            print("字体加载成功！")
-        except Exception as e:
-            print(f"字体加载失败: {str(e)}")
-            self.font = pygame.font.Font(None, 96)
-            self.warning_font = pygame.font.Font(None, 36)
+        # 字体（文字表面由 FontManager 渲染并缓存）
+        self.font_manager = FontManager.get_instance()
+        self.title_font_size = 96
+        self.warning_font_size = 36
+        self.save_info_font_size = 20
         
         self._initialize_buttons()
         
@@ -33,9 +40,10 @@ class MainMenu:
         button_width = 240
         button_height = 60
         
-        # 检查是否有存档
-        has_save = self.save_manager.has_save()
-        print(f"[MainMenu] 检查存档状态: {'有存档' if has_save else '无存档'}")
+        # 检查是否有存档（读取缓存的存档索引，不解析存档正文）
+        self.save_info = self.save_manager.get_slot_info()
+        has_save = self.save_info is not None
+        log.debug("检查存档状态: %s", '有存档' if has_save else '无存档')
         
         self.buttons = {
             'new_game': Button(
@@ -88,12 +96,17 @@ class MainMenu:
         
     def refresh(self):
         """刷新主菜单状态"""
-        print("[MainMenu] 刷新菜单状态")
+        log.debug("刷新菜单状态")
         self.save_manager = SaveManager()  # 重新初始化存档管理器
         self._initialize_buttons()  # 重新初始化按钮
+        self.invalidate()
     
-    def update(self):
-        """更新主菜单状态"""
+    def update(self, dt: float):
+        """按固定时间步长更新主菜单状态
+        
+        Args:
+            dt: 本次更新经过的时间（秒）
+        """
         # 更新按钮状态
         for button in self.buttons.values():
             button.update()
@@ -101,68 +114,148 @@ class MainMenu:
             for button in self.confirm_dialog_buttons.values():
                 button.update()
     
+    @property
+    def is_animating(self) -> bool:
+        """菜单没有逐帧动画，只在有事件时需要更新"""
+        return False
+    
+    def get_idle_timeout(self):
+        """空闲时最多等待多久需要重绘（毫秒），None表示只在有事件时重绘"""
+        return None
+    
+    def prepare_draw(self, alpha: float):
+        """绘制前调用：记录本帧发生变化的区域（菜单没有需要插值的动画）"""
+        self._track_dirty_regions()
+    
+    def invalidate(self):
+        """标记整个场景需要重绘（场景切换、刷新时调用）"""
+        self.dirty.mark_all()
+        self._dirty_state = None
+        if self.modal.is_open:
+            self.modal.invalidate()
+    
+    def _track_dirty_regions(self):
+        """比较本帧与上一帧的按钮和对话框状态，标记发生变化的区域"""
+        # 对话框的遮罩覆盖整个屏幕（由模态层标记整屏）
+        if self.show_confirm_dialog != self.modal.is_open:
+            if self.show_confirm_dialog:
+                self.modal.open()
+            else:
+                self.modal.close()
+        # 对话框打开时，菜单按钮的变化只需要重建背景层的对应区域
+        below = self.modal if self.modal.is_open else self.dirty
+        
+        menu_buttons = list(self.buttons.values())
+        dialog_buttons = list(self.confirm_dialog_buttons.values())
+        state = {
+            'buttons': [(button.is_hovered, button.enabled) for button in menu_buttons + dialog_buttons],
+        }
+        previous = self._dirty_state
+        self._dirty_state = state
+        if previous is None:
+            return
+        
+        targets = [below] * len(menu_buttons) + [self.dirty] * len(dialog_buttons)
+        for button, target, old, new in zip(menu_buttons + dialog_buttons, targets,
+                                            previous['buttons'], state['buttons']):
+            if old != new:
+                # 包含按钮下方2像素的阴影
+                target.mark(button.rect.union(button.rect.move(0, 2)))
+    
+    def draw_dirty(self):
+        """只重绘发生变化的区域
+        
+        Returns:
+            List[pygame.Rect]: 本帧重绘过的区域
+        """
+        return self.dirty.redraw(self.screen, self.draw)
+    
     def draw(self):
+        if self.modal.is_open:
+            # 菜单画面和遮罩来自模态层缓存的背景层，只需要再画对话框
+            self.modal.draw(self._draw_menu)
+            self._draw_confirm_dialog()
+            return
+        self._draw_menu()
+    
+    def _draw_menu(self):
+        """绘制对话框下方的菜单画面"""
         # 绘制背景
         self.screen.fill((245, 245, 245))  # 更浅的灰色背景
         
         # 绘制标题
-        title_text = self.font.render("冒险棋", True, (33, 33, 33))
+        title_text = self.font_manager.render_text("冒险棋", self.title_font_size, (33, 33, 33))
         title_rect = title_text.get_rect(center=(self.screen_width // 2, self.screen_height // 3))
         self.screen.blit(title_text, title_rect)
         
         # 绘制所有按钮
         for button in self.buttons.values():
             button.draw(self.screen)
-            
-        # 如果显示确认对话框，绘制对话框
-        if self.show_confirm_dialog:
-            # 绘制半透明背景
-            dialog_surface = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-            pygame.draw.rect(dialog_surface, (0, 0, 0, 128), dialog_surface.get_rect())
-            self.screen.blit(dialog_surface, (0, 0))
-            
-            # 绘制对话框
-            dialog_width = 500
-            dialog_height = 200
-            dialog_rect = pygame.Rect(
-                (self.screen_width - dialog_width) // 2,
-                (self.screen_height - dialog_height) // 2,
-                dialog_width,
-                dialog_height
-            )
-            pygame.draw.rect(self.screen, (245, 245, 245), dialog_rect, border_radius=10)
-            pygame.draw.rect(self.screen, (200, 200, 200), dialog_rect, width=2, border_radius=10)
-            
-            # 绘制提示文本
-            warning_text = self.warning_font.render("检测到已有存档，是否删除？", True, (33, 33, 33))
-            warning_rect = warning_text.get_rect(center=(self.screen_width // 2, self.screen_height // 2 - 20))
-            self.screen.blit(warning_text, warning_rect)
-            
-            # 绘制确认按钮
-            for button in self.confirm_dialog_buttons.values():
-                button.draw(self.screen)
+        
+        # 在“继续游戏”下方显示存档摘要
+        if self.save_info is not None:
+            info_text = f"{self.save_info.player_name}  {self.save_info.year}年{self.save_info.month}月"
+            info_surface = self.font_manager.render_text(info_text, self.save_info_font_size, (117, 117, 117))
+            continue_rect = self.buttons['continue_game'].rect
+            info_rect = info_surface.get_rect(midtop=(continue_rect.centerx, continue_rect.bottom + 8))
+            self.screen.blit(info_surface, info_rect)
+    
+    def _get_dialog_rect(self):
+        """获取确认对话框的区域"""
+        dialog_width = 500
+        dialog_height = 200
+        return pygame.Rect(
+            (self.screen_width - dialog_width) // 2,
+            (self.screen_height - dialog_height) // 2,
+            dialog_width,
+            dialog_height
+        )
+    
+    def _render_dialog_chrome(self, surface):
+        """在透明表面上绘制对话框中不变的部分：底板、边框和提示文本"""
+        panel_rect = surface.get_rect()
+        pygame.draw.rect(surface, (245, 245, 245), panel_rect, border_radius=10)
+        pygame.draw.rect(surface, (200, 200, 200), panel_rect, width=2, border_radius=10)
+        
+        # 绘制提示文本（坐标相对于对话框）
+        dialog_rect = self._get_dialog_rect()
+        warning_text = self.font_manager.render_text("检测到已有存档，是否删除？", self.warning_font_size, (33, 33, 33))
+        warning_rect = warning_text.get_rect(center=(self.screen_width // 2 - dialog_rect.x,
+                                                     self.screen_height // 2 - 20 - dialog_rect.y))
+        surface.blit(warning_text, warning_rect)
+    
+    def _draw_confirm_dialog(self):
+        """绘制确认对话框（外观由合成器缓存，每帧只绘制按钮）"""
+        dialog_rect = self._get_dialog_rect()
+        chrome = self.compositor.chrome(("confirm_delete", dialog_rect.size, self.warning_font_size),
+                                        dialog_rect.size, self._render_dialog_chrome)
+        self.screen.blit(chrome, dialog_rect)
+        
+        # 绘制确认按钮
+        for button in self.confirm_dialog_buttons.values():
+            button.draw(self.screen)
     
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            # 获取鼠标位置
-            mouse_pos = pygame.mouse.get_pos()
+            # 获取鼠标位置（使用事件自带的位置，回放录像时与录制时一致）
+            mouse_pos = event.pos
             
             if self.show_confirm_dialog:
                 # 处理确认对话框的按钮点击
                 for button in self.confirm_dialog_buttons.values():
                     if button.is_clicked(mouse_pos):
                         if button.action == "confirm_delete":
-                            print("[MainMenu] 确认删除存档")
+                            log.info("确认删除存档")
                             # 删除存档并开始新游戏
                             if self.save_manager.delete_save():
                                 self.show_confirm_dialog = False
-                                print("[MainMenu] 开始新游戏")
+                                log.info("开始新游戏")
                                 return "new_game"
                             else:
-                                print("[MainMenu] 删除存档失败")
+                                log.error("删除存档失败")
                                 self.show_confirm_dialog = False
                         elif button.action == "cancel_delete":
-                            print("[MainMenu] 取消删除存档")
+                            log.info("取消删除存档")
                             self.show_confirm_dialog = False
                 return None
             else:
@@ -172,27 +265,27 @@ class MainMenu:
                         if button.action == "new_game":
                             if self.save_manager.has_save():
                                 # 如果有存档，显示确认对话框
-                                print("[MainMenu] 显示删除存档确认框")
+                                log.info("显示删除存档确认框")
                                 self.show_confirm_dialog = True
                                 return None
                             else:
                                 # 如果没有存档，直接开始新游戏
-                                print("[MainMenu] 开始新游戏")
+                                log.info("开始新游戏")
                                 return "new_game"
                         elif button.action == "continue_game":
                             # 检查存档是否存在
                             if self.save_manager.has_save():
-                                print("[MainMenu] 继续游戏")
+                                log.info("继续游戏")
                                 return "continue_game"
                             else:
-                                print("[MainMenu] 错误：没有找到存档")
+                                log.error("没有找到存档")
                         elif button.action == "quit":
-                            print("[MainMenu] 退出游戏")
+                            log.info("退出游戏")
                             return "quit"
         
         elif event.type == pygame.MOUSEMOTION:
             # 更新按钮的悬停状态
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = event.pos
             for button in self.buttons.values():
                 button.handle_hover(mouse_pos)
             if self.show_confirm_dialog:
@@ -0,0 +1,69 @@
+import time
+from typing import Callable, Dict
+from utils.logger import get_logger
+
+log = get_logger("SceneRegistry")
+
+class SceneRegistry:
+    """场景注册表
+
+    场景以工厂函数的形式注册，第一次使用时才创建；
+    不活跃的场景可以卸载以释放其表面，下次使用时重新创建。
+    可以像字典一样通过 registry["game_board"] 访问场景。
+    """
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], object]] = {}
+        self._scenes: Dict[str, object] = {}
+        # 每个场景最近一次创建的耗时（秒）
+        self.load_times: Dict[str, float] = {}
+
+    def register(self, name: str, factory: Callable[[], object]):
+        """注册场景
+
+        Args:
+            name: 场景名称
+            factory: 无参数的工厂函数，返回场景实例
+        """
+        self._factories[name] = factory
+
+    def get(self, name: str):
+        """获取场景，尚未创建时立即创建"""
+        scene = self._scenes.get(name)
+        if scene is None:
+            if name not in self._factories:
+                raise KeyError(f"未注册的场景: {name}")
+            start = time.perf_counter()
+            scene = self._factories[name]()
+            elapsed = time.perf_counter() - start
+            self.load_times[name] = elapsed
+            self._scenes[name] = scene
+            log.info("创建场景 %s - 耗时: %.1fms", name, elapsed * 1000)
+        return scene
+
+    def __getitem__(self, name: str):
+        return self.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+    def is_loaded(self, name: str) -> bool:
+        """场景是否已经创建"""
+        return name in self._scenes
+
+    def unload(self, name: str) -> bool:
+        """卸载场景，释放它持有的表面等资源
+
+        Returns:
+            bool: 场景之前是否已创建
+        """
+        scene = self._scenes.pop(name, None)
+        if scene is None:
+            return False
+        log.info("卸载场景 %s", name)
+        return True
+
+    def unload_inactive(self, active: str):
+        """卸载除当前场景外的所有场景"""
+        for name in list(self._scenes):
+            if name != active:
+                self.unload(name)
@@ -0,0 +1,181 @@
+import pygame
+from typing import List, Sequence, Tuple
+from components.board import Board
+from components.board_geometry import BoardGeometry
+from components.token import Token
+from components.token_layer import TokenLayer
+from utils.asset_manager import CHARACTER_IMAGES
+from utils.dirty_rects import DirtyRectTracker, draw_border
+from utils.font_manager import FontManager
+from utils.frame_profiler import FrameProfiler
+from utils.game_clock import GameClock
+from utils.random_streams import RandomStreams
+from utils.tween import TweenSystem
+from utils.logger import get_logger
+
+log = get_logger("TokenStress")
+
+# 压力测试棋子的掷骰（独立的随机数流，不影响游戏）
+STRESS_STREAM = "stress"
+
+class TokenStressScene:
+    """棋子数量压力测试场景
+
+    棋子数按 token_counts 逐级增加，所有棋子不停地掷骰移动；
+    每一级运行 stage_seconds 秒，统计这段时间的平均帧率，
+    结果显示在屏幕左上角并写入日志。按 ESC 或点击鼠标返回主菜单。
+    """
+    def __init__(self, screen, token_counts: Sequence[int] = (10, 50, 100, 200, 400, 800),
+                 stage_seconds: float = 5.0):
+        """
+        Args:
+            screen: 绘制目标表面
+            token_counts: 每一级的棋子数
+            stage_seconds: 每一级的运行时间（秒）
+        """
+        self.screen = screen
+        self.dirty = DirtyRectTracker(screen.get_rect())
+        self.profiler = FrameProfiler.get_instance()
+        self.clock = GameClock.get_instance()
+        self.font_manager = FontManager.get_instance()
+        self.rng = RandomStreams.get_instance().get(STRESS_STREAM)
+
+        # 与游戏场景相同的棋盘布局
+        self.cell_size = 115
+        self.border_width = 5
+        board = Board()
+        self.board_model = board.model
+        board_x = (screen.get_width() - self.cell_size * board.width) // 2 + 50
+        board_y = (screen.get_height() - self.cell_size * board.height) // 2 + 20
+        self.geometry = BoardGeometry(board.path, board_x, board_y, self.cell_size, self.border_width)
+        self._board_layer = self._render_board_layer()
+
+        self.tweens = TweenSystem()
+        self.token_layer = TokenLayer(self.geometry, self.cell_size)
+        self.characters = list(CHARACTER_IMAGES)
+
+        # 压力测试进度
+        self.token_counts = list(token_counts)
+        self.stage_seconds = stage_seconds
+        self.stage = -1
+        self.finished = False
+        self.results: List[Tuple[int, float]] = []  # (棋子数, 平均帧率)
+        self._stage_start = 0.0
+        self._stage_frames = 0
+        self._report_surfaces: List[pygame.Surface] = []
+        self._report_rect = pygame.Rect(20, 20, 0, 0)
+        self._next_stage()
+
+    def _render_board_layer(self) -> pygame.Surface:
+        layer = pygame.Surface(self.screen.get_size(), 0, self.screen)
+        layer.fill(pygame.Color('#F5F5F5'))
+        for index in range(self.geometry.cell_count):
+            rect = self.geometry.get_rect(index)
+            pygame.draw.rect(layer, pygame.Color('#FFFFFF'), rect)
+            draw_border(layer, pygame.Color('#AAAAAA'), rect, self.border_width)
+        return layer
+
+    def _next_stage(self):
+        """进入下一级：补足棋子数并重新开始计时"""
+        self.stage += 1
+        if self.stage >= len(self.token_counts):
+            self.finished = True
+            summary = ", ".join(f"{count}个 {fps:.1f}FPS" for count, fps in self.results)
+            log.info("压力测试完成 - %s", summary)
+            self._update_report()
+            return
+
+        target = self.token_counts[self.stage]
+        cell_count = self.geometry.cell_count
+        while len(self.token_layer) < target:
+            index = len(self.token_layer)
+            cell = self.rng.randrange(cell_count)
+            x, y = self.geometry.get_center(cell)
+            token = Token(x, y, self.cell_size, self.characters[index % len(self.characters)],
+                          tweens=self.tweens)
+            # 错开速度，避免所有棋子同时到达
+            token.move_duration = self.rng.uniform(0.15, 0.35)
+            self.token_layer.add(token, cell)
+            self._move_token(token)
+        self._stage_start = self.clock.now()
+        self._stage_frames = 0
+        self._update_report()
+
+    def _move_token(self, token: Token):
+        """让棋子掷骰移动，到达后继续下一次移动"""
+        roll = self.rng.randint(1, 6)
+        self.token_layer.move(token, self.board_model.move_indices(token.cell_index, roll),
+                              self._move_token)
+
+    def _update_report(self):
+        """重新渲染结果文字，并标记新旧显示区域"""
+        lines = ["棋子压力测试（ESC 返回）"]
+        lines += [f"{count:>5} 个棋子: {fps:6.1f} FPS" for count, fps in self.results]
+        if not self.finished:
+            lines.append(f"{self.token_counts[self.stage]:>5} 个棋子: 测量中...")
+        self._report_surfaces = [self.font_manager.render_text(line, 20, (33, 33, 33)) for line in lines]
+        
+        old_rect = self._report_rect
+        width = max(surface.get_width() for surface in self._report_surfaces) + 20
+        height = sum(surface.get_height() + 4 for surface in self._report_surfaces) + 16
+        self._report_rect = pygame.Rect(old_rect.topleft, (width, height))
+        self.dirty.mark(old_rect)
+        self.dirty.mark(self._report_rect)
+
+    def update(self, dt: float):
+        """按固定时间步长推进所有棋子的移动"""
+        if self.finished:
+            return
+        self.tweens.update(dt)
+
+    @property
+    def is_animating(self) -> bool:
+        """测试进行中每帧都需要绘制（结束后棋子停在原地）"""
+        return not self.finished
+
+    def get_idle_timeout(self):
+        return None
+
+    def prepare_draw(self, alpha: float):
+        """插值棋子位置、统计帧率并记录本帧发生变化的区域"""
+        if not self.finished:
+            self._stage_frames += 1
+            elapsed = self.clock.now() - self._stage_start
+            if elapsed >= self.stage_seconds:
+                fps = self._stage_frames / elapsed
+                count = self.token_counts[self.stage]
+                self.results.append((count, fps))
+                log.info("棋子 %d个 - 平均 %.1f FPS", count, fps)
+                self._next_stage()
+        self.token_layer.interpolate(alpha)
+        self.token_layer.mark_dirty(self.dirty)
+
+    def invalidate(self):
+        """标记整个场景需要重绘"""
+        self.dirty.mark_all()
+
+    def draw_dirty(self):
+        """只重绘发生变化的区域"""
+        return self.dirty.redraw(self.screen, self.draw)
+
+    def draw(self):
+        self.screen.blit(self._board_layer, (0, 0))
+        with self.profiler.span("draw.player"):
+            self.token_layer.draw(self.screen)
+        self._draw_report()
+
+    def _draw_report(self):
+        # 白色底板，避免文字与下方的棋子混在一起
+        pygame.draw.rect(self.screen, (255, 255, 255), self._report_rect)
+        draw_border(self.screen, pygame.Color('#AAAAAA'), self._report_rect, 1)
+        x, y = self._report_rect.x + 10, self._report_rect.y + 8
+        for surface in self._report_surfaces:
+            self.screen.blit(surface, (x, y))
+            y += surface.get_height() + 4
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            return "main_menu"
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            return "main_menu"
+        return None
@@ -0,0 +1,163 @@
+import argparse
+import time
+from game_objects.board_events import EventRegistry
+from game_objects.board_model import BoardModel
+from game_objects.game_model import GameModel
+from utils.logger import get_logger, configure_logging, parse_levels_arg
+
+log = get_logger("Simulate")
+
+def simulate(turns: int, seed: int = None, width: int = 16, height: int = 9,
+             dice_faces: int = 6, events_path: str = None) -> dict:
+    """不加载界面，按最快速度连续进行若干回合
+
+    Args:
+        turns: 回合数
+        seed: 随机种子，为None时每次结果不同
+        width: 棋盘横向格子数
+        height: 棋盘纵向格子数
+        dice_faces: 骰子面数
+        events_path: 格子事件定义文件，为None时不触发事件
+
+    Returns:
+        dict: 统计结果，包括各格子的落点次数、各类事件的触发次数、耗时和最终时间
+    """
+    board = BoardModel(width, height)
+    events = EventRegistry.load(board.cell_count, events_path) if events_path else None
+    model = GameModel(board, seed=seed, dice_faces=dice_faces, events=events)
+    landings = [0] * board.cell_count
+    event_counts = {}
+
+    start = time.perf_counter()
+    for _ in range(turns):
+        turn = model.play_turn(record_path=False)
+        landings[turn.to_index] += 1
+        if turn.events:
+            for event, _ in turn.events:
+                event_counts[event.type] = event_counts.get(event.type, 0) + 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "turns": turns,
+        "elapsed": elapsed,
+        "landings": landings,
+        "events": event_counts,
+        "year": model.game_time.year,
+        "month": model.game_time.month,
+    }
+
+def simulate_vectorized(turns: int, games: int, seed: int = None, width: int = 16, height: int = 9,
+                        dice=(6,)):
+    """使用 NumPy 批量引擎同时模拟多局
+
+    Args:
+        turns: 每局回合数
+        games: 并行对局数
+        seed: 随机种子
+        width: 棋盘横向格子数
+        height: 棋盘纵向格子数
+        dice: 骰子配置，见 analysis.dice_config
+
+    Returns:
+        MonteCarloResult: 统计结果
+    """
+    # 只有使用批量引擎时才需要 numpy
+    from analysis.monte_carlo import MonteCarloSimulator
+    simulator = MonteCarloSimulator.from_board(BoardModel(width, height), dice=dice,
+                                               games=games, seed=seed)
+    return simulator.run(turns)
+
+def solve_exact(turns: int, width: int = 16, height: int = 9, dice=(6,), start: int = 0) -> dict:
+    """用马尔可夫链精确求解落点统计
+
+    Returns:
+        dict: 长期落点分布、平均到达回合数和前 turns 回合的期望落点次数
+    """
+    from analysis.markov import MarkovSolver
+    solver = MarkovSolver.from_board(BoardModel(width, height), dice=dice)
+    return {
+        "stationary": solver.stationary_distribution(start),
+        "hitting_times": solver.expected_hitting_times(start),
+        "expected_landings": solver.expected_landings(turns, start),
+    }
+
+def parse_dice(text: str):
+    """解析骰子配置字符串
+
+    逗号分隔每颗骰子；整数表示 1..n 的均匀骰子，斜杠分隔的面值表示自定义骰子。
+    例如 "6,6" 为两颗六面骰，"1/1/2/3" 为一颗自定义四面骰。
+    """
+    dice = []
+    for part in text.split(','):
+        part = part.strip()
+        if '/' in part:
+            dice.append(tuple(int(face) for face in part.split('/')))
+        else:
+            dice.append(int(part))
+    return tuple(dice)
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="冒险棋 - 无界面回合模拟")
+    parser.add_argument('--turns', type=int, default=1000000,
+                        help="模拟的回合数")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="随机种子，指定后结果可复现")
+    parser.add_argument('--width', type=int, default=16,
+                        help="棋盘横向格子数")
+    parser.add_argument('--height', type=int, default=9,
+                        help="棋盘纵向格子数")
+    parser.add_argument('--dice', type=parse_dice, default=(6,),
+                        help="骰子配置，如 6 / 6,6 / 1/1/2/3（批量引擎支持多颗和自定义骰子）")
+    parser.add_argument('--engine', choices=('model', 'numpy', 'exact'), default='model',
+                        help="model: 逐回合运行规则模型; numpy: 批量并行模拟多局; "
+                             "exact: 用马尔可夫链精确求解落点概率")
+    parser.add_argument('--events', default=None,
+                        help="格子事件定义文件（model 引擎），如 assets/data/board_events.json")
+    parser.add_argument('--games', type=int, default=1024,
+                        help="numpy 引擎的并行对局数（--turns 为每局回合数）")
+    parser.add_argument('--log-level', default='INFO',
+                        help="默认日志级别（DEBUG/INFO/WARNING/ERROR）")
+    parser.add_argument('--log', type=parse_levels_arg, default='',
+                        help="各子系统的日志级别，如 Simulate=DEBUG")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging(args.log_level, args.log)
+
+    if args.engine == 'numpy':
+        result = simulate_vectorized(args.turns, args.games, args.seed, args.width, args.height,
+                                     args.dice)
+        summary = result.summary()
+        log.info("批量模拟完成 - %d局 x %d回合, 耗时 %.2fs, %.0f回合/秒",
+                 summary["games"], summary["turns"], summary["elapsed"], summary["turns_per_second"])
+        log.info("每年圈数 - 平均 %.3f, 标准差 %.3f",
+                 summary["laps_per_year_mean"], summary["laps_per_year_std"])
+        for index, frequency in enumerate(result.landing_frequencies):
+            log.info("  格子 %3d: %.3f%%", index, frequency * 100.0)
+        return
+
+    if args.engine == 'exact':
+        result = solve_exact(args.turns, args.width, args.height, args.dice)
+        log.info("精确解 - 长期落点概率 / 平均到达回合数 / 前%d回合期望落点次数", args.turns)
+        for index, probability in enumerate(result["stationary"]):
+            log.info("  格子 %3d: %.3f%%  %8.2f  %12.2f", index, probability * 100.0,
+                     result["hitting_times"][index], result["expected_landings"][index])
+        return
+
+    if len(args.dice) != 1 or not isinstance(args.dice[0], int):
+        raise SystemExit("model 引擎只支持单颗均匀骰子，多颗或自定义骰子请使用 --engine numpy")
+    result = simulate(args.turns, args.seed, args.width, args.height, args.dice[0], args.events)
+
+    turns_per_second = result["turns"] / result["elapsed"] if result["elapsed"] > 0 else float("inf")
+    log.info("模拟完成 - %d回合, 耗时 %.2fs, %.0f回合/秒, 结束于 %d年%d月",
+             result["turns"], result["elapsed"], turns_per_second, result["year"], result["month"])
+    for event_type, count in sorted(result["events"].items()):
+        log.info("  事件 %s: %d 次", event_type, count)
+    total = max(1, result["turns"])
+    for index, count in enumerate(result["landings"]):
+        log.info("  格子 %3d: %9d 次 (%.3f%%)", index, count, count * 100.0 / total)
+
+if __name__ == '__main__':
+    main()
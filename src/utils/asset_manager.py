@@ -0,0 +1,114 @@
+import pygame
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+from utils.logger import get_logger
+
+log = get_logger("AssetManager")
+
+# 项目根目录，资源路径都相对于它解析
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# 角色图片清单：角色名 -> 相对路径
+CHARACTER_IMAGES = {
+    "character": "assets/images/characters/character.png",
+    "bandit": "assets/images/characters/bandit.png",
+    "barbarian": "assets/images/characters/barbarian.png",
+    "clown": "assets/images/characters/clown.png",
+    "monk": "assets/images/characters/monk.png",
+    "wizard": "assets/images/characters/wizard.png",
+}
+
+class AssetManager:
+    """图片资源管理器（单例）
+
+    每张图片只从磁盘加载一次，并转换为显示表面的像素格式，
+    避免每次 blit 都走慢速的格式转换路径；按 (路径, 尺寸) 缓存缩放后的版本，
+    大量创建使用同一图片的对象时不会重复加载和缩放。
+    """
+    _instance = None
+
+    @staticmethod
+    def get_instance():
+        if AssetManager._instance is None:
+            AssetManager._instance = AssetManager()
+        return AssetManager._instance
+
+    def __init__(self):
+        if AssetManager._instance is not None:
+            raise Exception("AssetManager 是单例类，请使用 get_instance() 方法获取实例")
+        AssetManager._instance = self
+
+        # 原始图片：路径 -> Surface
+        self._images: Dict[str, pygame.Surface] = {}
+        # 已转换为显示格式的路径
+        self._converted = set()
+        # 缩放后的图片：(路径, 尺寸) -> Surface
+        self._scaled: Dict[Tuple[str, Tuple[int, int]], pygame.Surface] = {}
+
+    @staticmethod
+    def _resolve(path: Union[str, Path]) -> str:
+        """把相对路径解析为项目根目录下的绝对路径"""
+        path = Path(path)
+        if not path.is_absolute():
+            path = PROJECT_ROOT / path
+        return str(path)
+
+    def get_image(self, path: Union[str, Path], size: Optional[Tuple[int, int]] = None) -> pygame.Surface:
+        """获取图片，可选缩放到指定尺寸
+
+        返回的表面是共享的，调用方不要修改它。
+
+        Args:
+            path: 图片路径（相对于项目根目录或绝对路径）
+            size: 目标尺寸 (宽, 高)，为None时返回原始尺寸
+
+        Returns:
+            pygame.Surface: 图片表面
+        """
+        key = self._resolve(path)
+        image = self._load(key)
+        if size is None:
+            return image
+
+        size = (int(size[0]), int(size[1]))
+        scaled_key = (key, size)
+        scaled = self._scaled.get(scaled_key)
+        if scaled is None:
+            scaled = pygame.transform.scale(image, size)
+            self._scaled[scaled_key] = scaled
+        return scaled
+
+    def _load(self, key: str) -> pygame.Surface:
+        """加载图片并在显示模式可用时转换为显示格式"""
+        image = self._images.get(key)
+        if image is None:
+            image = pygame.image.load(key)
+            self._images[key] = image
+            log.debug("加载图片: %s", key)
+
+        if key not in self._converted and pygame.display.get_surface() is not None:
+            # 显示模式设置后才能转换；之前缩放的版本也需要按新格式重建
+            image = image.convert_alpha()
+            self._images[key] = image
+            self._converted.add(key)
+            for scaled_key in [k for k in self._scaled if k[0] == key]:
+                del self._scaled[scaled_key]
+        return image
+
+    def preload(self, manifest: Iterable[Union[str, Tuple[str, Tuple[int, int]]]]):
+        """按清单预加载图片
+
+        Args:
+            manifest: 路径，或 (路径, 尺寸) 二元组的序列
+        """
+        for entry in manifest:
+            if isinstance(entry, tuple):
+                self.get_image(*entry)
+            else:
+                self.get_image(entry)
+
+    def clear(self):
+        """清空所有缓存的图片"""
+        self._images.clear()
+        self._converted.clear()
+        self._scaled.clear()
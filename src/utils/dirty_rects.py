@@ -0,0 +1,109 @@
+import pygame
+from typing import Callable, List, Optional
+
+
+def draw_border(surface: pygame.Surface, color, rect: pygame.Rect, width: int):
+    """用四个填充矩形绘制方形边框
+
+    与 pygame.draw.rect(surface, color, rect, width) 的结果一致，
+    但在设置了裁剪区域时不会出现粗线条被错误加宽的问题，可安全用于局部重绘。
+    """
+    x, y, w, h = rect
+    surface.fill(color, (x, y, w, width))
+    surface.fill(color, (x, y + h - width, w, width))
+    surface.fill(color, (x, y, width, h))
+    surface.fill(color, (x + w - width, y, width, h))
+
+
+class DirtyRectTracker:
+    """脏矩形跟踪器
+
+    场景在更新时标记发生变化的屏幕区域，绘制时只重绘这些区域，
+    主循环再通过 pygame.display.update(rects) 只推送这些区域。
+    """
+
+    def __init__(self, screen_rect: pygame.Rect, max_rects: int = 16, full_ratio: float = 0.5):
+        """
+        Args:
+            screen_rect: 整个屏幕的矩形
+            max_rects: 合并后的矩形数量上限，超过则退化为整屏重绘
+            full_ratio: 脏区域面积占屏幕的比例上限，超过则退化为整屏重绘
+        """
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.max_rects = max_rects
+        self.full_ratio = full_ratio
+        self._rects: List[pygame.Rect] = []
+        self._full = True  # 首帧总是整屏绘制
+
+    @property
+    def has_dirty(self) -> bool:
+        """是否有需要重绘的区域"""
+        return self._full or bool(self._rects)
+
+    def mark(self, rect: Optional[pygame.Rect]):
+        """标记一个需要重绘的区域"""
+        if self._full or not rect:
+            return
+        clipped = pygame.Rect(rect).clip(self.screen_rect)
+        if clipped.width > 0 and clipped.height > 0:
+            self._rects.append(clipped)
+
+    def mark_all(self):
+        """标记整个屏幕需要重绘"""
+        self._full = True
+        self._rects.clear()
+
+    def consume(self) -> List[pygame.Rect]:
+        """取出本帧的脏矩形并清空
+
+        重叠的矩形会被合并；矩形过多或面积过大时返回整屏矩形。
+
+        Returns:
+            List[pygame.Rect]: 需要重绘的矩形列表，没有变化时为空列表
+        """
+        if self._full:
+            self._full = False
+            self._rects.clear()
+            return [self.screen_rect.copy()]
+
+        merged: List[pygame.Rect] = []
+        for rect in self._rects:
+            # 反复吸收与之重叠的矩形，直到没有重叠
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect = rect.union(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        self._rects.clear()
+
+        area = sum(r.width * r.height for r in merged)
+        screen_area = self.screen_rect.width * self.screen_rect.height
+        if len(merged) > self.max_rects or area > screen_area * self.full_ratio:
+            return [self.screen_rect.copy()]
+        return merged
+
+    def redraw(self, screen: pygame.Surface, draw_func: Callable[[], None]) -> List[pygame.Rect]:
+        """只在脏区域内重绘场景
+
+        通过裁剪区域重复调用完整的绘制函数，保证每个区域的绘制结果与整屏绘制一致。
+
+        Args:
+            screen: 目标表面
+            draw_func: 场景的完整绘制函数
+
+        Returns:
+            List[pygame.Rect]: 实际重绘过的矩形，供 pygame.display.update 使用
+        """
+        rects = self.consume()
+        if len(rects) == 1 and rects[0] == self.screen_rect:
+            draw_func()
+            return rects
+
+        old_clip = screen.get_clip()
+        try:
+            for rect in rects:
+                screen.set_clip(rect)
+                draw_func()
+        finally:
+            screen.set_clip(old_clip)
+        return rects
@@ -0,0 +1,275 @@
+import math
+from fractions import Fraction
+from typing import List, Optional, Sequence, Tuple
+import pygame
+from utils.logger import get_logger
+
+log = get_logger("Display")
+
+# 所有场景按这个逻辑分辨率布局和绘制
+LOGICAL_SIZE = (1920, 1080)
+
+# 缩放方式
+SCALE_SCALED = "scaled"      # pygame.SCALED：由 SDL 渲染器（通常是显卡）把逻辑画面缩放到窗口
+SCALE_SOFTWARE = "software"  # 在离屏的逻辑画面上绘制，每帧按窗口大小缩放一次后推送
+SCALE_MODES = (SCALE_SCALED, SCALE_SOFTWARE)
+
+# 局部缩放时向外扩展的逻辑像素，避免平滑缩放在矩形边缘产生接缝
+_RECT_MARGIN = 2
+
+# 需要转换为逻辑坐标的鼠标事件
+_MOUSE_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+
+class Display:
+    """与分辨率无关的显示输出
+
+    场景始终在 LOGICAL_SIZE 的逻辑画面（surface）上绘制，由本类负责呈现到实际窗口：
+
+    - scaled 模式使用 pygame.SCALED，逻辑画面就是显示表面，缩放由 SDL 完成，
+      鼠标坐标也由 SDL 换算，窗口大小和全屏切换都不需要重建任何缓存；
+    - software 模式（SCALED 不可用时自动使用）在离屏的逻辑画面上绘制，
+      呈现时按保持宽高比的比例缩放到窗口中央：整屏重绘时每帧只缩放一次，
+      局部重绘时只缩放变化的矩形。窗口表面本身就是输出分辨率下的缓存，
+      没有变化的区域（包括两侧的黑边）不会被重新缩放。
+
+    窗口大小变化和全屏切换只记录下来，在一帧的事件处理完之后重建一次
+    （缩放比例、输出区域和黑边），并要求下一帧整屏呈现。
+
+    用法:
+        display = Display(mode=SCALE_SCALED)
+        scene = MainMenu(display.surface)
+        display.present()            # 整屏
+        display.present(dirty_rects) # 只推送变化的区域
+    """
+    def __init__(self, mode: str = SCALE_SCALED, window_size: Optional[Tuple[int, int]] = None,
+                 fullscreen: bool = False, vsync: bool = False,
+                 logical_size: Tuple[int, int] = LOGICAL_SIZE):
+        """
+        Args:
+            mode: 缩放方式，见 SCALE_MODES
+            window_size: software 模式的初始窗口大小，默认按桌面大小适配
+            fullscreen: 是否以全屏启动
+            vsync: 是否开启垂直同步（显示驱动不支持时自动关闭）
+            logical_size: 逻辑分辨率
+        """
+        if mode not in SCALE_MODES:
+            raise ValueError(f"未知的缩放方式: {mode}")
+        self.mode = mode
+        self.logical_size = logical_size
+        self.vsync = vsync
+        self.fullscreen = fullscreen
+        self._window_size = window_size or self._default_window_size()
+        self._pending_size: Optional[Tuple[int, int]] = None
+        self._needs_full = True
+
+        # 输出区域（窗口坐标）和缩放比例，software 模式下由 _rebuild 计算
+        self._scale = 1.0
+        self._align = 1
+        self._scale_fn = pygame.transform.smoothscale
+        self._dest = pygame.Rect((0, 0), logical_size)
+        self._dest_surface: Optional[pygame.Surface] = None
+        self._scratch: Optional[pygame.Surface] = None
+        self.window: Optional[pygame.Surface] = None
+
+        if mode == SCALE_SCALED:
+            try:
+                self.surface = self._set_mode(logical_size, pygame.SCALED | pygame.RESIZABLE)
+            except pygame.error as e:
+                log.warning("无法使用 pygame.SCALED，改为软件缩放: %s", e)
+                self.mode = SCALE_SOFTWARE
+        if self.mode == SCALE_SCALED:
+            self.window = self.surface
+            if fullscreen:
+                self._toggle_scaled_fullscreen()
+        else:
+            self._open_window()
+            # 逻辑画面转换为窗口的像素格式，缩放和推送时不需要再转换
+            self.surface = pygame.Surface(logical_size, 0, self.window)
+            self._rebuild()
+        log.info("显示 - %s模式, 逻辑分辨率 %dx%d, 窗口 %dx%d", self.mode, *logical_size,
+                 *pygame.display.get_window_size())
+
+    def _default_window_size(self) -> Tuple[int, int]:
+        """按桌面大小适配的窗口大小（保持逻辑分辨率的宽高比，不超过逻辑分辨率）"""
+        sizes = pygame.display.get_desktop_sizes() if pygame.display.get_init() else []
+        if not sizes:
+            return self.logical_size
+        desktop_w, desktop_h = sizes[0]
+        # 留出任务栏和标题栏的空间
+        scale = min(1.0, desktop_w * 0.95 / self.logical_size[0], desktop_h * 0.9 / self.logical_size[1])
+        return (int(self.logical_size[0] * scale), int(self.logical_size[1] * scale))
+
+    def _set_mode(self, size: Tuple[int, int], flags: int) -> pygame.Surface:
+        """创建窗口，需要时开启垂直同步"""
+        if self.vsync:
+            try:
+                return pygame.display.set_mode(size, flags, vsync=1)
+            except pygame.error as e:
+                log.warning("无法开启垂直同步，使用普通模式: %s", e)
+                self.vsync = False
+        return pygame.display.set_mode(size, flags)
+
+    def _open_window(self):
+        """software 模式：按当前的全屏状态创建窗口"""
+        if self.fullscreen:
+            self.window = self._set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            self.window = self._set_mode(self._window_size, pygame.RESIZABLE)
+
+    def _rebuild(self):
+        """software 模式：重新计算输出区域、缩放比例并重画黑边"""
+        window_w, window_h = self.window.get_size()
+        logical_w, logical_h = self.logical_size
+        # 缩放比例取 p/step（step 为逻辑宽高的最大公约数，1920x1080 时为120），
+        # 输出尺寸是整数，且逻辑坐标中每隔 _align 像素的网格线都落在整数输出像素上，
+        # 局部缩放按网格对齐后不会错位或出现接缝；代价是最多留出 1/step 的黑边。
+        # 缩小时与整屏缩放在视觉上无缝衔接，但不是逐像素一致：smoothscale 的定点
+        # 采样误差沿整行累积，局部缩放的像素可能相差几个色阶，下一次整屏呈现时消除
+        step = math.gcd(logical_w, logical_h)
+        fitted = min(window_w / logical_w, window_h / logical_h)
+        scale = Fraction(max(1, math.floor(fitted * step)), step)
+        self._scale = float(scale)
+        self._align = scale.denominator
+        # 缩小用平滑缩放；放大用最近邻（平滑放大的采样位置取决于整幅图的尺寸，
+        # 局部放大会产生明显接缝；最近邻按网格对齐后与整屏放大逐像素一致，整数倍放大时也更清晰）
+        self._scale_fn = pygame.transform.smoothscale if scale < 1 else pygame.transform.scale
+        dest_w = logical_w * scale.numerator // scale.denominator
+        dest_h = logical_h * scale.numerator // scale.denominator
+        self._dest = pygame.Rect((window_w - dest_w) // 2, (window_h - dest_h) // 2, dest_w, dest_h)
+        self._dest_surface = self.window.subsurface(self._dest)
+        # 局部缩放的暂存区（输出分辨率，重建时才重新分配）
+        self._scratch = pygame.Surface(self._dest.size, 0, self.window)
+        self.window.fill((0, 0, 0))
+        self._needs_full = True
+        log.debug("重建输出 - 窗口 %dx%d, 缩放 %.3f", window_w, window_h, self._scale)
+
+    def handle_event(self, event) -> bool:
+        """处理窗口大小变化事件（只记录，帧末统一重建）
+
+        Returns:
+            bool: 事件是否是窗口大小变化
+        """
+        if event.type == pygame.VIDEORESIZE:
+            self._pending_size = event.size
+            return True
+        return False
+
+    def toggle_fullscreen(self):
+        """切换全屏（software 模式在帧末重建一次）"""
+        self.fullscreen = not self.fullscreen
+        if self.mode == SCALE_SCALED:
+            self._toggle_scaled_fullscreen()
+        # 帧末重建（scaled 模式只需要整屏重新推送）
+        self._pending_size = self._window_size
+        log.info("切换到%s", "全屏" if self.fullscreen else "窗口")
+
+    def _toggle_scaled_fullscreen(self):
+        try:
+            pygame.display.toggle_fullscreen()
+        except pygame.error as e:
+            log.warning("无法切换全屏: %s", e)
+            self.fullscreen = not self.fullscreen
+
+    def apply_pending(self) -> bool:
+        """应用本帧记录的窗口变化，同一帧的多次变化只重建一次
+
+        Returns:
+            bool: 是否重建了输出（场景需要整屏重绘）
+        """
+        if self._pending_size is None:
+            return False
+        size = self._pending_size
+        self._pending_size = None
+        if self.mode == SCALE_SCALED:
+            # SDL 自动缩放，只需要整屏重新推送一次
+            self._needs_full = True
+            return True
+        if not self.fullscreen:
+            self._window_size = size
+        self._open_window()
+        self._rebuild()
+        return True
+
+    def to_logical(self, pos: Tuple[int, int]) -> Tuple[int, int]:
+        """把窗口坐标换算为逻辑坐标"""
+        if self.mode == SCALE_SCALED:
+            return pos
+        x = (pos[0] - self._dest.x) / self._scale
+        y = (pos[1] - self._dest.y) / self._scale
+        return (min(max(int(x), 0), self.logical_size[0] - 1),
+                min(max(int(y), 0), self.logical_size[1] - 1))
+
+    def translate_events(self, events: Sequence[pygame.event.Event]):
+        """把鼠标事件的坐标换算为逻辑坐标（scaled 模式下 SDL 已经换算过）"""
+        if self.mode == SCALE_SCALED:
+            return
+        for event in events:
+            if event.type in _MOUSE_EVENTS:
+                event.pos = self.to_logical(event.pos)
+                if event.type == pygame.MOUSEMOTION:
+                    event.rel = (int(event.rel[0] / self._scale), int(event.rel[1] / self._scale))
+
+    def _align_rect(self, rect: pygame.Rect) -> pygame.Rect:
+        """把逻辑矩形向外扩展到缩放网格上"""
+        align = self._align
+        left = rect.left // align * align
+        top = rect.top // align * align
+        right = min(-(-rect.right // align) * align, self.logical_size[0])
+        bottom = min(-(-rect.bottom // align) * align, self.logical_size[1])
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def _output_rect(self, rect: pygame.Rect) -> pygame.Rect:
+        """逻辑矩形在输出区域中对应的矩形（向外取整）"""
+        scale = self._scale
+        left = math.floor(rect.left * scale)
+        top = math.floor(rect.top * scale)
+        right = min(math.ceil(rect.right * scale), self._dest.width)
+        bottom = min(math.ceil(rect.bottom * scale), self._dest.height)
+        return pygame.Rect(left, top, max(right - left, 0), max(bottom - top, 0))
+
+    def present(self, rects: Optional[List[pygame.Rect]] = None):
+        """把逻辑画面呈现到窗口
+
+        Args:
+            rects: 发生变化的逻辑矩形，为None时整屏呈现
+        """
+        if self.mode == SCALE_SCALED:
+            if rects is None or self._needs_full:
+                self._needs_full = False
+                pygame.display.flip()
+            elif rects:
+                pygame.display.update(rects)
+            return
+
+        if rects is None or self._needs_full:
+            self._needs_full = False
+            if self._dest.size == self.logical_size:
+                self._dest_surface.blit(self.surface, (0, 0))
+            else:
+                self._scale_fn(self.surface, self._dest.size, self._dest_surface)
+            pygame.display.flip()
+            return
+        if not rects:
+            return
+
+        if self._dest.size == self.logical_size:
+            for rect in rects:
+                self._dest_surface.blit(self.surface, rect, rect)
+            pygame.display.update([rect.move(self._dest.topleft) for rect in rects])
+            return
+
+        # 连同四周少量像素（对齐到缩放网格）一起缩放到暂存区，
+        # 只把矩形本身对应的部分复制到窗口，矩形外已经呈现的像素保持不变
+        # （缩小时与整屏缩放相差最多几个色阶，见 _rebuild）
+        logical_rect = self.surface.get_rect()
+        updated = []
+        for rect in rects:
+            source = self._align_rect(rect.inflate(_RECT_MARGIN * 2, _RECT_MARGIN * 2).clip(logical_rect))
+            scaled = self._output_rect(source)
+            target = self._output_rect(rect).clip(scaled)
+            if not target.width or not target.height:
+                continue
+            self._scale_fn(self.surface.subsurface(source), scaled.size, self._scratch.subsurface(scaled))
+            self._dest_surface.blit(self._scratch, target, target)
+            updated.append(target.move(self._dest.topleft))
+        pygame.display.update(updated)
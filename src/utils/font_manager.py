@@ -1,11 +1,45 @@
 import pygame
+import pygame.freetype
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from utils.logger import get_logger
+
+log = get_logger("FontManager")
+
+class SizedFont:
+    """共享字体在某个字号下的视图
+
+    提供与 pygame.font.Font 相同的 render/size/get_height 接口，
+    实际使用 FontManager 持有的同一个 freetype 字体，不会重复打开字体文件。
+    """
+    def __init__(self, manager, size: int):
+        self.manager = manager
+        self.point_size = size
+
+    def render(self, text: str, antialias: bool, color) -> pygame.Surface:
+        """渲染文本（不经过缓存）"""
+        return self.manager._render(text, self.point_size, color, antialias)
+
+    def size(self, text: str):
+        """获取文本渲染后的尺寸 (宽, 高)"""
+        return self.manager._text_size(text, self.point_size)
+
+    def get_height(self) -> int:
+        """获取行高"""
+        return self.manager._line_height(self.point_size)
 
 class FontManager:
     _instance = None
     _fonts = {}
 
+    # 思源黑体字体文件
+    FONT_PATH = Path(__file__).parent.parent.parent / "assets" / "fonts" / "SourceHanSans-Bold.ttc"
+
+    # 文本表面缓存的默认内存上限（字节）
+    DEFAULT_TEXT_CACHE_BYTES = 16 * 1024 * 1024
+
     @staticmethod
     def get_instance():
         if FontManager._instance is None:
@@ -17,29 +51,188 @@ class FontManager:
             raise Exception("FontManager 是单例类，请使用 get_instance() 方法获取实例")
         FontManager._instance = self
 
-    def get_font(self, size: int = 24) -> pygame.font.Font:
+        # 整个游戏共享的字体，只打开一次，按需以任意字号渲染
+        self._face = None
+        self._face_lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._load_thread = None
+        self._load_error = None
+
+        # 文本表面LRU缓存：(text, size, color, antialias) -> Surface
+        self._text_cache = OrderedDict()
+        self._text_cache_bytes = 0
+        self.text_cache_max_bytes = self.DEFAULT_TEXT_CACHE_BYTES
+        self.text_cache_hits = 0
+        self.text_cache_misses = 0
+
+    def load_async(self):
+        """在后台线程中加载字体
+
+        加载期间可以显示启动画面；加载完成前的任何渲染调用都会等待加载结束。
+        """
+        if self._loaded.is_set() or self._load_thread is not None:
+            return
+        if not pygame.freetype.get_init():
+            pygame.freetype.init()
+        self._load_thread = threading.Thread(target=self._load_face, name="FontLoader", daemon=True)
+        self._load_thread.start()
+
+    def is_loaded(self) -> bool:
+        """字体是否已经加载完成"""
+        return self._loaded.is_set()
+
+    def wait_until_loaded(self):
+        """等待字体加载完成，尚未开始加载时在当前线程同步加载"""
+        if not self._loaded.is_set() and self._load_thread is None:
+            self._load_face()
+        self._loaded.wait()
+
+    def _load_face(self):
+        """打开字体文件
+
+        无论成功与否都会标记加载结束，等待加载的启动画面和渲染调用不会一直卡住；
+        连备用字体也无法加载时，之后的渲染调用会抛出 RuntimeError。
+        """
+        with self._face_lock:
+            try:
+                if self._face is not None:
+                    return
+                if not pygame.freetype.get_init():
+                    pygame.freetype.init()
+                try:
+                    if not self.FONT_PATH.exists():
+                        log.warning("字体文件不存在: %s", self.FONT_PATH)
+                        # 尝试使用系统默认字体
+                        face = self._load_fallback_face()
+                    else:
+                        log.info("加载字体文件: %s", self.FONT_PATH)
+                        face = pygame.freetype.Font(str(self.FONT_PATH))
+                except Exception as e:
+                    log.error("字体加载错误: %s", e)
+                    # 出错时使用系统默认字体
+                    face = self._load_fallback_face()
+
+                # 以基线为绘制原点，便于把文字放到固定行高的表面上
+                face.origin = True
+                face.pad = False
+                self._face = face
+            except Exception as e:
+                self._load_error = e
+                log.error("备用字体也无法加载: %s", e)
+            finally:
+                self._loaded.set()
+
+    @staticmethod
+    def _load_fallback_face():
+        """加载备用字体"""
+        try:
+            return pygame.freetype.SysFont("simhei", 24)
+        except Exception:
+            return pygame.freetype.Font(None)
+
+    def _get_face(self):
+        """获取共享字体，必要时等待加载完成；字体（包括备用字体）加载失败时抛出 RuntimeError"""
+        if self._face is None:
+            self.wait_until_loaded()
+            if self._face is None:
+                raise RuntimeError(f"字体加载失败: {self._load_error}")
+        return self._face
+
+    def get_font(self, size: int = 24) -> SizedFont:
         """获取指定大小的字体
         
         Args:
             size: 字体大小，默认24
             
         Returns:
-            pygame.font.Font: 字体对象
+            SizedFont: 共享字体在该字号下的视图
         """
         if size not in self._fonts:
-            try:
-                # 使用 Path 对象处理路径
-                font_path = Path(__file__).parent.parent.parent / "assets" / "fonts" / "SourceHanSans-Bold.ttc"
-                if not font_path.exists():
-                    print(f"[FontManager] 警告: 字体文件不存在: {font_path}")
-                    # 尝试使用系统默认字体
-                    self._fonts[size] = pygame.font.SysFont("simhei", size)
-                else:
-                    print(f"[FontManager] 加载字体文件: {font_path}")
-                    self._fonts[size] = pygame.font.Font(str(font_path), size)
-            except Exception as e:
-                print(f"[FontManager] 字体加载错误: {e}")
-                # 出错时使用系统默认字体
-                self._fonts[size] = pygame.font.SysFont("simhei", size)
+            self._fonts[size] = SizedFont(self, size)
         
-        return self._fonts[size] 
\ No newline at end of file
+        return self._fonts[size]
+
+    def _line_height(self, size: int) -> int:
+        """获取指定字号的行高"""
+        return self._get_face().get_sized_height(size)
+
+    def _text_size(self, text: str, size: int):
+        """获取文本在指定字号下的尺寸 (宽, 高)"""
+        face = self._get_face()
+        rect = face.get_rect(text, size=size)
+        return (max(0, rect.x + rect.width), face.get_sized_height(size))
+
+    def _render(self, text: str, size: int, color, antialias: bool) -> pygame.Surface:
+        """用共享字体渲染文本，表面高度固定为行高"""
+        face = self._get_face()
+        width, height = self._text_size(text, size)
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        face.antialiased = antialias
+        face.render_to(surface, (0, face.get_sized_ascender(size)), text, color, size=size)
+        return surface
+
+    def render_text(self, text: str, size: int = 24, color=(33, 33, 33),
+                    antialias: bool = True) -> pygame.Surface:
+        """渲染文本，相同参数的结果会被缓存复用
+
+        文本只在内容、字号、颜色或抗锯齿设置变化时才重新光栅化。
+        返回的表面是共享的，调用方不要修改它。
+
+        Args:
+            text: 要渲染的文本
+            size: 字体大小
+            color: 文字颜色
+            antialias: 是否抗锯齿
+
+        Returns:
+            pygame.Surface: 文本表面
+        """
+        key = (text, size, tuple(pygame.Color(color)), antialias)
+        surface = self._text_cache.get(key)
+        if surface is not None:
+            self._text_cache.move_to_end(key)
+            self.text_cache_hits += 1
+            return surface
+
+        self.text_cache_misses += 1
+        surface = self._render(text, size, color, antialias)
+        self._text_cache[key] = surface
+        self._text_cache_bytes += self._surface_bytes(surface)
+        self._evict_text_cache()
+        return surface
+
+    def _evict_text_cache(self):
+        """按最近最少使用顺序淘汰缓存，直到内存占用不超过上限"""
+        # 至少保留刚加入的一项
+        while self._text_cache_bytes > self.text_cache_max_bytes and len(self._text_cache) > 1:
+            _, surface = self._text_cache.popitem(last=False)
+            self._text_cache_bytes -= self._surface_bytes(surface)
+
+    @staticmethod
+    def _surface_bytes(surface: pygame.Surface) -> int:
+        """估算表面占用的像素内存"""
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def set_text_cache_limit(self, max_bytes: int):
+        """设置文本缓存的内存上限（字节）"""
+        self.text_cache_max_bytes = max_bytes
+        self._evict_text_cache()
+
+    def clear_text_cache(self):
+        """清空文本缓存"""
+        self._text_cache.clear()
+        self._text_cache_bytes = 0
+
+    def get_text_cache_stats(self) -> dict:
+        """获取文本缓存统计信息
+
+        Returns:
+            dict: 包含条目数、内存占用、上限以及命中/未命中次数
+        """
+        return {
+            "entries": len(self._text_cache),
+            "bytes": self._text_cache_bytes,
+            "max_bytes": self.text_cache_max_bytes,
+            "hits": self.text_cache_hits,
+            "misses": self.text_cache_misses,
+        }
@@ -0,0 +1,235 @@
+import csv
+import time
+from collections import deque
+from typing import Dict, List, Optional
+import pygame
+from utils.font_manager import FontManager
+from utils.logger import get_logger
+
+log = get_logger("FrameProfiler")
+
+class _Span:
+    """一个计时区间，用作上下文管理器"""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.add(self.name, (time.perf_counter() - self.start) * 1000.0)
+        return False
+
+class _NullSpan:
+    """未开启统计时使用的空区间，几乎没有开销"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class FrameProfiler:
+    """逐帧分阶段计时（单例）
+
+    记录每一帧中各阶段（事件处理、更新、绘制、显示等）的耗时，
+    提供滚动窗口内的百分位统计、可切换的屏幕叠加显示和CSV导出。
+
+    用法:
+        profiler = FrameProfiler.get_instance()
+        with profiler.span("update"):
+            scene.update()
+    """
+    _instance = None
+
+    @staticmethod
+    def get_instance():
+        if FrameProfiler._instance is None:
+            FrameProfiler._instance = FrameProfiler()
+        return FrameProfiler._instance
+
+    def __init__(self, window: int = 240, history_size: int = 36000):
+        """
+        Args:
+            window: 百分位统计使用的最近帧数
+            history_size: 保存用于导出的帧数上限（默认约10分钟@60FPS）
+        """
+        if FrameProfiler._instance is not None:
+            raise Exception("FrameProfiler 是单例类，请使用 get_instance() 方法获取实例")
+        FrameProfiler._instance = self
+
+        self.enabled = False
+        self.overlay_visible = False
+        self.window = window
+
+        self.frame_index = 0
+        # 当前帧的开始时间，不在帧内（例如帧中途才开启统计）时为None
+        self._frame_start: Optional[float] = None
+        self._current: Dict[str, float] = {}
+        # 阶段名 -> 最近 window 帧的耗时（毫秒）
+        self._rolling: Dict[str, deque] = {}
+        # 完整的逐帧记录，用于导出
+        self._history: deque = deque(maxlen=history_size)
+        # 阶段出现的顺序，用于显示和导出时的列顺序
+        self._phase_order: List[str] = []
+
+        # 叠加显示
+        self.overlay_font_size = 16
+        self.overlay_position = (10, 10)
+        self.overlay_refresh_frames = 15  # 每隔多少帧刷新一次叠加显示的文字
+        self._overlay_surface: Optional[pygame.Surface] = None
+        self._overlay_age = 0
+
+    def span(self, name: str):
+        """开始一个计时区间（上下文管理器），未开启统计时返回空区间"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def add(self, name: str, elapsed_ms: float):
+        """把一段耗时累加到当前帧的某个阶段"""
+        if not self.enabled or self._frame_start is None:
+            return
+        self._current[name] = self._current.get(name, 0.0) + elapsed_ms
+
+    def begin_frame(self):
+        """标记一帧开始"""
+        if not self.enabled:
+            return
+        self._frame_start = time.perf_counter()
+        self._current = {}
+
+    def end_frame(self):
+        """标记一帧结束，把本帧数据加入滚动窗口和历史记录
+
+        在帧中途才开启统计时（例如按F3），这一帧没有开始时间，不记录，从下一帧开始统计。
+        """
+        if not self.enabled or self._frame_start is None:
+            return
+        self._current["frame"] = (time.perf_counter() - self._frame_start) * 1000.0
+        self._frame_start = None
+        for name, value in self._current.items():
+            rolling = self._rolling.get(name)
+            if rolling is None:
+                rolling = self._rolling[name] = deque(maxlen=self.window)
+                self._phase_order.append(name)
+            rolling.append(value)
+        self._history.append((self.frame_index, self._current))
+        self.frame_index += 1
+
+    def percentiles(self, name: str, points=(50, 95, 99)) -> Optional[List[float]]:
+        """计算某个阶段在滚动窗口内的百分位耗时（毫秒）
+
+        Returns:
+            List[float]: 与 points 对应的百分位值，没有数据时返回None
+        """
+        rolling = self._rolling.get(name)
+        if not rolling:
+            return None
+        values = sorted(rolling)
+        last = len(values) - 1
+        return [values[min(last, int(round(p / 100.0 * last)))] for p in points]
+
+    def toggle_overlay(self):
+        """切换叠加显示，显示时自动开启统计"""
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.enabled = True
+        self._overlay_surface = None
+        log.info("帧耗时叠加显示: %s", "开" if self.overlay_visible else "关")
+
+    def get_overlay_rect(self) -> Optional[pygame.Rect]:
+        """获取叠加显示当前占用的屏幕区域"""
+        if self._overlay_surface is None:
+            return None
+        return self._overlay_surface.get_rect(topleft=self.overlay_position)
+
+    def refresh_overlay(self) -> Optional[pygame.Rect]:
+        """推进叠加显示的刷新计数，到期时重新渲染文字
+
+        文字每隔 overlay_refresh_frames 帧才重新渲染一次，避免叠加显示本身影响帧耗时。
+
+        Returns:
+            pygame.Rect: 叠加显示将占用的区域，未显示时返回None
+        """
+        if not self.overlay_visible:
+            return None
+        self._overlay_age += 1
+        if self._overlay_surface is None or self._overlay_age >= self.overlay_refresh_frames:
+            self._overlay_surface = self._render_overlay()
+            self._overlay_age = 0
+        return self.get_overlay_rect()
+
+    def blit_overlay(self, screen: pygame.Surface) -> Optional[pygame.Rect]:
+        """把当前的叠加显示绘制到屏幕上，不刷新内容"""
+        if not self.overlay_visible or self._overlay_surface is None:
+            return None
+        rect = self.get_overlay_rect()
+        screen.blit(self._overlay_surface, rect)
+        return rect
+
+    def draw_overlay(self, screen: pygame.Surface) -> Optional[pygame.Rect]:
+        """刷新并绘制叠加显示
+
+        Returns:
+            pygame.Rect: 绘制的区域，未显示时返回None
+        """
+        self.refresh_overlay()
+        return self.blit_overlay(screen)
+
+    def _render_overlay(self) -> pygame.Surface:
+        """渲染叠加显示的文字面板"""
+        font = FontManager.get_instance().get_font(self.overlay_font_size)
+        rows = [["phase (ms)", "p50", "p95", "p99"]]
+        for name in self._phase_order:
+            values = self.percentiles(name)
+            if values:
+                rows.append([name] + [f"{v:.2f}" for v in values])
+
+        # 按列渲染并右对齐数字，避免比例字体导致列错位
+        cells = [[font.render(text, True, (255, 255, 255)) for text in row] for row in rows]
+        column_widths = [max(row[i].get_width() for row in cells) for i in range(len(rows[0]))]
+        column_gap = 12
+        line_height = font.get_height()
+        width = sum(column_widths) + column_gap * (len(column_widths) - 1) + 16
+        height = line_height * len(cells) + 12
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for row_index, row in enumerate(cells):
+            x = 8
+            y = 6 + row_index * line_height
+            for column_index, surface in enumerate(row):
+                column_width = column_widths[column_index]
+                if column_index == 0:
+                    panel.blit(surface, (x, y))
+                else:
+                    panel.blit(surface, (x + column_width - surface.get_width(), y))
+                x += column_width + column_gap
+        return panel
+
+    def export_csv(self, path: str) -> int:
+        """把逐帧记录导出为CSV
+
+        Args:
+            path: 导出文件路径
+
+        Returns:
+            int: 导出的帧数
+        """
+        columns = list(self._phase_order)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame_index"] + columns)
+            for frame_index, phases in self._history:
+                writer.writerow([frame_index] + [f"{phases[name]:.4f}" if name in phases else ""
+                                                 for name in columns])
+        log.info("导出帧耗时记录: %s (%d帧)", path, len(self._history))
+        return len(self._history)
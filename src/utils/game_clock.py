@@ -0,0 +1,52 @@
+import time
+from typing import Optional
+
+class GameClock:
+    """游戏时钟（单例）
+
+    每帧开始时取一次时间，本帧内所有对象读到的都是同一个时间；
+    回放录像时由录像中的帧时间驱动，而不是读取真实时间。
+
+    用法:
+        clock = GameClock.get_instance()
+        clock.begin_frame()      # 主循环每帧调用一次
+        now = clock.now()        # 秒
+        ticks = clock.ticks()    # 毫秒
+    """
+    _instance = None
+
+    @staticmethod
+    def get_instance():
+        if GameClock._instance is None:
+            GameClock._instance = GameClock()
+        return GameClock._instance
+
+    def __init__(self):
+        if GameClock._instance is not None:
+            raise Exception("GameClock 是单例类，请使用 get_instance() 方法获取实例")
+        GameClock._instance = self
+
+        self._start = time.perf_counter()
+        self._frame_time = 0.0
+
+    def begin_frame(self, frame_time: Optional[float] = None) -> float:
+        """开始新的一帧
+
+        Args:
+            frame_time: 指定本帧时间（秒，回放时使用），为None时读取真实时间
+
+        Returns:
+            float: 本帧时间（秒）
+        """
+        if frame_time is None:
+            frame_time = time.perf_counter() - self._start
+        self._frame_time = frame_time
+        return frame_time
+
+    def now(self) -> float:
+        """本帧时间（秒，从时钟创建开始计算）"""
+        return self._frame_time
+
+    def ticks(self) -> int:
+        """本帧时间（毫秒），可以代替 pygame.time.get_ticks()"""
+        return int(self._frame_time * 1000)
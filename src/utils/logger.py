@@ -0,0 +1,176 @@
+import argparse
+import logging
+import sys
+from collections import deque
+from typing import Dict, Optional, TextIO, Union
+
+# 所有子系统日志的根名称，子系统日志名为 "dfw.<子系统>"
+ROOT_LOGGER_NAME = "dfw"
+
+# 控制台输出格式，与原先 print 的 "[子系统] 消息" 风格保持一致
+CONSOLE_FORMAT = "[%(subsystem)s] %(message)s"
+DUMP_FORMAT = "%(asctime)s %(levelname)-7s [%(subsystem)s] %(message)s"
+
+
+class _SubsystemFilter(logging.Filter):
+    """为日志记录补充 subsystem 字段（去掉根名称前缀的日志名）"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "subsystem"):
+            name = record.name
+            if name.startswith(ROOT_LOGGER_NAME + "."):
+                name = name[len(ROOT_LOGGER_NAME) + 1:]
+            record.subsystem = name
+        return True
+
+
+class RingBufferHandler(logging.Handler):
+    """内存环形缓冲日志处理器
+
+    只保存最近的若干条日志记录，不做任何格式化，
+    在出错后可以把它们一次性导出，用于事后分析。
+    """
+
+    def __init__(self, capacity: int = 2000, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord):
+        self.records.append(record)
+
+    def dump(self, target: Union[str, TextIO, None] = None):
+        """导出缓冲区中的日志
+
+        Args:
+            target: 文件路径或可写流，默认输出到标准错误
+        """
+        formatter = logging.Formatter(DUMP_FORMAT)
+        lines = [formatter.format(record) for record in list(self.records)]
+        if isinstance(target, str):
+            with open(target, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        else:
+            stream = target or sys.stderr
+            stream.write("\n".join(lines) + "\n")
+
+
+_ring_buffer: Optional[RingBufferHandler] = None
+_console_handler: Optional[logging.Handler] = None
+# 子系统名（小写）-> 代码中使用的子系统名，命令行指定级别时不区分大小写
+_subsystem_names: Dict[str, str] = {}
+# 子系统名（小写）-> 配置的日志级别，配置之后才创建的子系统日志也会使用
+_subsystem_levels: Dict[str, int] = {}
+
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """获取子系统日志对象
+
+    消息使用 %-风格参数，只有在日志级别启用时才会真正格式化：
+        log.debug("移动到 %s", pos)
+    关闭的级别只有一次级别比较的开销。热点路径中需要构造昂贵参数时，
+    先用 log.isEnabledFor(logging.DEBUG) 判断。
+    """
+    logger = logging.getLogger(f"{ROOT_LOGGER_NAME}.{subsystem}")
+    key = subsystem.lower()
+    _subsystem_names.setdefault(key, subsystem)
+    level = _subsystem_levels.get(key)
+    if level is not None:
+        logger.setLevel(level)
+    return logger
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """解析子系统级别配置
+
+    Args:
+        spec: 形如 "Board=DEBUG,Dice=WARNING" 的字符串（子系统名和级别都不区分大小写）
+
+    Returns:
+        Dict[str, int]: 子系统名 -> 日志级别
+    """
+    levels = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, sep, level = item.partition("=")
+        name = name.strip()
+        level = level.strip()
+        if not sep or not name or not level:
+            raise ValueError(f"子系统日志级别应为 子系统=级别（如 Board=DEBUG）: {item}")
+        levels[name] = _to_level(level)
+    return levels
+
+
+def parse_levels_arg(spec: str) -> Dict[str, int]:
+    """argparse 的 type 参数：解析 --log，格式错误时作为用法错误报告"""
+    try:
+        return parse_levels(spec)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _to_level(level: Union[str, int]) -> int:
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(level.upper())
+    if not isinstance(value, int):
+        raise ValueError(f"未知的日志级别: {level}")
+    return value
+
+
+def configure_logging(level: Union[str, int] = logging.INFO,
+                      subsystem_levels: Optional[Dict[str, Union[str, int]]] = None,
+                      console: bool = True,
+                      ring_buffer_size: int = 2000):
+    """配置游戏日志
+
+    Args:
+        level: 默认日志级别
+        subsystem_levels: 各子系统单独的日志级别，如 {"Board": "DEBUG"}（子系统名不区分大小写）
+        console: 是否输出到控制台；无界面批量运行时可关闭
+        ring_buffer_size: 内存环形缓冲保存的日志条数，0 表示不保存
+    """
+    global _ring_buffer, _console_handler
+
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    root.setLevel(_to_level(level))
+    root.propagate = False
+
+    for handler in (_console_handler, _ring_buffer):
+        if handler is not None:
+            root.removeHandler(handler)
+    _console_handler = None
+    _ring_buffer = None
+
+    if console:
+        _console_handler = logging.StreamHandler(sys.stdout)
+        _console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        _console_handler.addFilter(_SubsystemFilter())
+        root.addHandler(_console_handler)
+
+    if ring_buffer_size > 0:
+        _ring_buffer = RingBufferHandler(ring_buffer_size)
+        _ring_buffer.addFilter(_SubsystemFilter())
+        root.addHandler(_ring_buffer)
+
+    if not root.handlers:
+        # 既不输出也不缓存时，彻底关闭以免走到 logging 的默认处理
+        root.addHandler(logging.NullHandler())
+
+    for name, sub_level in (subsystem_levels or {}).items():
+        key = name.lower()
+        _subsystem_levels[key] = _to_level(sub_level)
+        get_logger(_subsystem_names.get(key, name))
+
+
+def dump_ring_buffer(target: Union[str, TextIO, None] = None) -> bool:
+    """导出内存环形缓冲中的日志
+
+    Returns:
+        bool: 是否存在可导出的缓冲区
+    """
+    if _ring_buffer is None:
+        return False
+    _ring_buffer.dump(target)
+    return True
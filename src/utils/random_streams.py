@@ -0,0 +1,73 @@
+import hashlib
+import os
+import random
+from typing import Dict, Optional
+from utils.logger import get_logger
+
+log = get_logger("Random")
+
+# 影响游戏结果的随机数流（骰子最终点数等）
+GAMEPLAY = "gameplay"
+# 只影响表现的随机数流（骰子滚动时显示的点数等），消耗多少次都不会改变游戏结果
+COSMETIC = "cosmetic"
+# 电脑玩家的掷骰（与玩家自己的骰子分开，电脑玩家数量不影响玩家的点数序列）
+AI = "ai"
+
+class RandomStreams:
+    """按子系统划分的可设定种子的随机数流（单例）
+
+    每个子系统使用自己的 random.Random，各流的种子都由同一个主种子派生，
+    某个子系统多取或少取随机数不会影响其他子系统。
+    设定相同的主种子即可复现一局游戏。
+
+    用法:
+        rng = RandomStreams.get_instance().get(GAMEPLAY)
+        value = rng.randint(1, 6)
+    """
+    _instance = None
+
+    @staticmethod
+    def get_instance():
+        if RandomStreams._instance is None:
+            RandomStreams._instance = RandomStreams()
+        return RandomStreams._instance
+
+    def __init__(self):
+        if RandomStreams._instance is not None:
+            raise Exception("RandomStreams 是单例类，请使用 get_instance() 方法获取实例")
+        RandomStreams._instance = self
+
+        # 未调用 seed() 时使用随机的主种子
+        self.seed_value: int = int.from_bytes(os.urandom(8), 'little')
+        self._streams: Dict[str, random.Random] = {}
+
+    def seed(self, seed: Optional[int] = None) -> int:
+        """设定主种子并重置所有随机数流
+
+        已经取得的流对象会被原地重新播种，持有它们的对象不需要重新获取。
+
+        Args:
+            seed: 主种子，为None时随机生成一个
+
+        Returns:
+            int: 实际使用的主种子（记录下来即可复现）
+        """
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), 'little')
+        self.seed_value = seed
+        for name, stream in self._streams.items():
+            stream.seed(self._derive(name))
+        log.info("随机种子: %d", seed)
+        return seed
+
+    def _derive(self, name: str) -> int:
+        """由主种子和流名称派生该流的种子"""
+        digest = hashlib.sha256(f"{self.seed_value}:{name}".encode('utf-8')).digest()
+        return int.from_bytes(digest[:8], 'little')
+
+    def get(self, name: str) -> random.Random:
+        """获取（必要时创建）指定名称的随机数流"""
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = self._streams[name] = random.Random(self._derive(name))
+        return stream
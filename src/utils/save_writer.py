@@ -0,0 +1,201 @@
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from utils.logger import get_logger
+
+log = get_logger("SaveWriter")
+
+# 编码函数：把存档快照转换为要写入文件的字节
+Encoder = Callable[[Any], bytes]
+# 后台任务：在写入线程中执行的文件操作（例如压缩回合日志）
+Job = Callable[[], None]
+
+def write_atomic(path: Path, content: bytes):
+    """原子地写入文件
+
+    先写入同目录下的临时文件并 fsync，再用 os.replace 替换目标文件，
+    写入过程中崩溃也不会破坏已有的文件。
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    # 同步目录项，确保重命名本身也已落盘（Windows 不支持打开目录，忽略即可）
+    try:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+class SaveWriter:
+    """后台存档写入线程（单例）
+
+    主线程只提交存档快照，编码和磁盘写入都在后台线程完成，不会卡住帧。
+    同一文件在写入前多次提交时只写最后一次（合并连续的保存）。
+    其他较慢的文件操作可以用 run 提交为后台任务，任务按提交顺序执行，
+    并且排在已提交的存档快照之后。
+
+    用法:
+        writer = SaveWriter.get_instance()
+        writer.submit(path, snapshot, encode)
+        writer.run(key, job)
+        writer.flush()  # 退出前等待所有存档写完
+    """
+    _instance = None
+
+    @staticmethod
+    def get_instance():
+        if SaveWriter._instance is None:
+            SaveWriter._instance = SaveWriter()
+        return SaveWriter._instance
+
+    def __init__(self):
+        if SaveWriter._instance is not None:
+            raise Exception("SaveWriter 是单例类，请使用 get_instance() 方法获取实例")
+        SaveWriter._instance = self
+
+        self._condition = threading.Condition()
+        # 等待写入的快照：路径 -> (快照, 编码函数)
+        self._pending: Dict[str, Tuple[Any, Encoder]] = {}
+        # 等待执行的后台任务：(键, 任务)，按提交顺序执行
+        self._jobs: Deque[Tuple[str, Job]] = deque()
+        # 正在写入的快照或执行的任务：(路径或键, 快照，任务时为None)
+        self._in_flight: Optional[Tuple[str, Any]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+        # 统计
+        self.submitted = 0
+        self.written = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def submit(self, path, snapshot: Any, encode: Encoder):
+        """提交一个存档快照，立即返回
+
+        Args:
+            path: 存档文件路径
+            snapshot: 存档快照，提交后调用方不能再修改它
+            encode: 编码函数，在后台线程中把快照转换为字节
+        """
+        key = str(path)
+        with self._condition:
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = (snapshot, encode)
+            self.submitted += 1
+            self._ensure_thread()
+            self._condition.notify_all()
+
+    def run(self, key, job: Job):
+        """提交一个后台任务，立即返回
+
+        Args:
+            key: 任务的键（通常是任务操作的文件路径），discard 时按键取消
+            job: 任务函数，在后台线程中执行
+        """
+        with self._condition:
+            self._jobs.append((str(key), job))
+            self._ensure_thread()
+            self._condition.notify_all()
+
+    def get_pending(self, path) -> Optional[Any]:
+        """获取尚未写完的最新快照，没有时返回None
+
+        读取存档前先检查这里，保证能读到刚刚提交的内容。
+        """
+        key = str(path)
+        with self._condition:
+            if key in self._pending:
+                return self._pending[key][0]
+            if self._in_flight is not None and self._in_flight[0] == key:
+                return self._in_flight[1]
+        return None
+
+    def discard(self, path):
+        """丢弃某个文件尚未写入的快照和尚未执行的任务，并等待正在进行的写入完成"""
+        key = str(path)
+        with self._condition:
+            self._pending.pop(key, None)
+            if self._jobs:
+                self._jobs = deque(item for item in self._jobs if item[0] != key)
+            while self._in_flight is not None and self._in_flight[0] == key:
+                self._condition.wait()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待所有已提交的存档写入完成
+
+        Args:
+            timeout: 最长等待秒数，为None时一直等待
+
+        Returns:
+            bool: 是否全部写完
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._jobs and self._in_flight is None, timeout)
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """写完所有存档后停止后台线程"""
+        done = self.flush(timeout)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            thread.join(timeout)
+        log.debug("已停止 - 提交: %d, 写入: %d, 合并: %d, 失败: %d",
+                  self.submitted, self.written, self.coalesced, self.failed)
+        return done
+
+    def _ensure_thread(self):
+        """按需启动后台线程（调用方需持有锁）"""
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="SaveWriter", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        """后台线程：先写入已提交的快照，再逐个执行后台任务"""
+        while True:
+            with self._condition:
+                while not self._pending and not self._jobs and not self._stopping:
+                    self._condition.wait()
+                if self._pending:
+                    key = next(iter(self._pending))
+                    snapshot, encode = self._pending.pop(key)
+                    job = None
+                elif self._jobs:
+                    key, job = self._jobs.popleft()
+                    snapshot = None
+                else:
+                    return
+                self._in_flight = (key, snapshot)
+
+            try:
+                if job is not None:
+                    job()
+                else:
+                    write_atomic(Path(key), encode(snapshot))
+                    self.written += 1
+                    log.debug("写入存档: %s", key)
+            except Exception as e:
+                self.failed += 1
+                log.error("%s失败 %s: %s", "后台任务" if job is not None else "写入存档", key, e)
+            finally:
+                with self._condition:
+                    self._in_flight = None
+                    self._condition.notify_all()
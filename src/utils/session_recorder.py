@@ -0,0 +1,122 @@
+import base64
+import gzip
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import pygame
+from utils.logger import get_logger
+
+log = get_logger("Session")
+
+SESSION_VERSION = 1
+
+def _encode_value(value):
+    """把事件属性转换为可以写入JSON的值，不支持的类型返回None"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (tuple, list)):
+        items = [_encode_value(item) for item in value]
+        if any(item is None and original is not None for item, original in zip(items, value)):
+            return None
+        return {"t": items}
+    return None
+
+def _decode_value(value):
+    if isinstance(value, dict) and "t" in value:
+        return tuple(_decode_value(item) for item in value["t"])
+    return value
+
+def encode_event(event: pygame.event.Event) -> list:
+    """把 pygame 事件编码为 [类型, 属性]，丢弃无法序列化的属性（如窗口对象）"""
+    attrs = {}
+    for name, value in event.dict.items():
+        encoded = _encode_value(value)
+        if encoded is not None or value is None:
+            attrs[name] = encoded
+    return [event.type, attrs]
+
+def decode_event(data: list) -> pygame.event.Event:
+    event_type, attrs = data
+    return pygame.event.Event(event_type, {name: _decode_value(value) for name, value in attrs.items()})
+
+def snapshot_saves(save_dir) -> Dict[str, str]:
+    """读取存档目录中的全部文件，返回 文件名 -> base64 内容（录制开始时的存档状态）"""
+    save_dir = Path(save_dir)
+    if not save_dir.is_dir():
+        return {}
+    return {path.name: base64.b64encode(path.read_bytes()).decode('ascii')
+            for path in sorted(save_dir.iterdir())
+            if path.is_file() and path.suffix != '.tmp'}
+
+def restore_saves(files: Dict[str, str], save_dir):
+    """把 snapshot_saves 记录的文件写入存档目录"""
+    save_dir = Path(save_dir)
+    save_dir.mkdir(parents=True, exist_ok=True)
+    for name, content in files.items():
+        (save_dir / Path(name).name).write_bytes(base64.b64decode(content))
+
+class SessionRecorder:
+    """录制一局游戏：随机种子、开始时的存档状态 + 每帧的时间和事件
+
+    文件为 gzip 压缩的 JSON Lines，第一行是文件头，之后每行一帧：
+    [帧时间(秒), [[事件类型, 属性], ...]]
+    """
+    def __init__(self, path: str, seed: int, screen_size: Tuple[int, int],
+                 ai_players: int = 0, saves: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            path: 录像文件路径
+            seed: 随机种子
+            screen_size: 逻辑画面尺寸
+            ai_players: 电脑玩家数量
+            saves: 录制开始时的存档文件（snapshot_saves 的结果）
+        """
+        self.path = path
+        self.frames = 0
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        header = {"version": SESSION_VERSION, "seed": seed, "screen": list(screen_size),
+                  "ai_players": ai_players, "saves": saves or {}}
+        self._file.write(json.dumps(header) + "\n")
+        log.info("开始录制: %s", path)
+
+    def record_frame(self, frame_time: float, events: List[pygame.event.Event]):
+        """记录一帧的时间和事件"""
+        line = [frame_time, [encode_event(event) for event in events]]
+        self._file.write(json.dumps(line, ensure_ascii=False, separators=(',', ':')) + "\n")
+        self.frames += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            log.info("录制结束: %s (%d帧)", self.path, self.frames)
+
+class SessionPlayer:
+    """回放录制的游戏，逐帧提供录制时的时间和事件"""
+    def __init__(self, path: str):
+        self.path = path
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            if header.get("version") != SESSION_VERSION:
+                raise ValueError(f"不支持的录像版本: {header.get('version')}")
+            self._frames = [json.loads(line) for line in f if line.strip()]
+        self.seed: int = header["seed"]
+        self.screen_size = tuple(header["screen"])
+        # 较早的录像没有记录这两项，按没有电脑玩家、没有存档回放
+        self.ai_players: int = header.get("ai_players", 0)
+        self.saves: Dict[str, str] = header.get("saves", {})
+        self.frame_index = 0
+        log.info("加载录像: %s (%d帧, 种子 %d, %d个存档文件)", path, len(self._frames),
+                 self.seed, len(self.saves))
+
+    @property
+    def frame_count(self) -> int:
+        return len(self._frames)
+
+    def next_frame(self) -> Optional[Tuple[float, List[pygame.event.Event]]]:
+        """取出下一帧的 (帧时间, 事件列表)，录像结束时返回None"""
+        if self.frame_index >= len(self._frames):
+            return None
+        frame_time, events = self._frames[self.frame_index]
+        self.frame_index += 1
+        return frame_time, [decode_event(event) for event in events]
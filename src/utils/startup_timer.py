@@ -0,0 +1,49 @@
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+from utils.logger import get_logger
+
+log = get_logger("Startup")
+
+class StartupTimer:
+    """启动耗时统计
+
+    记录启动过程中每个阶段的耗时，以及从启动到第一帧可交互画面的总耗时。
+    """
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.first_frame_time = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """统计一个阶段的耗时
+
+        用法:
+            with timer.phase("pygame.init"):
+                pygame.init()
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, elapsed: float):
+        """记录一个阶段的耗时（秒）"""
+        self.phases.append((name, elapsed))
+
+    def mark_first_frame(self):
+        """标记第一帧已经显示，并输出启动耗时明细"""
+        if self.first_frame_time is not None:
+            return
+        self.first_frame_time = time.perf_counter() - self.start_time
+        self.report()
+
+    def report(self):
+        """输出各阶段耗时"""
+        log.info("启动耗时明细:")
+        for name, elapsed in self.phases:
+            log.info("  %s: %.1fms", name, elapsed * 1000)
+        if self.first_frame_time is not None:
+            log.info("首帧可交互总耗时: %.1fms", self.first_frame_time * 1000)
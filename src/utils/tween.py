@@ -0,0 +1,239 @@
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+from utils.logger import get_logger
+
+log = get_logger("Tween")
+
+Value = Union[float, Sequence[float]]
+
+# 缓动函数：输入进度 t（0到1），输出缓动后的进度（t=0时为0，t=1时为1）
+def linear(t: float) -> float:
+    return t
+
+def ease_in_quad(t: float) -> float:
+    return t * t
+
+def ease_out_quad(t: float) -> float:
+    return -t * (t - 2)
+
+def ease_in_out_quad(t: float) -> float:
+    if t < 0.5:
+        return 2 * t * t
+    return -2 * t * t + 4 * t - 1
+
+def ease_out_cubic(t: float) -> float:
+    u = t - 1
+    return u * u * u + 1
+
+def ease_in_out_sine(t: float) -> float:
+    return -(math.cos(math.pi * t) - 1) / 2
+
+EASINGS: Dict[str, Callable[[float], float]] = {
+    "linear": linear,
+    "ease_in_quad": ease_in_quad,
+    "ease_out_quad": ease_out_quad,
+    "ease_in_out_quad": ease_in_out_quad,
+    "ease_out_cubic": ease_out_cubic,
+    "ease_in_out_sine": ease_in_out_sine,
+}
+
+# 槽状态
+_FREE = 0
+_RUNNING = 1
+_SETTLING = 2  # 已到达终点，再保留一次更新让插值的上一状态也等于终点，然后释放
+
+class TweenHandle:
+    """补间动画的句柄（槽号 + 代数），槽被回收重用后旧句柄自动失效"""
+    __slots__ = ("slot", "generation")
+
+    def __init__(self, slot: int, generation: int):
+        self.slot = slot
+        self.generation = generation
+
+class TweenSystem:
+    """补间动画/时间线系统
+
+    所有补间记录保存在按槽号索引的并列数组中，每次更新只遍历一遍活动槽，
+    同时推进所有动画；几百个同时移动的棋子也只是一次循环。
+
+    每个补间是一条由若干关键点组成的时间线（两个点就是普通补间），
+    每段时长相同、各自应用缓动函数。时间线在开始时一次性建好，
+    之后按已用时间直接算出所在段，不需要逐段弹出路径点。
+
+    用法:
+        tweens = TweenSystem()
+        handle = tweens.play_path([(0, 0), (100, 0), (100, 100)], 0.3, ease_out_quad)
+        tweens.update(dt)                   # 每次固定步长更新调用一次
+        x, y = tweens.sample(handle, alpha)  # 绘制时插值
+    """
+    def __init__(self):
+        # 每个槽的数据（并列数组）
+        self._points: List[Tuple[Tuple[float, ...], ...]] = []
+        self._segment_duration: List[float] = []
+        self._easing: List[Callable[[float], float]] = []
+        self._elapsed: List[float] = []
+        self._value: List[Tuple[float, ...]] = []
+        self._prev: List[Tuple[float, ...]] = []
+        self._state: List[int] = []
+        self._generation: List[int] = []
+        self._scalar: List[bool] = []
+        self._on_complete: List[Optional[Callable[[], None]]] = []
+
+        self._free: List[int] = []
+        self._active: List[int] = []
+
+    def __len__(self) -> int:
+        """活动的补间数"""
+        return len(self._active)
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        slot = len(self._state)
+        self._points.append(())
+        self._segment_duration.append(0.0)
+        self._easing.append(linear)
+        self._elapsed.append(0.0)
+        self._value.append(())
+        self._prev.append(())
+        self._state.append(_FREE)
+        self._generation.append(0)
+        self._scalar.append(False)
+        self._on_complete.append(None)
+        return slot
+
+    def play_path(self, points: Sequence[Value], segment_duration: float,
+                  easing: Union[str, Callable[[float], float]] = linear,
+                  on_complete: Optional[Callable[[], None]] = None) -> TweenHandle:
+        """开始一条多段时间线
+
+        Args:
+            points: 关键点（数值或等长的数值元组），至少一个
+            segment_duration: 每一段的时长（秒）
+            easing: 每段使用的缓动函数或其名称
+            on_complete: 到达最后一个点时调用（在本次更新的所有补间推进完之后）
+
+        Returns:
+            TweenHandle: 补间句柄
+        """
+        if not points:
+            raise ValueError("时间线至少需要一个关键点")
+        scalar = not isinstance(points[0], (tuple, list))
+        if scalar:
+            points = tuple((float(point),) for point in points)
+        else:
+            points = tuple(tuple(float(v) for v in point) for point in points)
+        if isinstance(easing, str):
+            easing = EASINGS[easing]
+
+        slot = self._allocate()
+        self._points[slot] = points
+        self._segment_duration[slot] = max(segment_duration, 1e-9)
+        self._easing[slot] = easing
+        self._elapsed[slot] = 0.0
+        self._value[slot] = points[0]
+        self._prev[slot] = points[0]
+        self._state[slot] = _RUNNING
+        self._generation[slot] += 1
+        self._scalar[slot] = scalar
+        self._on_complete[slot] = on_complete
+        self._active.append(slot)
+        return TweenHandle(slot, self._generation[slot])
+
+    def play(self, start: Value, end: Value, duration: float,
+             easing: Union[str, Callable[[float], float]] = linear,
+             on_complete: Optional[Callable[[], None]] = None) -> TweenHandle:
+        """开始一个从 start 到 end 的补间（单段时间线）"""
+        return self.play_path((start, end), duration, easing, on_complete)
+
+    def _owns(self, handle: Optional[TweenHandle]) -> bool:
+        return (handle is not None and self._generation[handle.slot] == handle.generation
+                and self._state[handle.slot] != _FREE)
+
+    def is_running(self, handle: Optional[TweenHandle]) -> bool:
+        """补间是否还没有到达终点"""
+        return self._owns(handle) and self._state[handle.slot] == _RUNNING
+
+    def is_alive(self, handle: Optional[TweenHandle]) -> bool:
+        """补间是否仍占用槽位（包括到达终点后等待插值收尾的一次更新）"""
+        return self._owns(handle)
+
+    def cancel(self, handle: Optional[TweenHandle]):
+        """停止补间并释放槽位（不调用 on_complete）"""
+        if self._owns(handle):
+            self._release(handle.slot)
+            self._active.remove(handle.slot)
+
+    def _release(self, slot: int):
+        self._state[slot] = _FREE
+        self._points[slot] = ()
+        self._on_complete[slot] = None
+        self._free.append(slot)
+
+    def sample(self, handle: Optional[TweenHandle], alpha: float = 1.0, default: Value = None) -> Value:
+        """取得补间在上一次和本次更新之间插值后的值
+
+        Args:
+            handle: 补间句柄
+            alpha: 0表示上一次更新的值，1表示本次更新的值
+            default: 句柄已失效时返回的值
+
+        Returns:
+            数值或元组（与开始时传入的关键点类型一致）
+        """
+        if not self._owns(handle):
+            return default
+        slot = handle.slot
+        value = self._value[slot]
+        prev = self._prev[slot]
+        if alpha >= 1.0 or prev == value:
+            result = value
+        else:
+            result = tuple(a + (b - a) * alpha for a, b in zip(prev, value))
+        return result[0] if self._scalar[slot] else result
+
+    def update(self, dt: float):
+        """推进所有活动的补间（一次遍历），然后调用到达终点的补间的回调
+
+        Args:
+            dt: 本次更新经过的时间（秒）
+        """
+        if not self._active:
+            return
+        points_of = self._points
+        value_of = self._value
+        prev_of = self._prev
+        elapsed_of = self._elapsed
+        state_of = self._state
+
+        finished = []
+        still_active = []
+        for slot in self._active:
+            prev_of[slot] = value_of[slot]
+            if state_of[slot] == _SETTLING:
+                self._release(slot)
+                continue
+            still_active.append(slot)
+
+            elapsed = elapsed_of[slot] + dt
+            elapsed_of[slot] = elapsed
+            points = points_of[slot]
+            position = elapsed / self._segment_duration[slot]
+            segment = int(position)
+            if segment >= len(points) - 1:
+                value_of[slot] = points[-1]
+                state_of[slot] = _SETTLING
+                finished.append(slot)
+                continue
+            t = self._easing[slot](position - segment)
+            start = points[segment]
+            end = points[segment + 1]
+            value_of[slot] = tuple(a + (b - a) * t for a, b in zip(start, end))
+        self._active = still_active
+
+        # 回调可能开始新的补间，放在遍历结束之后调用
+        for slot in finished:
+            callback = self._on_complete[slot]
+            if callback is not None:
+                self._on_complete[slot] = None
+                callback()
@@ -0,0 +1,176 @@
+import pygame
+from typing import Callable, Dict, List, Optional, Tuple
+from utils.logger import get_logger
+
+log = get_logger("UICompositor")
+
+# 模态弹窗下方画面的默认遮罩（半透明黑色）
+DIM_COLOR = (0, 0, 0)
+DIM_ALPHA = 128
+
+class UICompositor:
+    """界面合成器（单例）
+
+    保存界面层反复使用的表面，避免每帧重新分配和绘制：
+    - 遮罩层：按 (尺寸, 颜色, 透明度) 共享的不透明表面，使用整体透明度（set_alpha）混合，
+      比逐像素透明的 SRCALPHA 表面混合更快，并且可以只混合裁剪区域；
+    - 背景层池：模态层用来保存“下方画面 + 遮罩”的整屏表面，关闭后归还重复使用；
+    - 弹窗外观缓存：弹窗的底板、边框、标题等不变的部分只渲染一次。
+    """
+    _instance = None
+
+    @staticmethod
+    def get_instance():
+        if UICompositor._instance is None:
+            UICompositor._instance = UICompositor()
+        return UICompositor._instance
+
+    def __init__(self):
+        if UICompositor._instance is not None:
+            raise Exception("UICompositor 是单例类，请使用 get_instance() 方法获取实例")
+        UICompositor._instance = self
+
+        self._dims: Dict[Tuple, pygame.Surface] = {}
+        self._backdrops: Dict[Tuple[int, int], List[pygame.Surface]] = {}
+        self._chrome: Dict[Tuple, pygame.Surface] = {}
+
+    def dim_overlay(self, size: Tuple[int, int], color=DIM_COLOR, alpha: int = DIM_ALPHA) -> pygame.Surface:
+        """取得共享的遮罩层（调用方不要修改它）"""
+        key = (tuple(size), tuple(color), alpha)
+        overlay = self._dims.get(key)
+        if overlay is None:
+            overlay = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                overlay = overlay.convert()
+            overlay.fill(color)
+            overlay.set_alpha(alpha)
+            self._dims[key] = overlay
+            log.debug("创建遮罩层 %dx%d", *size)
+        return overlay
+
+    def acquire_backdrop(self, like: pygame.Surface) -> pygame.Surface:
+        """从池中取出一个与 like 尺寸和格式相同的整屏表面"""
+        pool = self._backdrops.get(like.get_size())
+        if pool:
+            return pool.pop()
+        log.debug("创建背景层 %dx%d", *like.get_size())
+        return pygame.Surface(like.get_size(), 0, like)
+
+    def release_backdrop(self, surface: pygame.Surface):
+        """把整屏表面归还到池中"""
+        self._backdrops.setdefault(surface.get_size(), []).append(surface)
+
+    def chrome(self, key: Tuple, size: Tuple[int, int],
+               render: Callable[[pygame.Surface], None]) -> pygame.Surface:
+        """取得缓存的弹窗外观，第一次使用时调用 render 在透明表面上绘制
+
+        Args:
+            key: 缓存键，应包含所有影响外观的参数（文字、颜色、尺寸等）
+            size: 外观表面的尺寸
+            render: 绘制函数，接收一个透明背景的表面
+
+        Returns:
+            pygame.Surface: 共享的外观表面（调用方不要修改它）
+        """
+        surface = self._chrome.get(key)
+        if surface is None:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            render(surface)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            self._chrome[key] = surface
+            log.debug("缓存弹窗外观 %s", key[0])
+        return surface
+
+    def clear(self):
+        """清空所有缓存（字体或显示格式变化后使用）"""
+        self._dims.clear()
+        self._backdrops.clear()
+        self._chrome.clear()
+
+class ModalLayer:
+    """场景中的模态层
+
+    打开时把下方画面连同遮罩一起绘制到一张缓存的背景层上，
+    之后每帧只需要复制背景层（可以只复制裁剪区域），再画弹窗本身；
+    下方画面有区域变化时，通过 mark 记录，下次绘制时只重建这些区域。
+
+    mark 与 DirtyRectTracker.mark 的用法相同（同时转发给场景的跟踪器），
+    模态层打开时可以直接把它交给 TokenLayer.mark_dirty 等接收跟踪器的接口。
+
+    用法:
+        self.modal = ModalLayer(screen, self.dirty)
+        self.modal.open()
+        below = self.modal if self.modal.is_open else self.dirty
+        below.mark(rect)                 # 下方画面的变化
+        self.modal.draw(self._draw_scene) # 在 draw() 中代替直接绘制下方画面
+    """
+    def __init__(self, screen: pygame.Surface, tracker, color=DIM_COLOR, alpha: int = DIM_ALPHA):
+        """
+        Args:
+            screen: 绘制目标表面
+            tracker: 场景的脏矩形跟踪器
+            color: 遮罩颜色
+            alpha: 遮罩透明度（0-255）
+        """
+        self.screen = screen
+        self.tracker = tracker
+        self.compositor = UICompositor.get_instance()
+        self._dim = self.compositor.dim_overlay(screen.get_size(), color, alpha)
+        self._backdrop: Optional[pygame.Surface] = None
+        self._stale: List[pygame.Rect] = []
+
+    @property
+    def is_open(self) -> bool:
+        return self._backdrop is not None
+
+    def open(self):
+        """打开模态层，下一次绘制时建立整张背景层"""
+        if self._backdrop is None:
+            self._backdrop = self.compositor.acquire_backdrop(self.screen)
+        self.invalidate()
+        self.tracker.mark_all()
+
+    def close(self):
+        """关闭模态层，背景层归还到池中"""
+        if self._backdrop is not None:
+            self.compositor.release_backdrop(self._backdrop)
+            self._backdrop = None
+        self._stale.clear()
+        self.tracker.mark_all()
+
+    def invalidate(self):
+        """整张背景层都需要重建"""
+        self._stale = [self.screen.get_rect()]
+
+    def mark(self, rect: Optional[pygame.Rect]):
+        """记录下方画面发生变化的区域"""
+        if not rect:
+            return
+        self.tracker.mark(rect)
+        if self._backdrop is not None:
+            self._stale.append(pygame.Rect(rect))
+
+    def draw(self, draw_below: Callable[[], None]):
+        """绘制背景层（下方画面 + 遮罩），只在当前裁剪区域内复制
+
+        Args:
+            draw_below: 下方画面的完整绘制函数（在裁剪区域内重复调用结果一致）
+        """
+        screen = self.screen
+        clip = screen.get_clip()
+        if self._stale:
+            screen_rect = screen.get_rect()
+            stale, self._stale = self._stale, []
+            try:
+                for rect in stale:
+                    rect = rect.clip(screen_rect)
+                    if not rect.width or not rect.height:
+                        continue
+                    screen.set_clip(rect)
+                    draw_below()
+                    screen.blit(self._dim, rect, rect)
+                    self._backdrop.blit(screen, rect, rect)
+            finally:
+                screen.set_clip(clip)
+        screen.blit(self._backdrop, clip, clip)